@@ -0,0 +1,226 @@
+"""
+Batch Classification Driver
+
+Runs many classification jobs (one per brand/market battery) from a manifest
+in a single process, or spread over a pool of worker processes, instead of
+one classifier.py process per battery. Imports, the brand configuration,
+compiled brand matchers, citation extractors and the competitor store are
+loaded once per process and shared by all the jobs it runs; workbook snapshots
+and category indexes come from the disk cache.
+
+Manifest: JSON array (or JSONL) of jobs, paths relative to the manifest file:
+    [
+      {"brand": "betfair", "excel": "data/betfair/betfair_llm_evaluation_ES.xlsx",
+       "json": "data/betfair/betfair_es_answers.json",
+       "output": "data/betfair/betfair_es_answers_classified.json"},
+      {"name": "byd-uk", "excel": "...", "json": "...", "output": "...", "incremental": true}
+    ]
+Optional job keys: name (defaults to brand, then the Excel name), category_sheets,
+format ('json', 'jsonl' or 'parquet'), stream, incremental. As with classifier.py,
+the brand itself is read from the Excel; "brand" only labels the job.
+
+Usage:
+    python batch.py manifest.json
+    python batch.py manifest.json --workers 4 --summary batch_summary.json
+"""
+
+import io
+import json
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext, redirect_stdout
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from json_stream import load_records
+from response_cache import DEFAULT_CACHE_DIR
+
+REQUIRED_KEYS = ('excel', 'json', 'output')
+OPTIONAL_KEYS = ('name', 'brand', 'category_sheets', 'format', 'stream', 'incremental')
+
+
+class BatchJob:
+    """One (excel, json, output) classification job of a manifest."""
+
+    def __init__(self, name: str, excel: str, json_path: str, output: str, options: Optional[Dict] = None):
+        """
+        Args:
+            name: Label used in logs and the summary
+            excel: Excel battery with the categories
+            json_path: PHPMyAdmin export with the answers
+            output: Enriched output path
+            options: Extra classify() arguments (category_sheets, stream, incremental, format)
+        """
+        self.name = name
+        self.excel = excel
+        self.json_path = json_path
+        self.output = output
+        self.options = options or {}
+
+
+class JobResult:
+    """Outcome and timing of one job."""
+
+    def __init__(self, name: str, ok: bool, seconds: float, records: Optional[int],
+                 error: Optional[str] = None, log: str = ''):
+        self.name = name
+        self.ok = ok
+        self.seconds = seconds
+        self.records = records  # None when the job failed
+        self.error = error
+        self.log = log
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'status': 'ok' if self.ok else 'failed',
+            'seconds': round(self.seconds, 3),
+            'records': self.records,
+            'error': self.error,
+        }
+
+
+def load_manifest(manifest_path: str) -> List[BatchJob]:
+    """
+    Read the jobs of a manifest (JSON array or JSONL).
+
+    Raises:
+        ValueError: If a job lacks a required key or has an unknown one
+    """
+    base = Path(manifest_path).resolve().parent
+    jobs = []
+    for number, entry in enumerate(load_records(manifest_path), start=1):
+        missing = [key for key in REQUIRED_KEYS if not entry.get(key)]
+        unknown = sorted(set(entry) - set(REQUIRED_KEYS) - set(OPTIONAL_KEYS))
+        if missing or unknown:
+            problems = ([f"missing {', '.join(missing)}"] if missing else []) + \
+                       ([f"unknown keys {', '.join(unknown)}"] if unknown else [])
+            raise ValueError(f"Manifest job {number}: {'; '.join(problems)}")
+
+        excel, json_path, output = (str(base / entry[key]) for key in REQUIRED_KEYS)
+        name = entry.get('name') or entry.get('brand') or Path(excel).stem
+        options = {key: entry[key] for key in ('category_sheets', 'stream', 'incremental') if key in entry}
+        options['output_format'] = entry.get('format') or next(
+            (fmt for fmt in ('jsonl', 'parquet') if output.endswith('.' + fmt)), 'json'
+        )
+        jobs.append(BatchJob(name, excel, json_path, output, options))
+    return jobs
+
+
+def run_job(job: BatchJob, cache_dir: Optional[str] = DEFAULT_CACHE_DIR, capture: bool = False) -> JobResult:
+    """
+    Run one job in this process. Failures are reported in the result, not raised.
+
+    Args:
+        job: Job to run
+        cache_dir: Workbook snapshot / category index cache (None = no caching)
+        capture: Keep the job's console output in the result instead of printing it
+    """
+    from classifier import classify
+
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(buffer) if capture else nullcontext():
+            enriched = classify(job.excel, job.json_path, job.output, cache_dir=cache_dir, **job.options)
+        if job.options.get('stream'):
+            # Streamed jobs return no records: take the count from the statistics summary
+            from record_stats import RecordStats, stats_path
+            records = RecordStats.load(stats_path(job.output)).total
+        else:
+            records = len(enriched)
+        return JobResult(job.name, True, time.perf_counter() - start, records, log=buffer.getvalue())
+    except Exception as e:
+        log = buffer.getvalue() + traceback.format_exc()
+        return JobResult(job.name, False, time.perf_counter() - start, None,
+                         error=f"{type(e).__name__}: {e}", log=log)
+
+
+def _init_batch_worker() -> None:
+    # Load the brand configuration once per worker, before its first job
+    try:
+        from brand_config import load_config
+        load_config()
+    except (ImportError, FileNotFoundError):
+        pass
+
+
+def run_batch(
+    jobs: List[BatchJob],
+    workers: int = 1,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR
+) -> List[JobResult]:
+    """
+    Run all jobs, in this process (workers=1) or on a process pool.
+
+    With a pool each job's output is printed as a block when the job finishes.
+
+    Returns:
+        Results in manifest order
+    """
+    if workers <= 1:
+        results = []
+        for number, job in enumerate(jobs, start=1):
+            print(f"\n{'=' * 60}\n[{number}/{len(jobs)}] {job.name}\n{'=' * 60}")
+            result = run_job(job, cache_dir)
+            if not result.ok:
+                print(result.log.rstrip())
+            results.append(result)
+        return results
+
+    results: List[Optional[JobResult]] = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as executor:
+        futures = {executor.submit(run_job, job, cache_dir, True): i for i, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = results[futures[future]] = future.result()
+            print(f"\n{'=' * 60}\n[{done}/{len(jobs)} done] {result.name}\n{'=' * 60}")
+            print(result.log.rstrip())
+    return results
+
+
+def print_summary(results: List[JobResult], wall_seconds: float) -> None:
+    """Per-job timing table."""
+    width = max([len(r.name) for r in results] + [3])
+    print(f"\n{'=' * 60}\nBATCH SUMMARY\n{'=' * 60}")
+    print(f"  {'job':<{width}}  {'status':<6}  {'records':>8}  {'seconds':>8}  {'rec/s':>8}")
+    for r in results:
+        records = '-' if r.records is None else str(r.records)
+        rate = f"{r.records / r.seconds:.0f}" if r.records and r.seconds else '-'
+        print(f"  {r.name:<{width}}  {'ok' if r.ok else 'FAILED':<6}  {records:>8}  {r.seconds:>8.2f}  {rate:>8}")
+        if r.error:
+            print(f"      {r.error}")
+    failed = sum(1 for r in results if not r.ok)
+    print(f"\n  {len(results)} jobs, {failed} failed, {wall_seconds:.2f}s wall "
+          f"({sum(r.seconds for r in results):.2f}s in jobs)")
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Classify many brand/market batteries from a manifest')
+    parser.add_argument('manifest', help='JSON array or JSONL of jobs (excel, json, output, ...)')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Jobs run in parallel on a process pool (default: 1 = this process)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='Directory for workbook snapshots and category indexes')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always parse the Excels and rebuild category indexes')
+    parser.add_argument('--summary', help='Also write the per-job summary as JSON to this path')
+
+    args = parser.parse_args()
+    batch_jobs = load_manifest(args.manifest)
+
+    batch_start = time.perf_counter()
+    batch_results = run_batch(batch_jobs, args.workers, None if args.no_cache else args.cache_dir)
+    wall = time.perf_counter() - batch_start
+    print_summary(batch_results, wall)
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump({'wall_seconds': round(wall, 3), 'jobs': [r.to_dict() for r in batch_results]},
+                      f, ensure_ascii=False, indent=2)
+        print(f"Summary saved to: {args.summary}")
+
+    sys.exit(0 if all(r.ok for r in batch_results) else 1)
@@ -0,0 +1,566 @@
+"""
+Performance Benchmarks for the Classification Pipeline
+
+Compares optimized code paths against the reference implementations and
+checks that both return identical results.
+
+Usage:
+    python benchmarks.py fuzzy                     # Synthetic question battery
+    python benchmarks.py fuzzy --excel data/betfair/betfair_llm_evaluation_ES.xlsx
+    python benchmarks.py index --excel data/betfair/betfair_llm_evaluation_ES.xlsx
+    python benchmarks.py brands                    # Synthetic answers and competitor list
+    python benchmarks.py imports --budget-ms 300   # Cold-start guard (exit code 1 if over budget)
+    python benchmarks.py citations --json data/betfair/betfair_es_answers.json   # Stored answers
+    python benchmarks.py features --models 5      # Row-by-row enrichment vs columnar frame
+    python benchmarks.py config --brands 500      # brand_config accessors, per call
+    python benchmarks.py domains --domains 5000   # Non-source domain block list
+    python benchmarks.py industry --industries 20 # Industry keyword scoring
+"""
+
+import random
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+
+def _timeit(fn: Callable[[], object], repeat: int = 3) -> Tuple[float, object]:
+    """Best wall-clock time (seconds) over `repeat` runs, plus the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _report(name: str, baseline: float, optimized: float, identical: bool) -> None:
+    speedup = baseline / optimized if optimized else float('inf')
+    print(f"  {name}")
+    print(f"    baseline:  {baseline * 1000:10.1f} ms")
+    print(f"    optimized: {optimized * 1000:10.1f} ms  ({speedup:.1f}x)")
+    print(f"    identical results: {'yes' if identical else 'NO'}")
+
+
+def _synthetic_questions(count: int, rng: random.Random) -> Dict[str, Tuple[int, str]]:
+    """Question battery built from a small shared vocabulary (many near-duplicates)."""
+    vocabulary = (
+        "qué cuál cómo es el la los las de del en para con sin mejor peor casa apuestas "
+        "cuotas bono bienvenida retirar dinero tiempo seguro fiable app móvil fútbol tenis "
+        "exchange trading comisiones promociones registro verificación cuenta atención cliente"
+    ).split()
+    questions: Dict[str, Tuple[int, str]] = {}
+    while len(questions) < count:
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(4, 16))]
+        category = rng.randint(1, 8)
+        questions[' '.join(words).capitalize()] = (category, f"Category {category}")
+    return questions
+
+
+def _near_misses(questions: List[str], count: int, rng: random.Random) -> List[str]:
+    """Perturbed copies of real questions (typos, dropped/inserted chars) plus unrelated ones."""
+    queries = []
+    for _ in range(count):
+        chars = list(rng.choice(questions))
+        for _ in range(rng.randint(0, 6)):
+            pos = rng.randrange(len(chars))
+            op = rng.random()
+            if op < 0.4:
+                chars[pos] = rng.choice('abcdefghijklmnopqrstuvwxyz ')
+            elif op < 0.7:
+                del chars[pos]
+            else:
+                chars.insert(pos, rng.choice('aeiou'))
+        queries.append(''.join(chars))
+    # Questions that should not match anything
+    queries += [' '.join(rng.sample(questions, 2))[:80] for _ in range(count // 5)]
+    return queries
+
+
+def bench_fuzzy(args) -> None:
+    """classifier.fuzzy_match: exhaustive SequenceMatcher scan vs QuestionIndex."""
+    from classifier import FUZZY_THRESHOLD, fuzzy_match
+    from question_index import QuestionIndex
+
+    rng = random.Random(args.seed)
+    if args.excel:
+        from classifier import load_categories_from_excel
+        from workbook import load_workbook
+        workbook = load_workbook(args.excel)
+        candidates = load_categories_from_excel(args.excel, workbook.sheet_names, workbook)
+    else:
+        candidates = _synthetic_questions(args.questions, rng)
+    queries = _near_misses(list(candidates), args.queries, rng)
+
+    print(f"fuzzy_match: {len(candidates)} questions, {len(queries)} queries, threshold {FUZZY_THRESHOLD}")
+
+    build_time, index = _timeit(lambda: QuestionIndex(candidates), repeat=1)
+    baseline, expected = _timeit(lambda: [fuzzy_match(q, candidates) for q in queries], args.repeat)
+    optimized, actual = _timeit(lambda: [fuzzy_match(q, candidates, index=index) for q in queries], args.repeat)
+
+    print(f"  index build: {build_time * 1000:.1f} ms")
+    _report("all queries", baseline, optimized, expected == actual)
+
+
+def bench_index(args) -> None:
+    """Category index: rebuilding from the workbook vs loading the persisted artifact."""
+    import shutil
+    import tempfile
+    from category_index import load_category_index
+    from classifier import load_categories_from_excel
+    from workbook import load_workbook
+
+    workbook = load_workbook(args.excel)
+    sheets = workbook.sheet_names
+
+    def build():
+        return load_categories_from_excel(args.excel, sheets, workbook)
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        baseline, expected = _timeit(lambda: load_category_index(workbook.file_hash, sheets, build, None), args.repeat)
+        load_category_index(workbook.file_hash, sheets, build, cache_dir)
+        optimized, actual = _timeit(lambda: load_category_index(workbook.file_hash, sheets, build, cache_dir), args.repeat)
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print(f"category index: {len(expected.question_to_category)} questions, {len(expected.categories)} categories")
+    identical = (actual.from_cache and actual.question_to_category == expected.question_to_category
+                 and actual.question_index.postings == expected.question_index.postings)
+    _report("build vs load", baseline, optimized, identical)
+
+
+def _reference_detect_brands(text: str, main_brand: str, competitors) -> List[str]:
+    """Per-competitor \\b...\\b search (previous detect_brands_in_text implementation)."""
+    detected = set()
+    text_lower = text.lower()
+    for comp in competitors:
+        comp_lower = comp.lower()
+        if comp_lower != main_brand.lower() and re.search(r'\b' + re.escape(comp_lower) + r'\b', text_lower):
+            detected.add(comp)
+    return sorted(detected)
+
+
+def bench_brands(args) -> None:
+    """classifier.detect_brands_in_text + build_ranking_list: per-brand regexes vs BrandMatcher."""
+    from brand_matcher import BrandMatcher
+    from classifier import build_ranking_list
+
+    rng = random.Random(args.seed)
+    suffixes = ['bet', 'casino', 'sport', 'motors', 'auto', 'exchange']
+    competitors = {f"Brand{i} {rng.choice(suffixes)}" for i in range(args.competitors)}
+    competitors |= {'Bet365', 'Sky Bet', 'Bet Victor', 'Paddy Power', 'William Hill', '888sport', 'Ford'}
+    main_brand = 'Betfair'
+    filler = "the best odds are at for football and tennis affordable with a welcome bonus".split()
+    pool = filler + sorted(competitors)[:40] + [main_brand]
+    answers = [' '.join(rng.choice(pool) for _ in range(args.words)) for _ in range(args.answers)]
+
+    print(f"brands: {len(competitors)} competitors, {len(answers)} answers of {args.words} words")
+
+    def baseline_run():
+        results = []
+        for text in answers:
+            others = _reference_detect_brands(text, main_brand, competitors)
+            results.append((others, build_ranking_list(text, main_brand, others)))
+        return results
+
+    def optimized_run():
+        matcher = BrandMatcher(main_brand, competitors)
+        results = []
+        for text in answers:
+            matches = matcher.scan(text)
+            results.append((matches.detected,
+                            build_ranking_list(text, main_brand, matches.detected, matches.offsets)))
+        return results
+
+    baseline, expected = _timeit(baseline_run, args.repeat)
+    optimized, actual = _timeit(optimized_run, args.repeat)
+    _report("detect + rank (matcher build included)", baseline, optimized, expected == actual)
+
+    # Competitor sets merge the YAML and the Excel, which may spell a brand differently
+    from brand_aliases import AliasTable
+    aliases = AliasTable({'Bet365': ['bet 365']})
+    mixed = BrandMatcher(main_brand, {'Bwin', 'bwin', 'Bet365', 'bet365'}, aliases)
+    detected = mixed.scan('Try bwin, Bwin and bet 365 or Bet365').detected
+    print(f"  mixed-case competitors: {detected} ({'ok' if detected == ['Bet365', 'Bwin'] else 'NO'})")
+
+
+def _reference_extract_citations(text: str, non_sources, domains=()) -> List[str]:
+    """Previous extract_citations implementation (four findall passes, sets built per call),
+    plus the linear subdomain scan of the previous is_valid_citation_domain over `domains`."""
+    if not text:
+        return []
+    citations = set()
+    section_headers = {
+        'pros', 'cons', 'ventajas', 'desventajas', 'nota', 'note', 'notes',
+        'tips', 'tip', 'warning', 'conclusion', 'conclusión', 'resumen',
+        'summary', 'example', 'ejemplo', 'important', 'importante',
+        'alternativas', 'alternatives', 'opciones', 'options'
+    }
+    non_sources = set(non_sources)
+    sentence_indicators = {
+        'you', 'i', 'we', 'they', 'he', 'she', 'it', 'this', 'that',
+        'a', 'an', 'is', 'are', 'was', 'were', 'have', 'has', 'had', 'do',
+        'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might',
+        'must', 'can', 'if', 'when', 'where', 'what', 'why', 'how', 'which',
+        'there', 'here', 'some', 'any', 'all', 'most', 'many', 'few', 'no',
+        'not', 'only', 'also', 'just', 'even', 'still', 'already', 'always',
+        'never', 'often', 'sometimes', 'usually', 'generally', 'typically'
+    }
+
+    def is_valid_source(source: str) -> bool:
+        source_lower = source.lower()
+        if source_lower in section_headers or source_lower in non_sources:
+            return False
+        if any(source_lower.endswith('.' + domain) for domain in domains):
+            return False
+        first_word = source_lower.split()[0] if source.split() else ''
+        if first_word in sentence_indicators:
+            return False
+        if len(source.split()) > 5:
+            return False
+        if '.' in source[:-1] and not re.search(r'\.(com|org|net|uk|es|co|io|info|gov|edu)', source_lower):
+            return False
+        if source[0] in '✔❌⚖📈🚗💡⚠🔁🏦🧠🔌🔋🚙🚘🏎️⚡🤔👉💶👍📊📌🧾🎯🧩🥇🤝' or source[0].isdigit():
+            return False
+        return True
+
+    for match in re.findall(r'[\.\!\?\)]\s*\n([A-Za-z][A-Za-z0-9\.\-\' ]{2,45}?)\n\+\d+', text):
+        source = match.strip()
+        if len(source) >= 3 and is_valid_source(source):
+            citations.add(source)
+    for match in re.findall(r'[\.\!\?\)]\s*\n([a-zA-Z][a-zA-Z0-9\-]*\.[a-zA-Z0-9\.\-]+)\n', text):
+        source = match.strip()
+        if len(source) >= 5 and '.' in source and is_valid_source(source):
+            citations.add(source)
+    for match in re.findall(r'[\.\!\?\)]\s*\n([A-Z][A-Za-z0-9\.\-\' ]{2,40})\n(?![A-Za-z\+])', text):
+        source = match.strip()
+        if len(source) >= 3 and '\n' not in source and is_valid_source(source):
+            citations.add(source)
+    for url in re.findall(r'https?://([^\s/\)]+)', text):
+        if is_valid_source(url):
+            citations.add(url)
+    return sorted(citations)
+
+
+def _synthetic_answers(count: int, rng: random.Random) -> List[str]:
+    """Answers with source lists, URLs, section headers and bullet points."""
+    sources = ['Wikipedia', 'The Guardian', 'racingpost.com', 'support.betfair.es', 'BBC Sport',
+               'Oddschecker', 'youtube.com', 'Reddit', 'Pros', 'You can bet here', 'marca.com']
+    sentences = ["Betfair offers an exchange with competitive odds.", "Is it safe?",
+                 "Withdrawals take 1-3 days (depending on method).", "✔ Good app", "Read more!"]
+    answers = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(5, 30)):
+            parts.append(rng.choice(sentences))
+            roll = rng.random()
+            if roll < 0.3:
+                parts.append('\n' + rng.choice(sources) + ('\n+' + str(rng.randint(1, 9)) if rng.random() < 0.3 else ''))
+            elif roll < 0.4:
+                parts.append(f"see https://www.{rng.choice(['as.com', 'x.com', 'bbc.co.uk'])}/path")
+            parts.append('\n' if rng.random() < 0.4 else ' ')
+        answers.append(''.join(parts))
+    return answers
+
+
+def bench_citations(args) -> None:
+    """classifier.extract_citations: per-call sets + four findall passes vs CitationExtractor."""
+    from citations import get_citation_extractor
+
+    if args.json:
+        from json_stream import iter_export_records, load_records
+        # PHPMyAdmin export, or classified output (plain list / JSONL)
+        records = list(iter_export_records(args.json)) if args.json.endswith('.json') else []
+        records = records or load_records(args.json)
+        answers = [record.get('answer', '').strip() for record in records]
+    else:
+        answers = _synthetic_answers(args.answers, random.Random(args.seed))
+
+    extractor = get_citation_extractor()
+    print(f"citations: {len(answers)} answers")
+
+    def baseline_run():
+        # Like the previous implementation: non-source set re-derived from the config on every call
+        from citations import DEFAULT_NON_SOURCES, HAS_BRAND_CONFIG, expand_non_sources
+        results = []
+        for answer in answers:
+            if HAS_BRAND_CONFIG:
+                from brand_config import get_non_source_domains
+                domains = get_non_source_domains()
+                non_sources = expand_non_sources(domains)
+            else:
+                non_sources = DEFAULT_NON_SOURCES
+                domains = [name for name in non_sources if '.' in name]
+            results.append(_reference_extract_citations(answer, non_sources, domains))
+        return results
+
+    baseline, expected = _timeit(baseline_run, args.repeat)
+    optimized, actual = _timeit(lambda: [extractor.extract(a) for a in answers], args.repeat)
+    _report("extract all answers", baseline, optimized, expected == actual)
+
+
+def bench_features(args) -> None:
+    """Battery enrichment: enrich_record per record vs features.enrich_frame over a DataFrame."""
+    from brand_matcher import get_brand_matcher
+    from classifier import enrich_record
+    from features import enrich_frame, frame_records, records_frame
+    from question_index import QuestionIndex
+
+    rng = random.Random(args.seed)
+    candidates = _synthetic_questions(args.questions, rng)
+    # Every question (exact or near miss) answered by several models
+    questions = list(candidates)[:args.questions // 2] + _near_misses(list(candidates), args.questions // 2, rng)
+    answers = _synthetic_answers(len(questions) * args.models, rng)
+    records = [
+        {'id': str(i), 'model': f"model-{i % args.models}", 'question_text': questions[i // args.models],
+         'answer': answer.replace('Betfair', rng.choice(['Betfair', 'Bet365', 'bet 365', 'Sky Bet'])) + ' Betfair'}
+        for i, answer in enumerate(answers)
+    ]
+    # Export fields with nulls, ints and missing keys must come back unchanged
+    for record in records:
+        roll = rng.random()
+        if roll < 0.2:
+            record['model'] = None
+        if roll < 0.5:
+            record['score'] = rng.randint(1, 5)
+        elif roll < 0.7:
+            record['score'] = None
+    brand, competitors = 'Betfair', {'Bet365', 'Sky Bet', 'William Hill', 'Bwin'}
+    index = QuestionIndex(candidates)
+    matcher = get_brand_matcher(brand, competitors)
+    frame = records_frame(records)
+
+    print(f"features: {len(records)} records ({len(questions)} questions x {args.models} models)")
+
+    baseline, expected = _timeit(
+        lambda: [enrich_record(r, candidates, brand, index, matcher)[0] for r in records], args.repeat)
+    optimized, actual = _timeit(
+        lambda: frame_records(enrich_frame(frame, candidates, brand, competitors, index)[0], records), args.repeat)
+    _report("enrich battery", baseline, optimized, expected == actual)
+
+
+def _reference_brand_config(config: Dict, brand: str) -> Dict:
+    """Linear case-insensitive scan (previous get_brand_config)."""
+    for brand_name, brand_config in config.get('brands', {}).items():
+        if brand_name.lower() == brand.lower():
+            return brand_config
+    return {}
+
+
+def _reference_ignore_terms(config: Dict, brand: str) -> set:
+    """Sets rebuilt from the raw YAML on every call (previous get_ignore_terms)."""
+    ignore = {term.lower() for term in config.get('global', {}).get('generic_ignore', [])}
+    brand_config = _reference_brand_config(config, brand)
+    industry_config = config.get('industries', {}).get(brand_config.get('industry'), {})
+    ignore.update(term.lower() for term in industry_config.get('ignore_terms', []))
+    ignore.update(source.lower() for source in industry_config.get('media_sources', []))
+    ignore.update(product.lower() for product in brand_config.get('own_products', []))
+    return ignore
+
+
+def bench_config(args) -> None:
+    """brand_config accessors: linear scans and per-call set building vs the pre-indexed ConfigView."""
+    import copy
+    from brand_config import ConfigView, load_config
+
+    config = copy.deepcopy(load_config())
+    # Accessors return set copies, so the copy is part of the optimized cost
+    # Synthetic brands appended after the real ones (lookups of real brands scan past them too)
+    template = next(iter(config['brands'].values()))
+    for i in range(args.brands):
+        config['brands'][f"Synthetic Brand {i}"] = template
+    view = ConfigView(config)
+    names = list(config['brands'])
+    lookups = [names[i % len(names)].upper() for i in range(args.calls)]
+
+    print(f"config: {len(names)} brands, {len(lookups)} calls per accessor (per-call cost below)")
+
+    accessors = [
+        ("get_competitors", lambda b: set(_reference_brand_config(config, b).get('competitors', [])),
+         lambda b: set(view.brand(b).competitors)),
+        ("get_language", lambda b: _reference_brand_config(config, b).get('language', 'en'),
+         lambda b: view.brand(b).language),
+        ("get_ignore_terms", lambda b: _reference_ignore_terms(config, b),
+         lambda b: set(view.brand(b).ignore_terms)),
+    ]
+    for name, reference, indexed in accessors:
+        baseline, expected = _timeit(lambda: [reference(b) for b in lookups], args.repeat)
+        optimized, actual = _timeit(lambda: [indexed(b) for b in lookups], args.repeat)
+        _report(f"{name} (total for {len(lookups)} calls)", baseline, optimized, expected == actual)
+        print(f"    per call:  {baseline / len(lookups) * 1e6:.2f} us -> {optimized / len(lookups) * 1e6:.2f} us")
+
+
+def _reference_is_valid_domain(domain: str, non_sources) -> bool:
+    """Previous is_valid_citation_domain: exact test plus an endswith scan over every non-source."""
+    domain_lower = domain.lower()
+    if domain_lower in non_sources:
+        return False
+    for non_source in non_sources:
+        if domain_lower.endswith('.' + non_source) or domain_lower == non_source:
+            return False
+    return True
+
+
+def bench_domains(args) -> None:
+    """is_valid_citation_domain: endswith scan over the block list vs DomainTrie."""
+    from domain_trie import DomainTrie
+
+    rng = random.Random(args.seed)
+    words = "bet odds news sport media social video forum deals promo tips review blog casino".split()
+    tlds = ['com', 'net', 'org', 'co.uk', 'es', 'io', 'info']
+    non_sources = set()
+    while len(non_sources) < args.domains:
+        non_sources.add(f"{rng.choice(words)}{rng.randint(0, 99999)}.{rng.choice(tlds)}")
+    non_sources = frozenset(non_sources)
+    listed = sorted(non_sources)
+    queries = []
+    for _ in range(args.queries):
+        roll = rng.random()
+        if roll < 0.2:
+            queries.append(rng.choice(listed))
+        elif roll < 0.4:
+            queries.append(f"{rng.choice(['www', 'm', 'es', 'support.help'])}.{rng.choice(listed)}")
+        else:
+            queries.append(f"www.{rng.choice(words)}{rng.randint(100000, 999999)}.{rng.choice(tlds)}")
+
+    print(f"domains: {len(non_sources)} non-source domains, {len(queries)} lookups")
+
+    trie = DomainTrie(non_sources)
+    baseline, expected = _timeit(lambda: [_reference_is_valid_domain(q, non_sources) for q in queries], args.repeat)
+    optimized, actual = _timeit(lambda: [q not in trie for q in queries], args.repeat)
+    _report("classify all domains", baseline, optimized, expected == actual)
+
+
+def bench_industry(args) -> None:
+    """Industry detection: one word-start regex search per keyword vs the keyword automaton."""
+    from industry_detector import IndustryDetector
+
+    rng = random.Random(args.seed)
+    syllables = "ca ro mo to be ti ne xa pu li so va de ga fe ru".split()
+
+    def word() -> str:
+        return ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+
+    keywords_by_industry = {f"industry{i}": sorted({word() for _ in range(args.keywords)})
+                            for i in range(args.industries)}
+    vocabulary = [w for words in keywords_by_industry.values() for w in words]
+    text = '\n'.join(' '.join(rng.choice(vocabulary) if rng.random() < 0.05 else word() for _ in range(12))
+                     for _ in range(args.questions))
+    patterns = {industry: [re.compile(r'(?<![^\W_])' + re.escape(k)) for k in words]
+                for industry, words in keywords_by_industry.items()}
+
+    print(f"industry: {args.industries} industries x {args.keywords} keywords, {len(text)} chars of text")
+
+    def baseline_run():
+        lowered = text.lower()
+        scores = {industry: sum(1 for p in industry_patterns if p.search(lowered))
+                  for industry, industry_patterns in patterns.items()}
+        return sorted((-score, industry) for industry, score in scores.items() if score)
+
+    detector = IndustryDetector(keywords_by_industry)
+    baseline, expected = _timeit(baseline_run, args.repeat)
+    optimized, actual = _timeit(
+        lambda: sorted((-s.score, s.industry) for s in detector.score(text)), args.repeat)
+    _report("score all industries", baseline, optimized, expected == actual)
+
+
+# Modules that must not be loaded just by importing the pipeline
+HEAVY_MODULES = ('spacy', 'pandas', 'requests')
+
+_IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, ','.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def bench_imports(args) -> None:
+    """Cold-start import time of each module, measured in a fresh interpreter per run."""
+    script_dir = Path(__file__).parent
+    failed = False
+    print(f"imports: budget {args.budget_ms:.0f} ms, best of {args.repeat} fresh interpreters")
+
+    for module in args.modules:
+        best = float('inf')
+        loaded = ''
+        for _ in range(args.repeat):
+            probe = _IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)
+            output = subprocess.run(
+                [sys.executable, '-c', probe], cwd=script_dir,
+                capture_output=True, text=True, check=True
+            ).stdout.split()
+            best = min(best, float(output[0]))
+            loaded = output[1] if len(output) > 1 else ''
+
+        ok = best * 1000 <= args.budget_ms and not loaded
+        failed = failed or not ok
+        print(f"  {module:<16} {best * 1000:8.1f} ms  {'ok' if ok else 'OVER BUDGET'}"
+              f"{f'  (loaded {loaded})' if loaded else ''}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark optimized pipeline code paths')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for synthetic data')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    fuzzy = subparsers.add_parser('fuzzy', help='fuzzy_match vs QuestionIndex')
+    fuzzy.add_argument('--excel', help='Use the questions of a real Excel battery')
+    fuzzy.add_argument('--questions', type=int, default=1000, help='Synthetic battery size')
+    fuzzy.add_argument('--queries', type=int, default=300, help='Near-miss queries to match')
+    fuzzy.set_defaults(func=bench_fuzzy)
+
+    index = subparsers.add_parser('index', help='Category index rebuild vs persisted load')
+    index.add_argument('--excel', required=True, help='Excel battery')
+    index.set_defaults(func=bench_index)
+
+    brands = subparsers.add_parser('brands', help='Per-brand regexes vs BrandMatcher')
+    brands.add_argument('--competitors', type=int, default=300, help='Synthetic competitor list size')
+    brands.add_argument('--answers', type=int, default=200, help='Synthetic answers to scan')
+    brands.add_argument('--words', type=int, default=400, help='Words per answer')
+    brands.set_defaults(func=bench_brands)
+
+    imports = subparsers.add_parser('imports', help='Module cold-start time guard')
+    imports.add_argument('--budget-ms', type=float, default=300.0, help='Maximum import time per module')
+    imports.add_argument('--modules', nargs='+', default=['classifier'], help='Modules to import')
+    imports.set_defaults(func=bench_imports)
+
+    features = subparsers.add_parser('features', help='enrich_record loop vs columnar enrich_frame')
+    features.add_argument('--questions', type=int, default=400, help='Distinct questions in the battery')
+    features.add_argument('--models', type=int, default=5, help='Answers per question')
+    features.set_defaults(func=bench_features)
+
+    config = subparsers.add_parser('config', help='brand_config linear lookups vs ConfigView')
+    config.add_argument('--brands', type=int, default=50, help='Synthetic brands added to the config')
+    config.add_argument('--calls', type=int, default=20000, help='Lookups per accessor')
+    config.set_defaults(func=bench_config)
+
+    domains = subparsers.add_parser('domains', help='Non-source domain scan vs DomainTrie')
+    domains.add_argument('--domains', type=int, default=5000, help='Synthetic non-source domains')
+    domains.add_argument('--queries', type=int, default=5000, help='Domains to classify')
+    domains.set_defaults(func=bench_domains)
+
+    industry = subparsers.add_parser('industry', help='Per-keyword search vs industry keyword automaton')
+    industry.add_argument('--industries', type=int, default=20, help='Synthetic industries')
+    industry.add_argument('--keywords', type=int, default=40, help='Keywords per industry')
+    industry.add_argument('--questions', type=int, default=50, help='Sample questions in the text')
+    industry.set_defaults(func=bench_industry)
+
+    citations = subparsers.add_parser('citations', help='extract_citations vs CitationExtractor')
+    citations.add_argument('--json', help='Stored answers (PHPMyAdmin export or classified JSON/JSONL)')
+    citations.add_argument('--answers', type=int, default=2000, help='Synthetic answers when no --json')
+    citations.set_defaults(func=bench_citations)
+
+    args = parser.parse_args()
+    args.func(args)
@@ -0,0 +1,63 @@
+"""
+Brand Alias Table
+
+Maps every spelling of a brand ("bet 365", "skybet", "Sky Betting") to its
+canonical name ("Bet365", "Sky Bet") with one dictionary lookup. The table is
+built from the `aliases` section of brands_config.yaml as part of the
+ConfigView (so it is stored in the compiled config snapshot) and shared by the
+classifier's BrandMatcher (which reports canonical names) and the dashboards'
+ranking fixers (which use lowercase canonical ids).
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+
+class AliasTable:
+    """Immutable surface form -> canonical brand name mapping."""
+
+    def __init__(self, aliases: Dict[str, Iterable[str]]):
+        """
+        Args:
+            aliases: Canonical name -> other spellings (any case)
+        """
+        self.canonical_by_form: Dict[str, str] = {}
+        self.forms_by_canonical: Dict[str, Tuple[str, ...]] = {}
+        for canonical, forms in aliases.items():
+            keys = [canonical.lower()] + [form.lower() for form in forms]
+            for key in keys:
+                self.canonical_by_form[key] = canonical
+            self.forms_by_canonical[canonical] = tuple(dict.fromkeys(keys))
+
+    def __len__(self) -> int:
+        return len(self.forms_by_canonical)
+
+    def canonical(self, name: str) -> str:
+        """Canonical name of a brand spelling (the name itself if it has no alias)."""
+        return self.canonical_by_form.get(name.lower(), name)
+
+    def canonical_id(self, name: str) -> str:
+        """Lowercase canonical id of a brand spelling."""
+        return self.canonical(name).lower()
+
+    def forms(self, name: str) -> List[str]:
+        """Lowercased spellings of the brand `name` belongs to (canonical first)."""
+        canonical = self.canonical(name)
+        return list(self.forms_by_canonical.get(canonical, (canonical.lower(),)))
+
+
+EMPTY_ALIASES = AliasTable({})
+
+
+def get_alias_table() -> AliasTable:
+    """Alias table of the current configuration, rebuilt only when the config is reloaded."""
+    # Imported here: brand_config builds its ConfigView with AliasTable
+    try:
+        from brand_config import get_config_view
+    except ImportError:
+        return EMPTY_ALIASES
+    return get_config_view().aliases
+
+
+def normalize_brand(name: str) -> str:
+    """Lowercase canonical id of a brand spelling, using the configured aliases."""
+    return get_alias_table().canonical_id(name.strip())
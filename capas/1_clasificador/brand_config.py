@@ -3,16 +3,158 @@ Brand Configuration Loader
 
 Loads and provides brand-specific configuration from brands_config.yaml
 for use in classification and evaluation pipelines.
+
+Every load builds an immutable ConfigView that pre-indexes the YAML (brands
+by case-folded name, frozen competitor / own-product / ignore sets, merged
+per-industry ignore sets, a suffix trie of the non-source domains, one
+keyword automaton for industry detection), so the accessors below are
+dictionary lookups. Accessors returning sets hand out copies, so callers can
+still modify them; the view's frozen sets are shared.
+
+The file is watched for long-running workers: at most every
+CONFIG_CHECK_INTERVAL seconds an access stats brands_config.yaml, and if its
+contents (SHA-256) changed a new ConfigSnapshot with the next version number
+is swapped in. Derived structures (alias table, citation extractor, ...) are
+keyed on that version, so they rebuild on the next use after an edit.
+
+Parsing the YAML with PyYAML dominates worker start-up, so the parsed config
+and its ConfigView (alias table and domain trie included) are compiled into
+a binary snapshot, .cache/config/<yaml sha256>.pkl. A load hashes the YAML
+bytes and unpickles the matching snapshot; only when there is none (or it was
+written by another SNAPSHOT_FORMAT_VERSION) is the YAML parsed, and the
+snapshot written for the next process. PyYAML is still imported with the
+module, so callers that import brand_config inside try/except ImportError
+keep falling back when it is not installed.
+
+Usage:
+    python brand_config.py compile    # Build the snapshot ahead of time (e.g. on deploy)
 """
 
+import hashlib
 import os
+import pickle
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Set, Optional
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 import yaml
 
-
-# Cache for loaded configuration
-_config_cache: Optional[Dict] = None
+from brand_aliases import AliasTable
+from domain_trie import DomainTrie
+from industry_detector import IndustryDetector, IndustryScore
+from response_cache import DEFAULT_CACHE_DIR
+
+# Bump when ConfigView (or anything it holds) changes, so old snapshots are rebuilt
+SNAPSHOT_FORMAT_VERSION = 2
+
+
+class BrandEntry:
+    """Pre-indexed configuration of one brand."""
+
+    def __init__(self, name: str, config: Dict, ignore_terms: FrozenSet[str]):
+        """
+        Args:
+            name: Brand name as written in the YAML
+            config: Raw brand section
+            ignore_terms: Global + industry + own-product terms (lowercase)
+        """
+        self.name = name
+        self.config = config
+        self.competitors: FrozenSet[str] = frozenset(config.get('competitors') or [])
+        self.own_products: FrozenSet[str] = frozenset(config.get('own_products') or [])
+        self.industry: Optional[str] = config.get('industry')
+        self.language: str = config.get('language', 'en')
+        self.ignore_terms = ignore_terms
+
+
+class ConfigView:
+    """Immutable, pre-indexed view of one loaded configuration."""
+
+    def __init__(self, config: Dict):
+        """
+        Args:
+            config: Parsed brands_config.yaml
+        """
+        global_config = config.get('global') or {}
+        self.generic_ignore: FrozenSet[str] = frozenset(
+            term.lower() for term in global_config.get('generic_ignore') or []
+        )
+        self.non_source_domains: FrozenSet[str] = frozenset(
+            domain.lower() for domain in global_config.get('non_source_domains') or []
+        )
+        # Non-sources and their subdomains, matched label by label
+        self.non_source_trie = DomainTrie(self.non_source_domains)
+        # Spelling -> canonical brand name
+        self.aliases = AliasTable({
+            canonical: list(forms or []) for canonical, forms in (config.get('aliases') or {}).items()
+        })
+
+        # Industry -> generic ignores + its ignore terms + its media sources
+        self.industries: Dict[str, Dict] = config.get('industries') or {}
+        self.industry_ignore: Dict[str, FrozenSet[str]] = {}
+        for industry, industry_config in self.industries.items():
+            industry_config = industry_config or {}
+            terms = list(industry_config.get('ignore_terms') or []) + list(industry_config.get('media_sources') or [])
+            self.industry_ignore[industry] = self.generic_ignore | frozenset(term.lower() for term in terms)
+        # Keywords of every industry in one automaton
+        self.industry_detector = IndustryDetector({
+            industry: (industry_config or {}).get('keywords') or []
+            for industry, industry_config in self.industries.items()
+        })
+
+        # Case-folded name -> brand (the first one wins, like the previous linear scan)
+        self.brand_names: List[str] = list(config.get('brands') or {})
+        self.brands: Dict[str, BrandEntry] = {}
+        for name, brand_config in (config.get('brands') or {}).items():
+            key = name.casefold()
+            if key in self.brands:
+                continue
+            brand_config = brand_config or {}
+            industry = brand_config.get('industry')
+            own_products = frozenset(product.lower() for product in brand_config.get('own_products') or [])
+            self.brands[key] = BrandEntry(name, brand_config, self.industry_terms(industry) | own_products)
+
+    def brand(self, name: str) -> Optional[BrandEntry]:
+        """Entry of a brand (case-insensitive), or None if not configured."""
+        return self.brands.get(name.casefold())
+
+    def industry_terms(self, industry: Optional[str]) -> FrozenSet[str]:
+        """Generic ignores plus the ignore terms and media sources of `industry`."""
+        if not industry:
+            return self.generic_ignore
+        return self.industry_ignore.get(industry, self.generic_ignore)
+
+
+class ConfigSnapshot:
+    """One loaded version of brands_config.yaml (immutable, swapped as a whole)."""
+
+    def __init__(self, version: int, mtime_ns: int, size: int, sha256: str, config: Dict, view: ConfigView):
+        """
+        Args:
+            version: Load counter (increases every time the contents change or are reloaded)
+            mtime_ns: Modification time of the file that was read
+            size: Size of the file that was read
+            sha256: Hash of the file contents
+            config: Parsed YAML
+            view: Pre-indexed view of config
+        """
+        self.version = version
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.sha256 = sha256
+        self.config = config
+        self.view = view
+
+
+# Seconds between checks of the file for changes (0 = every access, None = never)
+CONFIG_CHECK_INTERVAL: Optional[float] = 2.0
+
+# Current snapshot; replaced by a single assignment, so readers never see a half-built one
+_snapshot: Optional[ConfigSnapshot] = None
+_last_check: float = 0.0
+# (mtime_ns, size) of a file version that failed to load, not retried until it changes again
+_failed_stat: Optional[Tuple[int, int]] = None
+_reload_lock = threading.Lock()
 
 
 def get_config_path() -> Path:
@@ -20,23 +162,143 @@ def get_config_path() -> Path:
     return Path(__file__).parent / "brands_config.yaml"
 
 
+def get_snapshot_path(sha256: str, cache_dir: str = DEFAULT_CACHE_DIR) -> Path:
+    """Compiled snapshot of the YAML file with the given SHA-256."""
+    return Path(cache_dir) / "config" / f"{sha256}.pkl"
+
+
+def _parse_yaml(data: bytes) -> Dict:
+    try:
+        return yaml.safe_load(data.decode('utf-8')) or {}
+    except yaml.YAMLError as e:
+        raise ValueError(f"invalid YAML: {e}") from e
+
+
+def _load_compiled(sha256: str, cache_dir: str = DEFAULT_CACHE_DIR) -> Optional[Tuple[Dict, ConfigView]]:
+    """(config, view) from the compiled snapshot of a YAML version, or None if there is no usable one."""
+    snapshot_path = get_snapshot_path(sha256, cache_dir)
+    try:
+        with open(snapshot_path, 'rb') as f:
+            # Header first, so a stale snapshot is rejected before unpickling its body
+            if pickle.load(f) != (SNAPSHOT_FORMAT_VERSION, sha256):
+                return None
+            config, view = pickle.load(f)
+        return config, view
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"  Warning: ignoring unreadable config snapshot {snapshot_path.name}: {e}")
+        return None
+
+
+def write_compiled(sha256: str, config: Dict, view: ConfigView, cache_dir: str = DEFAULT_CACHE_DIR) -> Path:
+    """Write the compiled snapshot of a YAML version (atomic replace)."""
+    snapshot_path = get_snapshot_path(sha256, cache_dir)
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = snapshot_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        pickle.dump((SNAPSHOT_FORMAT_VERSION, sha256), f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump((config, view), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, snapshot_path)
+    return snapshot_path
+
+
+def _read_snapshot(config_path: Path, version: int) -> ConfigSnapshot:
+    """Read and hash the configuration file; unpickle its compiled snapshot or parse and index it."""
+    stat = config_path.stat()
+    data = config_path.read_bytes()
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    compiled = _load_compiled(sha256)
+    if compiled is None:
+        config = _parse_yaml(data)
+        compiled = config, ConfigView(config)
+        try:
+            write_compiled(sha256, *compiled)
+        except OSError:
+            pass  # Read-only checkout: keep parsing the YAML
+    return ConfigSnapshot(version, stat.st_mtime_ns, stat.st_size, sha256, *compiled)
+
+
+def _check_for_changes(snapshot: ConfigSnapshot) -> ConfigSnapshot:
+    """Swap in a new snapshot if the file contents changed since `snapshot` was read."""
+    global _snapshot, _failed_stat
+    config_path = get_config_path()
+    try:
+        stat = config_path.stat()
+    except OSError:
+        return snapshot  # Removed or being replaced: keep serving the loaded config
+    file_stat = (stat.st_mtime_ns, stat.st_size)
+    if file_stat == (snapshot.mtime_ns, snapshot.size) or file_stat == _failed_stat:
+        return snapshot
+
+    with _reload_lock:
+        current = _snapshot
+        if current is not snapshot:
+            return current  # Another thread already reloaded
+        try:
+            candidate = _read_snapshot(config_path, snapshot.version + 1)
+        except (OSError, ValueError) as e:
+            # Typically a half-written edit: retried once the file changes again
+            _failed_stat = file_stat
+            print(f"  Warning: keeping config version {snapshot.version}, cannot load {config_path.name}: {e}")
+            return snapshot
+        if candidate.sha256 == snapshot.sha256:
+            # Touched but unchanged: remember the new stat, keep the version and derived structures
+            candidate = ConfigSnapshot(snapshot.version, candidate.mtime_ns, candidate.size,
+                                       snapshot.sha256, snapshot.config, snapshot.view)
+        _snapshot = candidate
+        return candidate
+
+
+def get_config_snapshot() -> ConfigSnapshot:
+    """Current configuration snapshot, reloading it if the file changed (see CONFIG_CHECK_INTERVAL)."""
+    global _snapshot, _last_check
+    snapshot = _snapshot
+    if snapshot is None:
+        with _reload_lock:
+            if _snapshot is None:
+                config_path = get_config_path()
+                if not config_path.exists():
+                    raise FileNotFoundError(f"Configuration file not found: {config_path}")
+                _snapshot = _read_snapshot(config_path, 1)
+                _last_check = time.monotonic()
+            return _snapshot
+
+    if CONFIG_CHECK_INTERVAL is not None:
+        now = time.monotonic()
+        if now - _last_check >= CONFIG_CHECK_INTERVAL:
+            _last_check = now
+            snapshot = _check_for_changes(snapshot)
+    return snapshot
+
+
 def load_config() -> Dict:
-    """Load configuration from YAML file (with caching)."""
-    global _config_cache
-    if _config_cache is None:
-        config_path = get_config_path()
-        if not config_path.exists():
-            raise FileNotFoundError(f"Configuration file not found: {config_path}")
-        with open(config_path, 'r', encoding='utf-8') as f:
-            _config_cache = yaml.safe_load(f)
-    return _config_cache
+    """Load configuration from YAML file (cached, reloaded when the file changes)."""
+    return get_config_snapshot().config
+
+
+def get_config_view() -> ConfigView:
+    """Pre-indexed view of the loaded configuration (rebuilt on every (re)load)."""
+    return get_config_snapshot().view
+
+
+def get_config_version() -> int:
+    """Version of the loaded configuration (increases every time it is (re)loaded)."""
+    return get_config_snapshot().version
 
 
 def reload_config() -> Dict:
     """Force reload configuration (useful for testing)."""
-    global _config_cache
-    _config_cache = None
-    return load_config()
+    global _snapshot, _last_check
+    config_path = get_config_path()
+    if not config_path.exists():
+        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    with _reload_lock:
+        version = _snapshot.version + 1 if _snapshot is not None else 1
+        _snapshot = _read_snapshot(config_path, version)
+        _last_check = time.monotonic()
+        return _snapshot.config
 
 
 def get_brand_config(brand: str) -> Dict:
@@ -49,33 +311,26 @@ def get_brand_config(brand: str) -> Dict:
     Returns:
         Dict with brand configuration, or empty dict if not found
     """
-    config = load_config()
-    brands = config.get('brands', {})
-
-    # Case-insensitive lookup
-    for brand_name, brand_config in brands.items():
-        if brand_name.lower() == brand.lower():
-            return brand_config
-
-    return {}
+    entry = get_config_view().brand(brand)
+    return entry.config if entry else {}
 
 
 def get_competitors(brand: str) -> Set[str]:
     """Get set of known competitors for a brand."""
-    brand_config = get_brand_config(brand)
-    return set(brand_config.get('competitors', []))
+    entry = get_config_view().brand(brand)
+    return set(entry.competitors) if entry else set()
 
 
 def get_own_products(brand: str) -> Set[str]:
     """Get set of brand's own product names (to exclude from competitor detection)."""
-    brand_config = get_brand_config(brand)
-    return set(brand_config.get('own_products', []))
+    entry = get_config_view().brand(brand)
+    return set(entry.own_products) if entry else set()
 
 
 def get_industry(brand: str) -> Optional[str]:
     """Get industry for a brand."""
-    brand_config = get_brand_config(brand)
-    return brand_config.get('industry')
+    entry = get_config_view().brand(brand)
+    return entry.industry if entry else None
 
 
 def get_ignore_terms(brand: str, industry: Optional[str] = None) -> Set[str]:
@@ -89,32 +344,16 @@ def get_ignore_terms(brand: str, industry: Optional[str] = None) -> Set[str]:
     Returns:
         Set of lowercase terms to ignore in brand detection
     """
-    config = load_config()
-    ignore = set()
-
-    # Add global generic ignores
-    global_config = config.get('global', {})
-    for term in global_config.get('generic_ignore', []):
-        ignore.add(term.lower())
+    view = get_config_view()
+    entry = view.brand(brand)
 
-    # Determine industry: from brand config or from parameter
-    brand_industry = get_industry(brand)
-    effective_industry = brand_industry or industry
+    # Precomputed for configured brands with an industry (the usual case)
+    if entry is not None and (entry.industry or not industry):
+        return set(entry.ignore_terms)
 
-    # Add industry-specific ignores
-    if effective_industry:
-        industries = config.get('industries', {})
-        industry_config = industries.get(effective_industry, {})
-        for term in industry_config.get('ignore_terms', []):
-            ignore.add(term.lower())
-        for source in industry_config.get('media_sources', []):
-            ignore.add(source.lower())
-
-    # Add brand's own products (these shouldn't be detected as competitors)
-    for product in get_own_products(brand):
-        ignore.add(product.lower())
-
-    return ignore
+    # Industry override for a brand without one: industry terms + own products
+    own_products = {p.lower() for p in entry.own_products} if entry else set()
+    return set(view.industry_terms(industry)) | own_products
 
 
 def get_industry_ignore_terms(industry: str) -> Set[str]:
@@ -127,23 +366,20 @@ def get_industry_ignore_terms(industry: str) -> Set[str]:
     Returns:
         Set of lowercase terms to ignore
     """
-    config = load_config()
-    ignore = set()
+    return set(get_config_view().industry_terms(industry))
 
-    # Add global generic ignores
-    global_config = config.get('global', {})
-    for term in global_config.get('generic_ignore', []):
-        ignore.add(term.lower())
 
-    # Add industry-specific ignores
-    industries = config.get('industries', {})
-    industry_config = industries.get(industry, {})
-    for term in industry_config.get('ignore_terms', []):
-        ignore.add(term.lower())
-    for source in industry_config.get('media_sources', []):
-        ignore.add(source.lower())
+def detect_industries(text: str) -> List[IndustryScore]:
+    """
+    Score the configured industries (their `keywords`) against a text.
 
-    return ignore
+    Args:
+        text: Text to analyze (file name, sheet names, sample questions, ...)
+
+    Returns:
+        Industries with at least one keyword found, best first, with score and confidence
+    """
+    return get_config_view().industry_detector.score(text)
 
 
 def detect_industry_from_keywords(text: str) -> Optional[str]:
@@ -154,79 +390,89 @@ def detect_industry_from_keywords(text: str) -> Optional[str]:
         text: Text to analyze for industry keywords
 
     Returns:
-        Detected industry name or None
+        Detected industry name or None (no keyword found, or a tie)
     """
-    text_lower = text.lower()
-
-    # Automotive keywords
-    automotive_keywords = [
-        'car', 'auto', 'vehicle', 'ev', 'electric', 'suv', 'sedan',
-        'motor', 'drive', 'lease', 'byd', 'tesla', 'bmw', 'audi',
-        'coches', 'vehículo', 'automóvil', 'eléctrico'
-    ]
-
-    # Betting keywords
-    betting_keywords = [
-        'bet', 'betting', 'apuesta', 'casino', 'odds', 'exchange',
-        'gambling', 'poker', 'sport', 'betfair', 'bet365', 'bwin',
-        'cuota', 'trading deportivo'
-    ]
-
-    automotive_score = sum(1 for kw in automotive_keywords if kw in text_lower)
-    betting_score = sum(1 for kw in betting_keywords if kw in text_lower)
-
-    if automotive_score > betting_score and automotive_score > 0:
-        return 'automotive'
-    elif betting_score > automotive_score and betting_score > 0:
-        return 'betting'
-
-    return None
+    return get_config_view().industry_detector.detect(text)
 
 
 def list_industries() -> List[str]:
     """Get list of all configured industries."""
-    config = load_config()
-    return list(config.get('industries', {}).keys())
+    return list(get_config_view().industries)
 
 
 def get_non_source_domains() -> Set[str]:
     """Get set of domains that should not be considered valid sources."""
-    config = load_config()
-    global_config = config.get('global', {})
-    return set(domain.lower() for domain in global_config.get('non_source_domains', []))
-
+    return set(get_config_view().non_source_domains)
 
-def is_valid_citation_domain(domain: str) -> bool:
-    """Check if a domain should be considered a valid citation source."""
-    non_sources = get_non_source_domains()
-    domain_lower = domain.lower()
 
-    # Check exact match
-    if domain_lower in non_sources:
-        return False
+def get_brand_aliases() -> Dict[str, List[str]]:
+    """Get alias spellings by canonical brand name (from the `aliases` section)."""
+    config = load_config()
+    return {canonical: list(forms or []) for canonical, forms in (config.get('aliases') or {}).items()}
 
-    # Check if it's a subdomain of a non-source
-    for non_source in non_sources:
-        if domain_lower.endswith('.' + non_source) or domain_lower == non_source:
-            return False
 
-    return True
+def is_valid_citation_domain(domain: str) -> bool:
+    """Check if a domain should be considered a valid citation source (not a non-source or its subdomain)."""
+    return domain not in get_config_view().non_source_trie
 
 
 def get_language(brand: str) -> str:
     """Get language setting for a brand (defaults to 'en')."""
-    brand_config = get_brand_config(brand)
-    return brand_config.get('language', 'en')
+    entry = get_config_view().brand(brand)
+    return entry.language if entry else 'en'
 
 
 # Convenience function to check if brand is configured
 def is_brand_configured(brand: str) -> bool:
     """Check if a brand has configuration."""
-    return bool(get_brand_config(brand))
+    entry = get_config_view().brand(brand)
+    return bool(entry and entry.config)
 
 
 # List all configured brands
 def list_configured_brands() -> List[str]:
     """Get list of all configured brand names."""
-    config = load_config()
-    return list(config.get('brands', {}).keys())
+    return list(get_config_view().brand_names)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Brand configuration tools')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compile_parser = subparsers.add_parser('compile', help='Compile brands_config.yaml into a binary snapshot')
+    compile_parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Cache directory')
+    compile_parser.add_argument('--keep-stale', action='store_true',
+                                help='Keep snapshots of previous YAML versions')
+    args = parser.parse_args()
+
+    # Through the module, so the snapshot pickles brand_config.ConfigView and not __main__.ConfigView
+    import brand_config
+
+    config_path = brand_config.get_config_path()
+    data = config_path.read_bytes()
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    start = time.perf_counter()
+    config = brand_config._parse_yaml(data)
+    view = brand_config.ConfigView(config)
+    yaml_ms = (time.perf_counter() - start) * 1000
+    snapshot_path = brand_config.write_compiled(sha256, config, view, args.cache_dir)
+
+    start = time.perf_counter()
+    brand_config._load_compiled(sha256, args.cache_dir)
+    snapshot_ms = (time.perf_counter() - start) * 1000
+
+    removed = 0
+    if not args.keep_stale:
+        for stale in snapshot_path.parent.glob('*.pkl'):
+            if stale != snapshot_path:
+                stale.unlink()
+                removed += 1
+
+    print(f"Compiled {config_path.name} ({len(view.brands)} brands, {len(view.industries)} industries, "
+          f"{len(view.aliases)} aliases, {len(view.non_source_trie)} non-source domains)")
+    print(f"  Snapshot: {snapshot_path} ({snapshot_path.stat().st_size / 1024:.1f} KB)")
+    print(f"  YAML parse + index: {yaml_ms:.1f} ms, snapshot load: {snapshot_ms:.1f} ms")
+    if removed:
+        print(f"  Removed {removed} stale snapshots")
@@ -0,0 +1,160 @@
+"""
+Compiled Multi-Brand Matcher
+
+Finds every known competitor (and the main brand) in an answer with a single
+regex scan, instead of compiling and running one \\b...\\b regex per competitor.
+
+The brand names are compiled into one trie-shaped regex wrapped in a lookahead,
+so the scan reports overlapping occurrences ("Mercedes" / "Mercedes-Benz",
+"Sky Bet" / "Bet Victor") exactly like the per-brand searches did:
+- detected: brands with a word-bounded occurrence (same as re.search(r'\\b' + brand + r'\\b'))
+- offsets: first substring occurrence of each brand (same as str.find, used for ranking)
+
+With an alias table every spelling of a competitor is searched and competitors
+are reported by canonical name ("bet 365" -> "Bet365"); the offset of a
+canonical name is the first occurrence of any of its spellings. Competitors
+without an alias that differ only in case ("Bwin" from the YAML, "bwin" from
+the Excel) are one brand, reported with one spelling (the first in sorted
+order), so results never hold two variants of a brand.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Set
+
+from brand_aliases import AliasTable
+
+
+def _is_word(char: str) -> bool:
+    """Same definition of a word character as the re module's \\b for str patterns."""
+    return char.isalnum() or char == '_'
+
+
+def _boundary(text: str, pos: int) -> bool:
+    """True if \\b matches at `pos` in `text`."""
+    before = pos > 0 and _is_word(text[pos - 1])
+    after = pos < len(text) and _is_word(text[pos])
+    return before != after
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Regex matching any of `words`, preferring the longest one at a given position."""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and '' not in node:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        # A word ends here: the continuation is optional (greedy, so longer words win)
+        return group + '?' if '' in node else group
+
+    return build(trie)
+
+
+class BrandMatches:
+    """Result of scanning one answer."""
+
+    def __init__(self, detected: List[str], offsets: Dict[str, int]):
+        self.detected = detected  # Competitors found with word boundaries (original spelling or canonical name, sorted)
+        self.offsets = offsets    # Lowercased brand -> first substring offset in the lowercased text
+
+
+class BrandMatcher:
+    """Single-pass matcher for a main brand and its set of known competitors."""
+
+    def __init__(self, main_brand: str, competitors: Iterable[str], aliases: Optional[AliasTable] = None):
+        """
+        Args:
+            main_brand: Main brand (located for ranking, never reported as a competitor)
+            competitors: Known competitor names (any case)
+            aliases: Alias table (competitors are then reported by canonical name)
+        """
+        self.main_brand_lower = main_brand.lower() if main_brand else ''
+
+        # Lowercased key -> reported names (several spellings may share a key)
+        self.spellings: Dict[str, List[str]] = {}
+        # Lowercased canonical name -> all its keys, for canonical names with several spellings
+        self.alias_keys: Dict[str, List[str]] = {}
+        # Lowercased name -> the one spelling reported for it (with an alias table)
+        names_by_key: Dict[str, str] = {}
+        # Sorted, so the spelling kept for a case-insensitive group does not depend on set order
+        for comp in sorted(competitors):
+            if aliases is None:
+                name, keys = comp, [comp.lower()]
+            else:
+                name, keys = aliases.canonical(comp), aliases.forms(comp)
+                name = names_by_key.setdefault(name.lower(), name)
+                if name.lower() == self.main_brand_lower:
+                    continue
+                if len(keys) > 1:
+                    self.alias_keys[name.lower()] = keys
+            for key in keys:
+                if key and key != self.main_brand_lower:
+                    names = self.spellings.setdefault(key, [])
+                    if name not in names:
+                        names.append(name)
+
+        keys: Set[str] = set(self.spellings)
+        if self.main_brand_lower:
+            keys.add(self.main_brand_lower)
+
+        # For each key, the keys that are also its prefixes (they match wherever it matches)
+        self.prefix_keys: Dict[str, List[str]] = {
+            key: [key[:n] for n in range(1, len(key) + 1) if key[:n] in keys]
+            for key in keys
+        }
+        self.pattern: Optional[Pattern] = (
+            re.compile('(?=(' + _trie_regex(keys) + '))') if keys else None
+        )
+
+    def scan(self, text: str) -> BrandMatches:
+        """Find all competitors and first offsets of every brand in one pass over `text`."""
+        if not text or self.pattern is None:
+            return BrandMatches([], {})
+
+        text_lower = text.lower()
+        offsets: Dict[str, int] = {}
+        bounded: Set[str] = set()
+
+        for match in self.pattern.finditer(text_lower):
+            start = match.start()
+            # Every key that matches here is the longest match or one of its prefixes
+            for key in self.prefix_keys[match.group(1)]:
+                if key not in offsets:
+                    offsets[key] = start
+                if key not in bounded and _boundary(text_lower, start) and _boundary(text_lower, start + len(key)):
+                    bounded.add(key)
+
+        detected = sorted({
+            spelling
+            for key in bounded if key in self.spellings
+            for spelling in self.spellings[key]
+        })
+        # A canonical name ranks at the first occurrence of any of its spellings
+        for name in detected:
+            keys = self.alias_keys.get(name.lower())
+            if keys:
+                offsets[name.lower()] = min(offsets[key] for key in keys if key in offsets)
+        return BrandMatches(detected, offsets)
+
+
+@lru_cache(maxsize=64)
+def _cached_matcher(main_brand: str, competitors: FrozenSet[str], aliases: Optional[AliasTable]) -> BrandMatcher:
+    return BrandMatcher(main_brand, competitors, aliases)
+
+
+def get_brand_matcher(
+    main_brand: str,
+    competitors: Iterable[str],
+    aliases: Optional[AliasTable] = None
+) -> BrandMatcher:
+    """Get a compiled matcher for (main brand, competitor set, alias table), built once and cached."""
+    return _cached_matcher(main_brand, frozenset(competitors), aliases)
@@ -0,0 +1,113 @@
+"""
+Persisted Category Index
+
+The question -> category map read from the Excel category sheets, and the
+fuzzy QuestionIndex built over it, only depend on the workbook contents and
+the selected sheets. They are saved to disk after the first build, keyed by
+the workbook SHA-256 and the sheet list, so later runs load them instead of
+re-reading the sheets and rebuilding the n-gram structures. Editing the Excel
+(or choosing other sheets) changes the key and triggers a rebuild.
+
+Artifact (pickle): (CATEGORY_INDEX_VERSION, categories, counts, question_index)
+- categories: category table [(category_id, category_name), ...]
+- counts: number of questions of each category of the table
+- question_index: QuestionIndex whose values point into the category table
+  (trigram postings and length ordering included; character counts are
+  recounted on load)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from question_index import QuestionIndex
+from response_cache import DEFAULT_CACHE_DIR
+
+# Bump when the artifact layout or the question normalization changes
+CATEGORY_INDEX_VERSION = 2
+
+
+class CategoryIndex:
+    """Question -> category map of a workbook with its category table and fuzzy index."""
+
+    def __init__(self, question_index: QuestionIndex, categories: List[Tuple[int, str]], counts: List[int]):
+        """
+        Args:
+            question_index: Fuzzy index over the normalized questions
+            categories: Category table (category_id, category_name), sorted by id
+            counts: Number of questions of each category in the table
+        """
+        self.question_index = question_index
+        self.categories = categories
+        self.counts = counts
+        self.question_to_category: Dict[str, Tuple[int, str]] = question_index.to_dict()
+        self.from_cache = False
+
+    @classmethod
+    def build(cls, question_to_category: Dict[str, Tuple[int, str]]) -> 'CategoryIndex':
+        """Build the category table and fuzzy index for a question -> category map."""
+        # Every question of a category shares one (id, name) tuple from the table
+        table: Dict[Tuple[int, str], Tuple[int, str]] = {}
+        shared = {q: table.setdefault(c, c) for q, c in question_to_category.items()}
+        counts = Counter(shared.values())
+        categories = sorted(table)
+        return cls(QuestionIndex(shared), categories, [counts[c] for c in categories])
+
+    def question_counts(self) -> Dict[Tuple[int, str], int]:
+        """Questions per (category_id, category_name), by category id."""
+        return dict(zip(self.categories, self.counts))
+
+
+def _index_path(cache_dir: str, file_hash: str, category_sheets: List[str]) -> Path:
+    sheets = hashlib.sha256(json.dumps(category_sheets, ensure_ascii=False).encode('utf-8')).hexdigest()
+    return Path(cache_dir) / "indexes" / f"{file_hash}-{sheets[:16]}.pkl"
+
+
+def load_category_index(
+    file_hash: str,
+    category_sheets: List[str],
+    build: Callable[[], Dict[str, Tuple[int, str]]],
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR
+) -> CategoryIndex:
+    """
+    Get the category index of a workbook, from the disk cache when possible.
+
+    Args:
+        file_hash: SHA-256 of the Excel file (WorkbookSnapshot.file_hash)
+        category_sheets: Sheets the categories are read from (part of the key)
+        build: Returns the question -> category map when there is no usable artifact
+        cache_dir: Cache directory (None = always build, never write an artifact)
+
+    Returns:
+        CategoryIndex (from_cache=True when loaded from disk)
+    """
+    if cache_dir is None:
+        return CategoryIndex.build(build())
+
+    index_path = _index_path(cache_dir, file_hash, category_sheets)
+    if index_path.exists():
+        try:
+            with open(index_path, 'rb') as f:
+                version, *artifact = pickle.load(f)
+            if version == CATEGORY_INDEX_VERSION:
+                categories, counts, question_index = artifact
+                index = CategoryIndex(question_index, categories, counts)
+                index.from_cache = True
+                return index
+        except Exception as e:
+            print(f"  Warning: ignoring unreadable category index {index_path.name}: {e}")
+
+    index = CategoryIndex.build(build())
+
+    # Write to a temp file and rename, so a crash never leaves a truncated artifact
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        pickle.dump((CATEGORY_INDEX_VERSION, index.categories, index.counts, index.question_index), f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, index_path)
+    return index
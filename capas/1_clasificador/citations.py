@@ -0,0 +1,205 @@
+"""
+Citation Extractor
+
+Precompiled version of classifier.extract_citations. Exclusion lists are
+frozen and the patterns compiled once per configuration version.
+
+The three line-based patterns all start with sentence punctuation followed by
+a line break, so instead of three re.findall passes over the whole answer a
+single pass over its line breaks finds those anchors and the patterns are only
+tried there. This yields exactly the matches the separate findall passes found.
+
+Domain-like sources and URL hosts are also checked against a DomainTrie of the
+non-source domains, so subdomains ("www.youtube.com", "m.facebook.com") are
+rejected like the domains themselves.
+"""
+
+import re
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+from domain_trie import DomainTrie
+
+try:
+    from brand_config import get_config_version, get_config_view, get_non_source_domains
+    HAS_BRAND_CONFIG = True
+except ImportError:
+    HAS_BRAND_CONFIG = False
+
+# Common section headers to exclude (not citations)
+SECTION_HEADERS = frozenset({
+    'pros', 'cons', 'ventajas', 'desventajas', 'nota', 'note', 'notes',
+    'tips', 'tip', 'warning', 'conclusion', 'conclusión', 'resumen',
+    'summary', 'example', 'ejemplo', 'important', 'importante',
+    'alternativas', 'alternatives', 'opciones', 'options'
+})
+
+# Non-sources used when brand_config is not available (social media, generic platforms)
+DEFAULT_NON_SOURCES = frozenset({
+    'facebook', 'facebook.com', 'youtube', 'youtube.com', 'twitter',
+    'twitter.com', 'x.com', 'instagram', 'instagram.com', 'tiktok',
+    'tiktok.com', 'reddit', 'reddit.com', 'linkedin', 'linkedin.com',
+    'pinterest', 'pinterest.com', 'whatsapp', 'telegram'
+})
+
+# Common words that indicate a phrase, not a source name
+# Note: 'the' is NOT included because many legitimate sources start with "The"
+# (e.g., "The Sun", "The AA", "The Electric Car Scheme")
+SENTENCE_INDICATORS = frozenset({
+    'you', 'i', 'we', 'they', 'he', 'she', 'it', 'this', 'that',
+    'a', 'an', 'is', 'are', 'was', 'were', 'have', 'has', 'had', 'do',
+    'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might',
+    'must', 'can', 'if', 'when', 'where', 'what', 'why', 'how', 'which',
+    'there', 'here', 'some', 'any', 'all', 'most', 'many', 'few', 'no',
+    'not', 'only', 'also', 'just', 'even', 'still', 'already', 'always',
+    'never', 'often', 'sometimes', 'usually', 'generally', 'typically'
+})
+
+# Characters that cannot start a source name (emoji bullets)
+EMOJI_PREFIXES = frozenset('✔❌⚖📈🚗💡⚠🔁🏦🧠🔌🔋🚙🚘🏎️⚡🤔👉💶👍📊📌🧾🎯🧩🥇🤝')
+
+_DOMAIN_TLD = re.compile(r'\.(com|org|net|uk|es|co|io|info|gov|edu)')
+
+_ANCHOR_PUNCTUATION = '.!?)'
+
+# Line-based source patterns, tried only at anchors (punctuation + whitespace + line break)
+_PLUS = re.compile(r'[\.\!\?\)]\s*\n([A-Za-z][A-Za-z0-9\.\-\' ]{2,45}?)\n\+\d+')   # "Wikipedia\n+2"
+_DOMAIN = re.compile(r'[\.\!\?\)]\s*\n([a-zA-Z][a-zA-Z0-9\-]*\.[a-zA-Z0-9\.\-]+)\n')  # "racingpost.com"
+_SOURCE = re.compile(r'[\.\!\?\)]\s*\n([A-Z][A-Za-z0-9\.\-\' ]{2,40})\n(?![A-Za-z\+])')  # "The Guardian"
+_URL = re.compile(r'https?://([^\s/\)]+)')
+
+
+def expand_non_sources(domains: Iterable[str]) -> FrozenSet[str]:
+    """Configured non-source domains plus their names without .com/.org."""
+    domains = set(domains)
+    return frozenset(domains | {d.replace('.com', '').replace('.org', '') for d in domains})
+
+
+class CitationExtractor:
+    """Citation extractor for one set of non-source domains (immutable)."""
+
+    def __init__(self, non_sources: Iterable[str] = DEFAULT_NON_SOURCES, domains: Optional[DomainTrie] = None):
+        """
+        Args:
+            non_sources: Lowercased names/domains that are never citations
+            domains: Non-source domains whose subdomains are not citations either
+                (default: the dotted entries of non_sources)
+        """
+        self.non_sources = frozenset(non_sources)
+        if domains is None:
+            domains = DomainTrie(name for name in self.non_sources if '.' in name)
+        self.domains = domains
+
+    def is_valid_source(self, source: str) -> bool:
+        """Check if a string looks like a valid source name."""
+        source_lower = source.lower()
+
+        # Check against exclusion lists
+        if source_lower in SECTION_HEADERS or source_lower in self.non_sources:
+            return False
+        if '.' in source_lower and source_lower in self.domains:
+            return False
+
+        # Check if starts with sentence indicator (likely a phrase, not a source)
+        words = source_lower.split()
+        if words and words[0] in SENTENCE_INDICATORS:
+            return False
+
+        # Too many words = likely a sentence (sources typically 1-4 words)
+        if len(words) > 5:
+            return False
+
+        # Contains sentence-ending punctuation inside = likely not a source
+        if '.' in source[:-1] and not _DOMAIN_TLD.search(source_lower):
+            # Has internal period but not a domain
+            return False
+
+        # Starts with emoji or number
+        if source[0] in EMOJI_PREFIXES or source[0].isdigit():
+            return False
+
+        return True
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Extract citations/sources from answer text (same result as classifier.extract_citations).
+
+        Args:
+            text: Answer text to analyze
+
+        Returns:
+            Sorted list of unique citation sources found
+        """
+        if not text:
+            return []
+
+        citations = set()
+        # End of the last accepted match of each pattern: like re.findall, a
+        # pattern's matches never overlap each other (but may overlap other patterns)
+        plus_end = domain_end = source_end = 0
+        last_anchor = -1
+        prev_newline = prev_pos = -1
+
+        newline = text.find('\n')
+        while newline != -1:
+            # Anchor: punctuation right before the whitespace run holding this line break
+            pos = newline - 1
+            while pos > prev_newline and text[pos].isspace():
+                pos -= 1
+            if pos == prev_newline:
+                pos = prev_pos  # Only whitespace since the previous line break: same anchor
+            prev_newline, prev_pos = newline, pos
+            newline = text.find('\n', newline + 1)
+            if pos < 0 or pos == last_anchor or text[pos] not in _ANCHOR_PUNCTUATION:
+                continue
+            last_anchor = pos
+
+            # Pattern 1: Source followed by newline and +N (e.g., "Wikipedia\n+2")
+            match = _PLUS.match(text, pos) if pos >= plus_end else None
+            if match:
+                plus_end = match.end()
+                source = match.group(1).strip()
+                if len(source) >= 3 and self.is_valid_source(source):
+                    citations.add(source)
+
+            # Pattern 2: Domain-like sources (e.g., "support.betfair.es", "racingpost.com")
+            match = _DOMAIN.match(text, pos) if pos >= domain_end else None
+            if match:
+                domain_end = match.end()
+                source = match.group(1).strip()
+                # Must have at least one dot and valid TLD pattern
+                if len(source) >= 5 and '.' in source and self.is_valid_source(source):
+                    citations.add(source)
+
+            # Pattern 3: Capitalized source names on their own line (single line, no extra content)
+            match = _SOURCE.match(text, pos) if pos >= source_end else None
+            if match:
+                source_end = match.end()
+                source = match.group(1).strip()
+                if len(source) >= 3 and '\n' not in source and self.is_valid_source(source):
+                    citations.add(source)
+
+        # Pattern 4: URLs - extract domain (but filter non-sources)
+        for url in _URL.findall(text):
+            if self.is_valid_source(url):
+                citations.add(url)
+
+        return sorted(citations)
+
+
+# (config version, extractor) of the last extractor built
+_extractor: Optional[Tuple[int, CitationExtractor]] = None
+
+
+def get_citation_extractor() -> CitationExtractor:
+    """Citation extractor for the current configuration, rebuilt only when the config is reloaded."""
+    global _extractor
+    if not HAS_BRAND_CONFIG:
+        if _extractor is None:
+            _extractor = (0, CitationExtractor(DEFAULT_NON_SOURCES))
+        return _extractor[1]
+
+    version = get_config_version()
+    if _extractor is None or _extractor[0] != version:
+        _extractor = (version, CitationExtractor(expand_non_sources(get_non_source_domains()),
+                                                 get_config_view().non_source_trie))
+    return _extractor[1]
@@ -7,20 +7,38 @@ Works with any language as it uses exact text matching.
 
 import json
 import os
-import pandas as pd
 import re
-import requests
-import spacy
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from difflib import SequenceMatcher
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from brand_aliases import AliasTable, get_alias_table
+from brand_matcher import BrandMatcher, get_brand_matcher
+from category_index import load_category_index
+from citations import get_citation_extractor
+from competitor_store import CompetitorStore, competitor_key, get_competitor_store
+from features import enrich_frame, frame_records, records_frame, write_parquet
+from incremental import FingerprintWriter, context_fingerprint, load_previous, record_fingerprint
+from json_stream import RecordWriter, iter_export_records
+from question_index import QuestionIndex
+from record_stats import RecordStats, stats_path
+from response_cache import DEFAULT_CACHE_DIR
+from workbook import WorkbookSnapshot, load_workbook
+
+# Heavy optional dependencies are imported lazily (spaCy only when NER is used,
+# the OpenRouter HTTP stack only when competitors are requested from the LLM),
+# so importing this module stays fast.
+if TYPE_CHECKING:
+    import spacy
 
 # OpenRouter configuration (shared with evaluator)
 OPENROUTER_API_KEY = os.environ.get('OPENROUTER_API_KEY', '')
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 LLM_MODEL = "google/gemini-2.0-flash-lite-001"
 
-# Cache for LLM-generated competitors (avoid repeated API calls)
+# Cache for LLM-generated competitors (avoid repeated API calls; persisted in competitor_store)
 _llm_competitors_cache: Dict[str, Set[str]] = {}
 
 # Import brand configuration (use try/except for backward compatibility)
@@ -28,23 +46,69 @@ try:
     from brand_config import (
         get_competitors, get_ignore_terms, get_non_source_domains,
         is_valid_citation_domain, get_language, is_brand_configured,
-        detect_industry_from_keywords, get_industry_ignore_terms
+        detect_industry_from_keywords, detect_industries, get_industry_ignore_terms,
+        list_configured_brands
     )
     HAS_BRAND_CONFIG = True
 except ImportError:
     HAS_BRAND_CONFIG = False
 
 FUZZY_THRESHOLD = 0.85  # Minimum similarity ratio for fuzzy matching
+INDUSTRY_SAMPLE_QUESTIONS = 50  # Questions added to the industry detection text
 
 # Lazy-loaded spaCy models
-_nlp_models: Dict[str, spacy.Language] = {}
+_nlp_models: Dict[str, 'spacy.Language'] = {}
+
+
+def _fetch_competitors_from_llm(brand: str, industry: str, country: str, api_key: str) -> Optional[Set[str]]:
+    """Ask the LLM for the competitors of a brand. Returns None if the call failed."""
+    from openrouter_client import OpenRouterError, get_client
+
+    prompt = f"""List the 15-20 main competitors of {brand} in the {industry} market in {country}.
+
+IMPORTANT:
+- Return ONLY brand/company names, one per line
+- No explanations, no numbers, no descriptions
+- Just the competitor names
+
+Example format:
+CompetitorA
+CompetitorB
+CompetitorC"""
+
+    payload = {
+        "model": LLM_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.3,  # Low temperature for consistent results
+        "max_tokens": 500
+    }
+
+    try:
+        # Shared client: rate limiting, retries and backoff
+        content = get_client().chat(payload, api_key=api_key)
+    except OpenRouterError as e:
+        print(f"  Warning: Failed to get competitors from LLM: {e}")
+        return None
+
+    # Parse response: split by newlines and clean up
+    competitors = set()
+    for line in content.split('\n'):
+        line = line.strip()
+        # Skip empty lines, lines with numbers, or lines with explanatory text
+        if line and not line[0].isdigit() and len(line) < 50 and ':' not in line:
+            # Remove any bullet points or dashes at the start
+            line = re.sub(r'^[-•*]\s*', '', line)
+            if line and line.lower() != brand.lower():
+                competitors.add(line)
+    return competitors
 
 
 def get_competitors_from_llm(
     brand: str,
     industry: str,
     country: str,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    store: Optional[CompetitorStore] = None
 ) -> Set[str]:
     """
     Get competitors for a brand by asking an LLM.
@@ -52,76 +116,58 @@ def get_competitors_from_llm(
     This is used when a brand is not pre-configured in YAML, allowing
     the system to work with any brand without manual configuration.
 
+    Results are kept in a persistent store, so only the first run for a
+    brand|industry|country waits for the LLM. Stale entries are served as is
+    while a background refresh updates them; pinned entries are never refreshed.
+
     Args:
         brand: The brand name
         industry: Industry/market (e.g., 'automotive', 'betting')
         country: Country/market (e.g., 'Spain', 'UK', 'USA')
         api_key: OpenRouter API key (uses env var if not provided)
+        store: Competitor store (shared default store if not provided)
 
     Returns:
         Set of competitor brand names
     """
     # Check cache first
-    cache_key = f"{brand}|{industry}|{country}".lower()
+    cache_key = competitor_key(brand, industry, country)
     if cache_key in _llm_competitors_cache:
         return _llm_competitors_cache[cache_key]
 
+    store = store or get_competitor_store()
     key = api_key or OPENROUTER_API_KEY
+
+    entry = store.get(cache_key)
+    if entry is not None:
+        if entry.pinned:
+            print(f"  Using pinned competitors for {brand} in {country}")
+        elif store.is_stale(entry) and key:
+            store.refresh_in_background(
+                cache_key, lambda: _fetch_competitors_from_llm(brand, industry, country, key)
+            )
+            print(f"  Using stored competitors for {brand} in {country} "
+                  f"({entry.age_days():.0f} days old, refreshing in background)")
+        else:
+            print(f"  Using stored competitors for {brand} in {country} ({entry.age_days():.0f} days old)")
+        _llm_competitors_cache[cache_key] = entry.competitors
+        return entry.competitors
+
     if not key:
         print(f"  Warning: No OpenRouter API key - cannot get competitors from LLM")
         return set()
 
-    prompt = f"""List the 15-20 main competitors of {brand} in the {industry} market in {country}.
-
-IMPORTANT:
-- Return ONLY brand/company names, one per line
-- No explanations, no numbers, no descriptions
-- Just the competitor names
-
-Example format:
-CompetitorA
-CompetitorB
-CompetitorC"""
+    competitors = _fetch_competitors_from_llm(brand, industry, country, key)
+    if competitors is None:
+        return set()
 
-    headers = {
-        "Authorization": f"Bearer {key}",
-        "Content-Type": "application/json",
-    }
+    # Cache the result (in this process and for later runs)
+    _llm_competitors_cache[cache_key] = competitors
+    if competitors:
+        store.put(cache_key, competitors)
+    print(f"  LLM returned {len(competitors)} competitors for {brand} in {country}")
 
-    payload = {
-        "model": LLM_MODEL,
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.3,  # Low temperature for consistent results
-        "max_tokens": 500
-    }
-
-    try:
-        response = requests.post(OPENROUTER_URL, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-
-        result = response.json()
-        content = result['choices'][0]['message']['content'].strip()
-
-        # Parse response: split by newlines and clean up
-        competitors = set()
-        for line in content.split('\n'):
-            line = line.strip()
-            # Skip empty lines, lines with numbers, or lines with explanatory text
-            if line and not line[0].isdigit() and len(line) < 50 and ':' not in line:
-                # Remove any bullet points or dashes at the start
-                line = re.sub(r'^[-•*]\s*', '', line)
-                if line and line.lower() != brand.lower():
-                    competitors.add(line)
-
-        # Cache the result
-        _llm_competitors_cache[cache_key] = competitors
-        print(f"  LLM returned {len(competitors)} competitors for {brand} in {country}")
-
-        return competitors
-
-    except Exception as e:
-        print(f"  Warning: Failed to get competitors from LLM: {e}")
-        return set()
+    return competitors
 
 
 def normalize_question(text: str) -> str:
@@ -137,7 +183,7 @@ def normalize_question(text: str) -> str:
     return text.strip()
 
 
-def extract_brand_from_excel(excel_path: str) -> str:
+def extract_brand_from_excel(excel_path: str, workbook: Optional[WorkbookSnapshot] = None) -> str:
     """
     Extract brand name from Excel file title.
 
@@ -148,12 +194,13 @@ def extract_brand_from_excel(excel_path: str) -> str:
 
     Args:
         excel_path: Path to the Excel file
+        workbook: Already parsed workbook (loaded from excel_path if None)
 
     Returns:
         Brand name (e.g., "Betfair", "BYD")
     """
-    xl = pd.ExcelFile(excel_path)
-    df = pd.read_excel(xl, xl.sheet_names[0])
+    workbook = workbook or load_workbook(excel_path)
+    df = workbook.sheet(workbook.sheet_names[0])
 
     # Get first column header (contains the title)
     title = str(df.columns[0]).upper()
@@ -210,7 +257,8 @@ def check_brand_mention(text: str, brand: str) -> bool:
 def build_ranking_list(
     text: str,
     main_brand: str,
-    other_brands: List[str]
+    other_brands: List[str],
+    offsets: Optional[Dict[str, int]] = None
 ) -> Tuple[List[str], Optional[int]]:
     """
     Build a ranking list of all brands ordered by first appearance in text.
@@ -219,6 +267,8 @@ def build_ranking_list(
         text: Text to analyze
         main_brand: The main brand
         other_brands: List of other brands detected in the text
+        offsets: Optional first offsets by lowercased brand (from BrandMatcher.scan),
+                 used instead of searching the text once per brand
 
     Returns:
         Tuple of (ranking_list, position):
@@ -228,18 +278,22 @@ def build_ranking_list(
     if not text:
         return [], None
 
-    text_lower = text.lower()
+    if offsets is None:
+        text_lower = text.lower()
+        find = text_lower.find
+    else:
+        find = lambda brand_lower: offsets.get(brand_lower, -1)
     brand_positions = []
 
     # Find position of main brand
     if main_brand:
-        main_pos = text_lower.find(main_brand.lower())
+        main_pos = find(main_brand.lower())
         if main_pos != -1:
             brand_positions.append((main_brand, main_pos))
 
     # Find positions of all other brands
     for brand in other_brands:
-        pos = text_lower.find(brand.lower())
+        pos = find(brand.lower())
         if pos != -1:
             brand_positions.append((brand, pos))
 
@@ -276,107 +330,11 @@ def extract_citations(text: str) -> List[str]:
     Returns:
         List of unique citation sources found
     """
-    if not text:
-        return []
-
-    citations = set()
-
-    # Common section headers to exclude (not citations)
-    section_headers = {
-        'pros', 'cons', 'ventajas', 'desventajas', 'nota', 'note', 'notes',
-        'tips', 'tip', 'warning', 'conclusion', 'conclusión', 'resumen',
-        'summary', 'example', 'ejemplo', 'important', 'importante',
-        'alternativas', 'alternatives', 'opciones', 'options'
-    }
+    # Precompiled patterns and exclusion sets, rebuilt only when the config is reloaded
+    return get_citation_extractor().extract(text)
 
-    # Non-sources to exclude (social media, generic platforms)
-    # Load from configuration if available
-    if HAS_BRAND_CONFIG:
-        non_sources = get_non_source_domains()
-        # Add non-domain versions too
-        non_sources = non_sources | {d.replace('.com', '').replace('.org', '') for d in non_sources}
-    else:
-        non_sources = {
-            'facebook', 'facebook.com', 'youtube', 'youtube.com', 'twitter',
-            'twitter.com', 'x.com', 'instagram', 'instagram.com', 'tiktok',
-            'tiktok.com', 'reddit', 'reddit.com', 'linkedin', 'linkedin.com',
-            'pinterest', 'pinterest.com', 'whatsapp', 'telegram'
-        }
 
-    # Common words that indicate a phrase, not a source name
-    # Note: 'the' is NOT included because many legitimate sources start with "The"
-    # (e.g., "The Sun", "The AA", "The Electric Car Scheme")
-    sentence_indicators = {
-        'you', 'i', 'we', 'they', 'he', 'she', 'it', 'this', 'that',
-        'a', 'an', 'is', 'are', 'was', 'were', 'have', 'has', 'had', 'do',
-        'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might',
-        'must', 'can', 'if', 'when', 'where', 'what', 'why', 'how', 'which',
-        'there', 'here', 'some', 'any', 'all', 'most', 'many', 'few', 'no',
-        'not', 'only', 'also', 'just', 'even', 'still', 'already', 'always',
-        'never', 'often', 'sometimes', 'usually', 'generally', 'typically'
-    }
-
-    def is_valid_source(source: str) -> bool:
-        """Check if a string looks like a valid source name."""
-        source_lower = source.lower()
-
-        # Check against exclusion lists
-        if source_lower in section_headers or source_lower in non_sources:
-            return False
-
-        # Check if starts with sentence indicator (likely a phrase, not a source)
-        first_word = source_lower.split()[0] if source.split() else ''
-        if first_word in sentence_indicators:
-            return False
-
-        # Too many words = likely a sentence (sources typically 1-4 words)
-        word_count = len(source.split())
-        if word_count > 5:
-            return False
-
-        # Contains sentence-ending punctuation inside = likely not a source
-        if '.' in source[:-1] and not re.search(r'\.(com|org|net|uk|es|co|io|info|gov|edu)', source_lower):
-            # Has internal period but not a domain
-            return False
-
-        # Starts with emoji or number
-        if source[0] in '✔❌⚖📈🚗💡⚠🔁🏦🧠🔌🔋🚙🚘🏎️⚡🤔👉💶👍📊📌🧾🎯🧩🥇🤝' or source[0].isdigit():
-            return False
-
-        return True
-
-    # Pattern 1: Source followed by newline and +N (e.g., "Wikipedia\n+2")
-    pattern_plus = re.findall(r'[\.\!\?\)]\s*\n([A-Za-z][A-Za-z0-9\.\-\' ]{2,45}?)\n\+\d+', text)
-    for match in pattern_plus:
-        source = match.strip()
-        if len(source) >= 3 and is_valid_source(source):
-            citations.add(source)
-
-    # Pattern 2: Domain-like sources (e.g., "support.betfair.es", "racingpost.com")
-    pattern_domain = re.findall(r'[\.\!\?\)]\s*\n([a-zA-Z][a-zA-Z0-9\-]*\.[a-zA-Z0-9\.\-]+)\n', text)
-    for match in pattern_domain:
-        source = match.strip()
-        # Must have at least one dot and valid TLD pattern
-        if len(source) >= 5 and '.' in source and is_valid_source(source):
-            citations.add(source)
-
-    # Pattern 3: Capitalized source names on their own line (single line, no extra content)
-    pattern_source = re.findall(r'[\.\!\?\)]\s*\n([A-Z][A-Za-z0-9\.\-\' ]{2,40})\n(?![A-Za-z\+])', text)
-    for match in pattern_source:
-        source = match.strip()
-        if len(source) >= 3 and '\n' not in source and is_valid_source(source):
-            citations.add(source)
-
-    # Pattern 4: URLs - extract domain (but filter non-sources)
-    urls = re.findall(r'https?://([^\s/\)]+)', text)
-    for url in urls:
-        if is_valid_source(url):
-            citations.add(url)
-
-    return sorted(citations)
-
-
-def get_nlp_model(lang: str) -> spacy.Language:
+def get_nlp_model(lang: str) -> 'spacy.Language':
     """
     Get spaCy model for the specified language (lazy loading).
 
@@ -387,6 +345,8 @@ def get_nlp_model(lang: str) -> spacy.Language:
         Loaded spaCy model
     """
     if lang not in _nlp_models:
+        import spacy
+
         model_name = 'es_core_news_sm' if lang == 'es' else 'en_core_web_sm'
         try:
             _nlp_models[lang] = spacy.load(model_name)
@@ -398,22 +358,23 @@ def get_nlp_model(lang: str) -> spacy.Language:
     return _nlp_models[lang]
 
 
-def extract_competitors_from_excel(excel_path: str) -> Set[str]:
+def extract_competitors_from_excel(excel_path: str, workbook: Optional[WorkbookSnapshot] = None) -> Set[str]:
     """
     Extract competitor names from the comparative sheet in Excel.
 
     Args:
         excel_path: Path to the Excel file
+        workbook: Already parsed workbook (loaded from excel_path if None)
 
     Returns:
         Set of competitor names
     """
-    xl = pd.ExcelFile(excel_path)
+    workbook = workbook or load_workbook(excel_path)
     competitors = set()
 
-    for sheet in xl.sheet_names:
+    for sheet in workbook.sheet_names:
         if 'compet' in sheet.lower():
-            df = pd.read_excel(xl, sheet)
+            df = workbook.sheet(sheet)
             # Look for Competidor/Competitor column
             for col in ['Competidor', 'Competitor']:
                 if col in df.columns:
@@ -445,34 +406,24 @@ def detect_brands_in_text(
         industry: Optional industry for filtering (not used in whitelist approach)
 
     Returns:
-        List of detected brand names (excluding main brand)
+        List of detected brand names (excluding main brand), by canonical name
+        when the config defines aliases for them
     """
     if not text:
         return []
 
-    detected = set()
-    text_lower = text.lower()
-    main_brand_lower = main_brand.lower()
-
     # WHITELIST APPROACH: Only check for known competitors
-    # This eliminates false positives from NER (leagues, regulators, generic terms)
-    for comp in known_competitors:
-        comp_lower = comp.lower()
-        # Skip if it's the main brand
-        if comp_lower == main_brand_lower:
-            continue
-        # Use word boundaries to avoid matching substrings (e.g., "Ford" in "affordable")
-        pattern = r'\b' + re.escape(comp_lower) + r'\b'
-        if re.search(pattern, text_lower):
-            detected.add(comp)
-
-    return sorted(detected)
+    # This eliminates false positives from NER (leagues, regulators, generic terms).
+    # Word boundaries avoid matching substrings (e.g., "Ford" in "affordable");
+    # all competitors are matched in one pass by a matcher compiled once per competitor set.
+    return get_brand_matcher(main_brand, known_competitors, get_alias_table()).scan(text).detected
 
 
 def fuzzy_match(
     query: str,
     candidates: Dict[str, Tuple[int, str]],
-    threshold: float = FUZZY_THRESHOLD
+    threshold: float = FUZZY_THRESHOLD,
+    index: Optional[QuestionIndex] = None
 ) -> Tuple[Tuple[int, str], float]:
     """
     Find the best fuzzy match for a query among candidates.
@@ -481,10 +432,14 @@ def fuzzy_match(
         query: Normalized question text to match
         candidates: Dict mapping normalized questions to (category_id, category_name)
         threshold: Minimum similarity ratio (0-1)
+        index: Prebuilt QuestionIndex over `candidates` (avoids the full O(N) SequenceMatcher scan)
 
     Returns:
         Tuple of ((category_id, category_name), similarity_ratio) or ((0, 'Unknown'), 0) if no match
     """
+    if index is not None:
+        return index.best_match(query, threshold)
+
     best_match = (0, 'Unknown')
     best_ratio = 0.0
 
@@ -500,26 +455,31 @@ def fuzzy_match(
     return (0, 'Unknown'), 0.0
 
 
-def load_categories_from_excel(excel_path: str, category_sheets: List[str]) -> Dict[str, Tuple[int, str]]:
+def load_categories_from_excel(
+    excel_path: str,
+    category_sheets: List[str],
+    workbook: Optional[WorkbookSnapshot] = None
+) -> Dict[str, Tuple[int, str]]:
     """
     Extract question -> category mapping from Excel sheets.
 
     Args:
         excel_path: Path to the Excel file
         category_sheets: List of sheet names that contain categories
+        workbook: Already parsed workbook (loaded from excel_path if None)
 
     Returns:
         Dictionary mapping question text to (category_id, category_name)
     """
-    xl = pd.ExcelFile(excel_path)
+    workbook = workbook or load_workbook(excel_path)
     question_to_category = {}
 
     for idx, sheet_name in enumerate(category_sheets, start=1):
-        if sheet_name not in xl.sheet_names:
+        if sheet_name not in workbook.sheet_names:
             print(f"Warning: Sheet '{sheet_name}' not found in Excel")
             continue
 
-        df = pd.read_excel(xl, sheet_name)
+        df = workbook.sheet(sheet_name)
 
         # Find column containing questions (look for 'Pregunta', 'Question', or similar)
         question_col = None
@@ -560,6 +520,158 @@ def load_categories_from_excel(excel_path: str, category_sheets: List[str]) -> D
     return question_to_category
 
 
+def enrich_record(
+    record: dict,
+    question_to_category: Dict[str, Tuple[int, str]],
+    brand: str,
+    question_index: QuestionIndex,
+    brand_matcher: BrandMatcher
+) -> Tuple[dict, Optional[str]]:
+    """
+    Add category, mention, ranking_list, position and citations to one record.
+
+    Args:
+        record: Record from the JSON export
+        question_to_category: Mapping from question text to (category_id, category_name)
+        brand: Brand name to check for mentions
+        question_index: Fuzzy index built over question_to_category
+        brand_matcher: Compiled matcher for the brand and its competitors
+
+    Returns:
+        Tuple of (enriched_record, fuzzy_note) where fuzzy_note is the log line of a
+        fuzzy category match (None if the question matched exactly or not at all)
+    """
+    question_text = record.get('question_text', '').strip()
+    answer_text = record.get('answer', '').strip()
+    normalized = normalize_question(question_text)
+    fuzzy_note = None
+
+    # Try exact match first
+    cat_info = question_to_category.get(normalized)
+
+    # Fall back to fuzzy match if no exact match
+    if cat_info is None:
+        cat_info, ratio = fuzzy_match(normalized, question_to_category, index=question_index)
+        if cat_info[0] != 0:
+            fuzzy_note = f"  Fuzzy match ({ratio:.0%}): '{question_text[:50]}...'"
+
+    # Check brand mention in answer
+    mention = check_brand_mention(answer_text, brand)
+
+    # Detect other brands in answer (same result as detect_brands_in_text, single scan)
+    matches = brand_matcher.scan(answer_text)
+    other_brands = matches.detected
+
+    # Build ranking list ordered by position (includes main brand)
+    ranking_list, position = build_ranking_list(answer_text, brand, other_brands, matches.offsets)
+
+    # Extract citations from answer
+    citations = extract_citations(answer_text)
+
+    enriched_record = {
+        **record,
+        'category': cat_info[0],
+        'category_name': cat_info[1],
+        'mention': mention,
+        'ranking_list': ranking_list,
+        'position': position,
+        'citations': citations
+    }
+    return enriched_record, fuzzy_note
+
+
+# Per-process state of enrichment workers (built once by _init_enrich_worker)
+_worker_state: Dict[str, object] = {}
+
+WORKER_CHUNK_SIZE = 32  # Records sent to a worker per task
+
+
+def _init_enrich_worker(
+    question_index: QuestionIndex,
+    brand: str,
+    competitors: Set[str],
+    aliases: AliasTable
+) -> None:
+    _worker_state['question_to_category'] = question_index.to_dict()
+    _worker_state['brand'] = brand
+    _worker_state['question_index'] = question_index
+    _worker_state['brand_matcher'] = BrandMatcher(brand, competitors, aliases)
+
+
+def _enrich_chunk_in_worker(records: List[dict]) -> List[Tuple[dict, Optional[str]]]:
+    return [
+        enrich_record(record, _worker_state['question_to_category'], _worker_state['brand'],
+                      _worker_state['question_index'], _worker_state['brand_matcher'])
+        for record in records
+    ]
+
+
+def _enrich_records_parallel(
+    records: Iterable[dict],
+    question_index: QuestionIndex,
+    brand: str,
+    competitors: Set[str],
+    aliases: AliasTable,
+    workers: int
+) -> Iterator[Tuple[dict, Optional[str]]]:
+    """
+    Enrich records on a process pool, yielding results in input order.
+
+    Records are sent in chunks with a bounded number of chunks in flight, so a
+    streamed input is never read far ahead of the output. Workers receive the
+    prebuilt question index instead of rebuilding it.
+    """
+    in_flight: deque = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_enrich_worker,
+                             initargs=(question_index, brand, competitors, aliases)) as executor:
+        records = iter(records)
+        chunks = iter(lambda: list(islice(records, WORKER_CHUNK_SIZE)), [])
+        for chunk in chunks:
+            in_flight.append(executor.submit(_enrich_chunk_in_worker, chunk))
+            if len(in_flight) >= workers * 4:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def _reuse_unchanged(
+    records: Iterable[dict],
+    previous: Dict[str, dict],
+    context: str,
+    enrich_all: Callable[[Iterable[dict]], Iterator[Tuple[dict, Optional[str]]]]
+) -> Iterator[Tuple[dict, Optional[str], str, bool]]:
+    """
+    Reuse previously enriched records whose fingerprint is unchanged, enrich the rest.
+
+    Only changed records are passed to `enrich_all` (serial or process pool);
+    results are merged back in input order.
+
+    Yields:
+        Tuples of (enriched_record, fuzzy_note, fingerprint, reused)
+    """
+    pending: deque = deque()  # (fingerprint, previous record or None) in input order
+
+    def changed_records() -> Iterator[dict]:
+        for record in records:
+            fingerprint = record_fingerprint(record, context)
+            reusable = previous.get(fingerprint)
+            pending.append((fingerprint, reusable))
+            if reusable is None:
+                yield record
+
+    for enriched_record, fuzzy_note in enrich_all(changed_records()):
+        # Records reused before this one (enrich_all has already pulled them)
+        while pending[0][1] is not None:
+            fingerprint, reusable = pending.popleft()
+            yield reusable, None, fingerprint, True
+        fingerprint, _ = pending.popleft()
+        yield enriched_record, fuzzy_note, fingerprint, False
+
+    while pending:
+        fingerprint, reusable = pending.popleft()
+        yield reusable, None, fingerprint, True
+
+
 def enrich_json_with_categories(
     json_path: str,
     question_to_category: Dict[str, Tuple[int, str]],
@@ -567,11 +679,21 @@ def enrich_json_with_categories(
     competitors: Set[str],
     lang: str = 'es',
     output_path: Optional[str] = None,
-    excel_path: Optional[str] = None
+    excel_path: Optional[str] = None,
+    stream: bool = False,
+    output_format: str = 'json',
+    workers: int = 1,
+    incremental: bool = False,
+    question_index: Optional[QuestionIndex] = None,
+    stats: Optional[RecordStats] = None,
+    industry_text: Optional[str] = None
 ) -> List[dict]:
     """
     Add category, mention, ranking_list, and position fields to each entry in the JSON file.
 
+    Records are read from the export incrementally and written to output_path as
+    they are enriched, so the input is never loaded as a whole.
+
     Args:
         json_path: Path to the input JSON file
         question_to_category: Mapping from question text to (category_id, category_name)
@@ -580,10 +702,27 @@ def enrich_json_with_categories(
         lang: Language code for NER ('es' or 'en')
         output_path: Path for output file (optional)
         excel_path: Path to Excel file (for industry detection)
+        stream: Do not keep enriched records in memory (constant memory, requires output_path)
+        output_format: 'json' (indented array), 'jsonl' (one record per line) or 'parquet'
+                       (whole battery enriched as a DataFrame, see features.py)
+        workers: Worker processes for per-record enrichment (1 = run in this process)
+        incremental: Copy records whose inputs are unchanged from the previous output_path
+                     (keeps the previous output in memory) and only enrich the others
+        question_index: Fuzzy index over question_to_category (built here if None)
+        stats: Statistics accumulator for the enriched records (new one if None); saved
+               as JSON next to output_path (<output>.stats.json)
+        industry_text: Text the industry of an unconfigured brand is detected from
+                       (default: excel_path)
 
     Returns:
-        Enriched data list
+        Enriched data list (empty when stream=True: records are only written to output_path)
     """
+    if (stream or incremental) and not output_path:
+        raise ValueError("stream and incremental modes require an output_path")
+    if output_format == 'parquet' and (stream or incremental or workers > 1):
+        raise ValueError("parquet output enriches the whole battery as one frame: "
+                         "stream, incremental and workers are not supported")
+
     detected_industry = None
 
     # Merge competitors from Excel with competitors from YAML config (if available)
@@ -598,9 +737,11 @@ def enrich_json_with_categories(
         else:
             # Brand not configured - try to detect industry and get competitors from LLM
             if excel_path:
-                detected_industry = detect_industry_from_keywords(excel_path)
+                industry_text = industry_text or excel_path
+                detected_industry = detect_industry_from_keywords(industry_text)
                 if detected_industry:
-                    print(f"  Brand '{brand}' not configured, detected industry: {detected_industry}")
+                    ranking = ', '.join(f"{s.industry} {s.confidence:.0%}" for s in detect_industries(industry_text))
+                    print(f"  Brand '{brand}' not configured, detected industry: {detected_industry} ({ranking})")
                     print(f"  Applying {detected_industry} industry filters")
 
                     # Detect country from Excel filename or language
@@ -628,106 +769,94 @@ def enrich_json_with_categories(
                         competitors = competitors | llm_competitors
                         print(f"  Merged {len(llm_competitors)} LLM competitors for {brand} in {country}")
 
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
     # Handle PHPMyAdmin export format
     enriched_data = []
-    unmatched_count = 0
-    mention_count = 0
-    ranking_list_count = 0
-    citations_count = 0
-    all_detected_brands: Dict[str, int] = {}
-    all_citations: Dict[str, int] = {}
-    position_stats: Dict[int, int] = {}  # position -> count
-
-    for item in data:
-        if item.get('type') == 'table' and 'data' in item:
-            for record in item['data']:
-                question_text = record.get('question_text', '').strip()
-                answer_text = record.get('answer', '').strip()
-                normalized = normalize_question(question_text)
-
-                # Try exact match first
-                cat_info = question_to_category.get(normalized)
-
-                # Fall back to fuzzy match if no exact match
-                if cat_info is None:
-                    cat_info, ratio = fuzzy_match(normalized, question_to_category)
-                    if cat_info[0] != 0:
-                        print(f"  Fuzzy match ({ratio:.0%}): '{question_text[:50]}...'")
-
-                if cat_info[0] == 0:
-                    unmatched_count += 1
-
-                # Check brand mention in answer
-                mention = check_brand_mention(answer_text, brand)
-                if mention:
-                    mention_count += 1
-
-                # Detect other brands in answer
-                other_brands = detect_brands_in_text(answer_text, brand, competitors, lang, detected_industry)
-
-                # Build ranking list ordered by position (includes main brand)
-                ranking_list, position = build_ranking_list(answer_text, brand, other_brands)
-                if ranking_list:
-                    ranking_list_count += 1
-                    for b in ranking_list:
-                        if b.lower() != brand.lower():  # Don't count main brand
-                            all_detected_brands[b] = all_detected_brands.get(b, 0) + 1
-                if position is not None:
-                    position_stats[position] = position_stats.get(position, 0) + 1
-
-                # Extract citations from answer
-                citations = extract_citations(answer_text)
-                if citations:
-                    citations_count += 1
-                    for c in citations:
-                        all_citations[c] = all_citations.get(c, 0) + 1
-
-                enriched_record = {
-                    **record,
-                    'category': cat_info[0],
-                    'category_name': cat_info[1],
-                    'mention': mention,
-                    'ranking_list': ranking_list,
-                    'position': position,
-                    'citations': citations
-                }
+    if stats is None:
+        stats = RecordStats(brand)
+
+    # Built once, reused by every record below (each worker builds its own matcher);
+    # the matcher is also shared by later runs in this process with the same competitors
+    if question_index is None:
+        question_index = QuestionIndex(question_to_category)
+    # Competitors are reported by canonical name (brands_config.yaml aliases)
+    aliases = get_alias_table()
+    brand_matcher = get_brand_matcher(brand, competitors, aliases) if workers <= 1 else None
+
+    if output_format == 'parquet':
+        # Columnar path: the whole battery as one DataFrame, written straight to Parquet
+        records = list(iter_export_records(json_path))
+        frame, notes = enrich_frame(records_frame(records),
+                                    question_to_category, brand, competitors, question_index, aliases)
+        enriched_data = frame_records(frame, records)
+        for enriched_record, fuzzy_note in zip(enriched_data, notes):
+            if fuzzy_note:
+                print(fuzzy_note)
+            stats.add(enriched_record)
+        stats.print_report()
+        if output_path:
+            write_parquet(frame, output_path)
+            print(f"Enriched PARQUET saved to: {output_path}")
+            stats.save(stats_path(output_path))
+        return enriched_data
+
+    def enrich_all(records: Iterable[dict]) -> Iterator[Tuple[dict, Optional[str]]]:
+        if workers > 1:
+            return _enrich_records_parallel(records, question_index, brand, competitors, aliases, workers)
+        return (
+            enrich_record(record, question_to_category, brand, question_index, brand_matcher)
+            for record in records
+        )
+
+    # Incremental mode: fingerprints of the previous run tell which records can be reused
+    total = reused_count = 0
+    fingerprint_writer = None
+    if incremental:
+        context = context_fingerprint(brand, competitors, question_to_category,
+                                      get_citation_extractor().non_sources, aliases.canonical_by_form)
+        previous = load_previous(output_path)
+
+    writer = RecordWriter(output_path, output_format) if output_path else None
+    try:
+        records = iter_export_records(json_path)
+        if incremental:
+            fingerprint_writer = FingerprintWriter(output_path)
+            results = _reuse_unchanged(records, previous, context, enrich_all)
+        else:
+            results = ((enriched, note, None, False) for enriched, note in enrich_all(records))
+
+        # Tally in input order (serial or parallel), so counts and report are identical
+        for enriched_record, fuzzy_note, fingerprint, reused in results:
+            if fuzzy_note:
+                print(fuzzy_note)
+            stats.add(enriched_record)
+            total += 1
+            if reused:
+                reused_count += 1
+            if fingerprint_writer:
+                fingerprint_writer.write(fingerprint)
+            if writer:
+                writer.write(enriched_record)
+            if not stream:
                 enriched_data.append(enriched_record)
+    except BaseException:
+        if writer:
+            writer.abort()
+        if fingerprint_writer:
+            fingerprint_writer.abort()
+        raise
+    if writer:
+        writer.close()
+    if fingerprint_writer:
+        fingerprint_writer.close()
+
+    if incremental:
+        print(f"  Incremental: {reused_count} records reused, {total - reused_count} recomputed")
+
+    stats.print_report()
 
-    if unmatched_count > 0:
-        print(f"Warning: {unmatched_count} questions could not be matched to a category")
-
-    total = len(enriched_data)
-    print(f"  Brand mentions: {mention_count}/{total} ({mention_count/total*100:.1f}%)")
-    print(f"  Answers with ranking list: {ranking_list_count}/{total} ({ranking_list_count/total*100:.1f}%)")
-    print(f"  Answers with citations: {citations_count}/{total} ({citations_count/total*100:.1f}%)")
-
-    # Show top detected brands
-    if all_detected_brands:
-        print("\n  Top other brands detected:")
-        for brand_name, count in sorted(all_detected_brands.items(), key=lambda x: -x[1])[:10]:
-            print(f"    - {brand_name}: {count}")
-
-    # Show position stats
-    if position_stats:
-        print("\n  Brand position distribution:")
-        for pos in sorted(position_stats.keys()):
-            count = position_stats[pos]
-            print(f"    - Position {pos}: {count} ({count/total*100:.1f}%)")
-
-    # Show top citations
-    if all_citations:
-        print("\n  Top citations:")
-        for citation, count in sorted(all_citations.items(), key=lambda x: -x[1])[:10]:
-            print(f"    - {citation}: {count}")
-
-    # Save if output path provided
     if output_path:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(enriched_data, f, ensure_ascii=False, indent=2)
-        print(f"Enriched JSON saved to: {output_path}")
+        print(f"Enriched {output_format.upper()} saved to: {output_path}")
+        stats.save(stats_path(output_path))
 
     return enriched_data
 
@@ -736,7 +865,12 @@ def classify(
     excel_path: str,
     json_path: str,
     output_path: str,
-    category_sheets: Optional[List[str]] = None
+    category_sheets: Optional[List[str]] = None,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+    stream: bool = False,
+    output_format: str = 'json',
+    workers: int = 1,
+    incremental: bool = False
 ) -> List[dict]:
     """
     Main classification function.
@@ -746,33 +880,41 @@ def classify(
         json_path: Path to JSON file with questions/answers
         output_path: Path for enriched output JSON
         category_sheets: List of sheet names to use as categories (auto-detected if None)
+        cache_dir: Directory for the workbook snapshot and category index (None = no caching)
+        stream: Write records as they are enriched without keeping them in memory
+        output_format: 'json' (indented array), 'jsonl' (one record per line) or 'parquet'
+        workers: Worker processes for per-record enrichment (1 = run in this process)
+        incremental: Reuse unchanged records from the previous output_path
 
     Returns:
-        List of enriched records
+        List of enriched records (empty when stream=True)
     """
+    # Parse the Excel once; every step below reads from this snapshot
+    workbook = load_workbook(excel_path, cache_dir)
+    print(f"Loaded workbook: {len(workbook.sheet_names)} sheets"
+          f"{' (cached snapshot)' if workbook.from_cache else ''}")
+
     # Auto-detect category sheets if not provided
     if category_sheets is None:
-        xl = pd.ExcelFile(excel_path)
         # Exclude common non-category sheets
         exclude = ['resumen', 'summary', 'plantilla', 'template', 'instructions']
         category_sheets = [
-            s for s in xl.sheet_names
+            s for s in workbook.sheet_names
             if not any(exc in s.lower() for exc in exclude)
         ]
 
     print(f"Using category sheets: {category_sheets}")
 
     # Extract brand from Excel
-    brand = extract_brand_from_excel(excel_path)
+    brand = extract_brand_from_excel(excel_path, workbook)
     print(f"Detected brand: {brand}")
 
     # Extract competitors from Excel
-    competitors = extract_competitors_from_excel(excel_path)
+    competitors = extract_competitors_from_excel(excel_path, workbook)
     print(f"Detected competitors: {len(competitors)} ({', '.join(sorted(competitors)[:5])}{'...' if len(competitors) > 5 else ''})")
 
     # Detect language from Excel filename or sheet names
-    xl = pd.ExcelFile(excel_path)
-    lang = 'es' if any('español' in s.lower() or 'resumen' in s.lower() for s in xl.sheet_names) else 'en'
+    lang = 'es' if any('español' in s.lower() or 'resumen' in s.lower() for s in workbook.sheet_names) else 'en'
     # Also check filename
     if '_ES' in excel_path or '_es' in excel_path:
         lang = 'es'
@@ -780,24 +922,35 @@ def classify(
         lang = 'en'
     print(f"Detected language: {lang}")
 
-    # Load categories
-    question_to_category = load_categories_from_excel(excel_path, category_sheets)
-    print(f"Loaded {len(question_to_category)} questions with categories")
+    # Load categories (and their fuzzy index) from the persisted index unless the workbook changed
+    category_index = load_category_index(
+        workbook.file_hash, category_sheets,
+        lambda: load_categories_from_excel(excel_path, category_sheets, workbook),
+        cache_dir
+    )
+    question_to_category = category_index.question_to_category
+    print(f"Loaded {len(question_to_category)} questions with categories"
+          f"{' (cached index)' if category_index.from_cache else ''}")
 
-    # Show category distribution
-    categories = {}
-    for cat_id, cat_name in question_to_category.values():
-        key = (cat_id, cat_name)
-        categories[key] = categories.get(key, 0) + 1
+    # Show category distribution (question counts are stored with the category index)
+    question_counts = category_index.question_counts()
     print("\nCategory distribution:")
-    for (cat_id, cat_name), count in sorted(categories.items()):
+    for (cat_id, cat_name), count in question_counts.items():
         print(f"  - [{cat_id}] {cat_name}: {count} questions")
 
+    # Industry detection (unconfigured brands) reads the file name, sheet names and sample questions
+    industry_text = '\n'.join([excel_path, *workbook.sheet_names,
+                               *islice(question_to_category, INDUSTRY_SAMPLE_QUESTIONS)])
+
     # Enrich JSON
     enriched = enrich_json_with_categories(
-        json_path, question_to_category, brand, competitors, lang, output_path, excel_path
+        json_path, question_to_category, brand, competitors, lang, output_path, excel_path,
+        stream=stream, output_format=output_format, workers=workers, incremental=incremental,
+        question_index=category_index.question_index, stats=RecordStats(brand, question_counts),
+        industry_text=industry_text
     )
-    print(f"\nTotal records enriched: {len(enriched)}")
+    if not stream:
+        print(f"\nTotal records enriched: {len(enriched)}")
 
     return enriched
 
@@ -806,11 +959,26 @@ if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description='Classify LLM answers by category')
-    parser.add_argument('--brand', '-b', required=True, choices=['betfair', 'byd'],
-                        help='Brand to process (betfair or byd)')
+    # Same brands as the batch driver: every brand of brands_config.yaml
+    brand_choices = sorted({name.lower() for name in list_configured_brands()}) if HAS_BRAND_CONFIG else None
+    parser.add_argument('--brand', '-b', required=True, type=str.lower, choices=brand_choices,
+                        help='Brand to process (configured in brands_config.yaml; '
+                             'only betfair and byd have default file paths)')
     parser.add_argument('--excel', '-e', help='Custom Excel file path (optional)')
     parser.add_argument('--json', '-j', help='Custom JSON file path (optional)')
     parser.add_argument('--output', '-o', help='Custom output file path (optional)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='Directory for parsed workbook snapshots and category indexes')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always parse the Excel and rebuild the category index')
+    parser.add_argument('--stream', action='store_true',
+                        help='Constant memory: write records as they are enriched')
+    parser.add_argument('--format', choices=['json', 'jsonl', 'parquet'], default=None,
+                        help='Output format (default: from the --output extension, else json)')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Worker processes for record enrichment (default: 1)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Reuse unchanged records from the previous output, recompute only changed ones')
 
     args = parser.parse_args()
 
@@ -822,14 +990,26 @@ if __name__ == "__main__":
         excel_file = args.excel or str(data_dir / "betfair_llm_evaluation_ES.xlsx")
         json_file = args.json or str(data_dir / "betfair_es_answers.json")
         output_file = args.output or str(data_dir / "betfair_es_answers_classified.json")
-    else:  # byd
+    elif args.brand == 'byd':
         excel_file = args.excel or str(data_dir / "byd_llm_evaluation_UK.xlsx")
         json_file = args.json or str(data_dir / "byd_uk_answers.json")
         output_file = args.output or str(data_dir / "byd_uk_answers_classified.json")
+    else:
+        missing = [f"--{name}" for name in ('excel', 'json', 'output') if not getattr(args, name)]
+        if missing:
+            parser.error(f"no default files for brand '{args.brand}', pass {', '.join(missing)}")
+        excel_file, json_file, output_file = args.excel, args.json, args.output
 
     # Run classification
     classify(
         excel_path=excel_file,
         json_path=json_file,
-        output_path=output_file
+        output_path=output_file,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        stream=args.stream,
+        output_format=args.format or next(
+            (fmt for fmt in ('jsonl', 'parquet') if output_file.endswith('.' + fmt)), 'json'
+        ),
+        workers=args.workers,
+        incremental=args.incremental
     )
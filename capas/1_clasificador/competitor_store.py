@@ -0,0 +1,257 @@
+"""
+Persistent Store for LLM-Discovered Competitors
+
+Competitors returned by the LLM for unconfigured brands are kept in SQLite,
+keyed by "brand|industry|country", so new classifier processes reuse them
+instead of paying the OpenRouter round-trip again (and get the same list).
+
+Policy:
+- fresh entry (younger than the TTL): used as is
+- stale entry: used as is, and refreshed from the LLM in the background
+- pinned entry: always used, never refreshed (set manually from the CLI)
+- no entry: fetched from the LLM (only the very first run blocks on it)
+
+Usage:
+    python competitor_store.py list
+    python competitor_store.py show --brand kia --industry automotive --country Spain
+    python competitor_store.py pin --brand kia --industry automotive --country Spain \\
+        --competitors Toyota Hyundai Renault
+    python competitor_store.py invalidate --brand kia --industry automotive --country Spain
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from response_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600  # 30 days
+
+
+def competitor_key(brand: str, industry: str, country: str) -> str:
+    """Store key for a brand in a market."""
+    return f"{brand}|{industry}|{country}".lower()
+
+
+class CompetitorEntry:
+    """Stored competitor list for one brand|industry|country."""
+
+    def __init__(self, key: str, competitors: Set[str], fetched_at: float, pinned: bool):
+        self.key = key
+        self.competitors = competitors
+        self.fetched_at = fetched_at
+        self.pinned = pinned
+
+    def age_days(self, now: Optional[float] = None) -> float:
+        return ((now or time.time()) - self.fetched_at) / 86400
+
+
+class CompetitorStore:
+    """
+    SQLite-backed competitor lists with TTL, pinning and stale-while-refresh.
+
+    Safe to share between threads (background refreshes write from their own thread).
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        name: str = "competitors"
+    ):
+        """
+        Args:
+            cache_dir: Directory holding the SQLite database
+            ttl_seconds: Entries older than this are refreshed in the background (None = never)
+            name: Database file name (without extension)
+        """
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self.path = Path(cache_dir) / f"{name}.sqlite3"
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._refreshing: Dict[str, threading.Thread] = {}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS competitors ("
+            " key TEXT PRIMARY KEY,"
+            " competitors TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " pinned INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CompetitorEntry]:
+        """Stored entry for `key` (fresh or stale), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT competitors, fetched_at, pinned FROM competitors WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CompetitorEntry(key, set(json.loads(row[0])), row[1], bool(row[2]))
+
+    def put(self, key: str, competitors: Set[str], pinned: bool = False) -> None:
+        """Store (or replace) the competitor list for `key`."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO competitors (key, competitors, fetched_at, pinned) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(sorted(competitors), ensure_ascii=False), time.time(), int(pinned))
+            )
+            self._conn.commit()
+
+    def refresh(self, key: str, competitors: Set[str]) -> bool:
+        """Replace an LLM-fetched entry, unless it was pinned meanwhile. Returns True if written."""
+        with self._lock:
+            row = self._conn.execute("SELECT pinned FROM competitors WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[0]:
+                return False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO competitors (key, competitors, fetched_at, pinned) VALUES (?, ?, ?, 0)",
+                (key, json.dumps(sorted(competitors), ensure_ascii=False), time.time())
+            )
+            self._conn.commit()
+        return True
+
+    def set_pinned(self, key: str, pinned: bool) -> bool:
+        """Pin or unpin an existing entry. Returns False if there is no entry."""
+        with self._lock:
+            cursor = self._conn.execute("UPDATE competitors SET pinned = ? WHERE key = ?", (int(pinned), key))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def invalidate(self, key: str) -> bool:
+        """Delete an entry (the next run fetches it again). Returns False if there was none."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM competitors WHERE key = ?", (key,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def entries(self) -> List[CompetitorEntry]:
+        """All stored entries, by key."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, competitors, fetched_at, pinned FROM competitors ORDER BY key"
+            ).fetchall()
+        return [CompetitorEntry(k, set(json.loads(c)), f, bool(p)) for k, c, f, p in rows]
+
+    def is_stale(self, entry: CompetitorEntry, now: Optional[float] = None) -> bool:
+        """True if the entry should be refreshed (pinned entries never are)."""
+        if entry.pinned or self.ttl_seconds is None:
+            return False
+        return (now or time.time()) - entry.fetched_at > self.ttl_seconds
+
+    def refresh_in_background(self, key: str, fetch) -> bool:
+        """
+        Refresh `key` on a background thread with `fetch()` (returns a set, or None on failure).
+
+        At most one refresh per key runs at a time. The thread is not a daemon, so a
+        refresh started near the end of a run still completes before the process exits.
+
+        Returns:
+            True if a refresh was started
+        """
+        with self._lock:
+            running = self._refreshing.get(key)
+            if running is not None and running.is_alive():
+                return False
+
+            def run():
+                try:
+                    competitors = fetch()
+                    if competitors:
+                        self.refresh(key, competitors)
+                finally:
+                    with self._lock:
+                        self._refreshing.pop(key, None)
+
+            thread = threading.Thread(target=run, name=f"refresh-competitors-{key}")
+            self._refreshing[key] = thread
+            thread.start()
+        return True
+
+    def wait_for_refreshes(self, timeout: Optional[float] = None) -> None:
+        """Block until background refreshes finish (called before closing the store)."""
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.wait_for_refreshes()
+        with self._lock:
+            self._conn.close()
+
+
+# Shared store for the classifier (opened on first use)
+_store: Optional[CompetitorStore] = None
+
+
+def get_competitor_store() -> CompetitorStore:
+    """Shared competitor store in the default cache directory."""
+    global _store
+    if _store is None:
+        _store = CompetitorStore()
+    return _store
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Manage stored LLM competitor lists')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Directory of the competitor store')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='List stored entries')
+    for command, help_text in [
+        ('show', 'Show the competitors of one entry'),
+        ('pin', 'Pin an entry (optionally replacing its competitors) so it is never refreshed'),
+        ('unpin', 'Unpin an entry (it is refreshed again once stale)'),
+        ('invalidate', 'Delete an entry so the next run asks the LLM again'),
+    ]:
+        sub = subparsers.add_parser(command, help=help_text)
+        sub.add_argument('--brand', '-b', required=True)
+        sub.add_argument('--industry', '-i', required=True)
+        sub.add_argument('--country', '-c', required=True)
+        if command == 'pin':
+            sub.add_argument('--competitors', nargs='+', help='Manual competitor list')
+
+    args = parser.parse_args()
+    store = CompetitorStore(args.cache_dir)
+
+    if args.command == 'list':
+        entries = store.entries()
+        if not entries:
+            print("No stored competitor lists")
+        for entry in entries:
+            state = 'pinned' if entry.pinned else ('stale' if store.is_stale(entry) else 'fresh')
+            print(f"  {entry.key}: {len(entry.competitors)} competitors, "
+                  f"{entry.age_days():.1f} days old ({state})")
+    else:
+        key = competitor_key(args.brand, args.industry, args.country)
+        if args.command == 'show':
+            entry = store.get(key)
+            if entry is None:
+                print(f"No entry for '{key}'")
+            else:
+                print(f"{key} ({'pinned' if entry.pinned else f'{entry.age_days():.1f} days old'}):")
+                for name in sorted(entry.competitors):
+                    print(f"  - {name}")
+        elif args.command == 'pin':
+            if args.competitors:
+                store.put(key, set(args.competitors), pinned=True)
+                print(f"Pinned {len(args.competitors)} competitors for '{key}'")
+            elif store.set_pinned(key, True):
+                print(f"Pinned '{key}'")
+            else:
+                print(f"No entry for '{key}' (pass --competitors to create one)")
+        elif args.command == 'unpin':
+            print(f"Unpinned '{key}'" if store.set_pinned(key, False) else f"No entry for '{key}'")
+        elif args.command == 'invalidate':
+            print(f"Invalidated '{key}'" if store.invalidate(key) else f"No entry for '{key}'")
+
+    store.close()
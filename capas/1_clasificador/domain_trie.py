@@ -0,0 +1,71 @@
+"""
+Domain Suffix Trie
+
+Set of domains stored as a trie over their labels in reverse order
+("m.facebook.com" -> com / facebook / m). Checking whether a domain is one of
+the set, or a subdomain of one of them, walks the labels of the domain from
+the TLD inwards, so the cost depends on the number of labels of the domain
+and not on the size of the block list.
+
+Built once per configuration version (see brand_config.ConfigView) and shared
+by is_valid_citation_domain and the CitationExtractor.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+# Key marking "a listed domain ends at this node" (labels never contain a dot)
+_END = '.'
+
+
+class DomainTrie:
+    """Immutable reversed-label trie of domains (case-insensitive)."""
+
+    def __init__(self, domains: Iterable[str] = ()):
+        """
+        Args:
+            domains: Domains to store ("facebook.com")
+        """
+        self._root: Dict[str, Dict] = {}
+        self._size = 0
+        for domain in domains:
+            labels = _labels(domain)
+            if not labels[-1]:
+                continue
+            node = self._root
+            for label in reversed(labels):
+                node = node.setdefault(label, {})
+            if _END not in node:
+                node[_END] = {}
+                self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def match(self, domain: str) -> Optional[str]:
+        """
+        Listed domain that `domain` is, or is a subdomain of.
+
+        Args:
+            domain: Domain or host ("www.youtube.com", "YouTube.com.")
+
+        Returns:
+            Shortest matching listed domain, or None
+        """
+        labels = _labels(domain)
+        node = self._root
+        for depth, label in enumerate(reversed(labels), 1):
+            node = node.get(label)
+            if node is None:
+                return None
+            if _END in node:
+                return '.'.join(labels[-depth:])
+        return None
+
+    def __contains__(self, domain: str) -> bool:
+        """True if `domain` is a listed domain or one of its subdomains."""
+        return self.match(domain) is not None
+
+
+def _labels(domain: str) -> List[str]:
+    # Lowercase, no trailing root dot, no port
+    return domain.lower().strip().rstrip('.').split(':', 1)[0].split('.')
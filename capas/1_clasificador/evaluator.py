@@ -5,29 +5,134 @@ Classifies answers as CRITICAL, WARNING, or OPPORTUNITY based on brand sentiment
 Uses OpenRouter API for LLM-based analysis.
 """
 
+import asyncio
 import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
-import requests
+from typing import Callable, Dict, List, Optional, Tuple
+
+from json_stream import load_records
+from openrouter_client import (
+    DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_TIMEOUT_BUDGET, DEFAULT_TOKENS_PER_MINUTE,
+    OpenRouterError, configure_client, get_client
+)
+from response_cache import DEFAULT_CACHE_DIR, DEFAULT_TTL_SECONDS, ResponseCache
+from run_journal import RunJournal, default_journal_path, record_key
 
 # OpenRouter configuration
 OPENROUTER_API_KEY = os.environ.get('OPENROUTER_API_KEY', '')
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_HEADERS = {
+    "HTTP-Referer": "https://github.com/marcomeiz/llm-evaluation-pipeline",
+    "X-Title": "LLM Evaluation Pipeline"
+}
 
 # Model recommendation for classification
 # openai/gpt-4o-mini - Good balance of accuracy and cost, more consistent than Gemini
 DEFAULT_MODEL = "openai/gpt-4o-mini"
 
 
+# Shared by the single and batched prompts
+PSYCHOLOGICAL_IMPACT_SPEC = "Detailed analysis (3-5 sentences) - SAME LANGUAGE AS ANSWER. Cover: 1) How user perceives the response, 2) Cognitive biases activated (recency effect, framing, anchoring, social proof, loss aversion), 3) If pros/cons structure leaves user positive or negative, 4) Impact of competitor comparisons, 5) Effect on purchase decision cycle"
+
+VALID_CLASSIFICATIONS = ['CRITICAL', 'WARNING', 'OPPORTUNITY']
+
+
+def _mention_context(brand: str, mention: bool) -> str:
+    """Extra instructions for answers where the brand is not mentioned."""
+    if mention:
+        return ""
+    return f"""
+⚠️ CRITICAL CONTEXT: The brand "{brand}" is NOT mentioned in this answer.
+
+MANDATORY RULE for "no mention" cases:
+1. If question contains "avoid", "problem", "issue", "bad", "worst", "stay away" → {brand} NOT being on this negative list = OPPORTUNITY
+2. If question directly asks about {brand} specifically → NOT being mentioned = CRITICAL
+3. If question is general comparison → NOT being mentioned = WARNING or CRITICAL
+
+EXAMPLE: Question "Which EVs should I avoid?" + {brand} not in answer = OPPORTUNITY (good for {brand})
+"""
+
+
+def _classification_rules(brand: str) -> str:
+    """Classification rules block shared by the single and batched prompts."""
+    return f"""CLASSIFICATION RULES:
+- OPPORTUNITY: The answer is favorable/positive for {brand}. Recommends it, highlights benefits, presents it well, OR if the question is negative (avoid/problems) and {brand} is NOT mentioned (implicitly positive).
+- WARNING: The answer is neutral or mixed. Contains both positives and negatives, or is purely informational without clear stance.
+- CRITICAL: The answer is unfavorable/negative for {brand}. Criticizes it, highlights problems, recommends alternatives instead, OR if the question directly asks about {brand} and it's not mentioned.
+
+IMPORTANT - SENTIMENT vs POSITION:
+- Focus on the ACTUAL LANGUAGE used to describe {brand}, not just its position in a list.
+- Being listed last or in a lower tier with POSITIVE language (e.g., "great for X", "capable", "good value") is NOT negative sentiment.
+- CRITICAL requires actual negative statements: criticism, warnings, problems mentioned, or explicit discouragement.
+- Position alone does not determine sentiment. A brand can be listed last but still described positively.
+
+IMPORTANT:
+- Evaluate the OVERALL sentiment considering BOTH question context AND answer content.
+- Consider what NOT being mentioned implies based on the question type."""
+
+
+def _strip_code_fences(content: str) -> str:
+    """Remove markdown code blocks wrapping a JSON response, if present."""
+    if '```json' in content:
+        return content.split('```json')[1].split('```')[0].strip()
+    if '```' in content:
+        return content.split('```')[1].split('```')[0].strip()
+    return content
+
+
+def _normalize_result(parsed: Dict) -> Dict:
+    """Validate one parsed classification object into the result dict."""
+    classification = str(parsed.get('classification', 'WARNING')).upper()
+    reason = parsed.get('reason', '')
+    triggers = parsed.get('triggers_detected', [])
+    psychological_impact = parsed.get('psychological_impact', '')
+
+    # Validate classification
+    if classification not in VALID_CLASSIFICATIONS:
+        for valid in VALID_CLASSIFICATIONS:
+            if valid in classification:
+                classification = valid
+                break
+        else:
+            classification = 'WARNING'
+
+    # Clear triggers for OPPORTUNITY
+    if classification == 'OPPORTUNITY':
+        triggers = []
+
+    return {'classification': classification, 'reason': reason, 'triggers_detected': triggers, 'psychological_impact': psychological_impact}
+
+
+def _parse_classification(content: str) -> Tuple[Dict, bool]:
+    """
+    Parse a single-answer response (JSON, possibly wrapped in markdown code blocks).
+
+    Returns:
+        Tuple of (result, parsed) where parsed is False when the response was not
+        valid JSON and the result is the keyword-scan fallback
+    """
+    try:
+        return _normalize_result(json.loads(_strip_code_fences(content))), True
+    except (json.JSONDecodeError, IndexError):
+        # Fallback: extract classification from text
+        classification = 'WARNING'
+        for valid in VALID_CLASSIFICATIONS:
+            if valid in content.upper():
+                classification = valid
+                break
+        return {'classification': classification, 'reason': '', 'triggers_detected': [], 'psychological_impact': ''}, False
+
+
 def classify_sentiment(
     answer: str,
     brand: str,
     question: str = "",
     mention: bool = True,
     model: str = DEFAULT_MODEL,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    cache: Optional[ResponseCache] = None
 ) -> Dict:
     """
     Classify the sentiment of an answer towards a brand using LLM.
@@ -39,9 +144,14 @@ def classify_sentiment(
         mention: Whether the brand is mentioned in the answer
         model: OpenRouter model to use
         api_key: OpenRouter API key (uses env var if not provided)
+        cache: Optional response cache (keyed by the exact request payload)
 
     Returns:
         Dict with 'classification', 'reason', and 'triggers_detected' keys
+        ('cached': True is added when the result came from the cache)
+
+    Raises:
+        OpenRouterError: If the API call fails after all retries
     """
     key = api_key or OPENROUTER_API_KEY
     if not key:
@@ -51,18 +161,7 @@ def classify_sentiment(
     answer_sample = answer[:200] if len(answer) > 200 else answer
 
     # Build context about brand mention
-    mention_context = ""
-    if not mention:
-        mention_context = f"""
-⚠️ CRITICAL CONTEXT: The brand "{brand}" is NOT mentioned in this answer.
-
-MANDATORY RULE for "no mention" cases:
-1. If question contains "avoid", "problem", "issue", "bad", "worst", "stay away" → {brand} NOT being on this negative list = OPPORTUNITY
-2. If question directly asks about {brand} specifically → NOT being mentioned = CRITICAL
-3. If question is general comparison → NOT being mentioned = WARNING or CRITICAL
-
-EXAMPLE: Question "Which EVs should I avoid?" + {brand} not in answer = OPPORTUNITY (good for {brand})
-"""
+    mention_context = _mention_context(brand, mention)
 
     prompt = f"""STEP 1 - LANGUAGE DETECTION (CRITICAL):
 First, identify the language of this text sample: "{answer_sample}"
@@ -76,20 +175,7 @@ QUESTION:
 ANSWER:
 {answer}
 {mention_context}
-CLASSIFICATION RULES:
-- OPPORTUNITY: The answer is favorable/positive for {brand}. Recommends it, highlights benefits, presents it well, OR if the question is negative (avoid/problems) and {brand} is NOT mentioned (implicitly positive).
-- WARNING: The answer is neutral or mixed. Contains both positives and negatives, or is purely informational without clear stance.
-- CRITICAL: The answer is unfavorable/negative for {brand}. Criticizes it, highlights problems, recommends alternatives instead, OR if the question directly asks about {brand} and it's not mentioned.
-
-IMPORTANT - SENTIMENT vs POSITION:
-- Focus on the ACTUAL LANGUAGE used to describe {brand}, not just its position in a list.
-- Being listed last or in a lower tier with POSITIVE language (e.g., "great for X", "capable", "good value") is NOT negative sentiment.
-- CRITICAL requires actual negative statements: criticism, warnings, problems mentioned, or explicit discouragement.
-- Position alone does not determine sentiment. A brand can be listed last but still described positively.
-
-IMPORTANT:
-- Evaluate the OVERALL sentiment considering BOTH question context AND answer content.
-- Consider what NOT being mentioned implies based on the question type.
+{_classification_rules(brand)}
 
 Respond in JSON format. ALL TEXT FIELDS MUST BE IN THE SAME LANGUAGE AS THE ANSWER ABOVE:
 {{
@@ -104,7 +190,7 @@ Respond in JSON format. ALL TEXT FIELDS MUST BE IN THE SAME LANGUAGE AS THE ANSW
       "reason": "why it's problematic - SAME LANGUAGE AS ANSWER"
     }}
   ],
-  "psychological_impact": "Detailed analysis (3-5 sentences) - SAME LANGUAGE AS ANSWER. Cover: 1) How user perceives the response, 2) Cognitive biases activated (recency effect, framing, anchoring, social proof, loss aversion), 3) If pros/cons structure leaves user positive or negative, 4) Impact of competitor comparisons, 5) Effect on purchase decision cycle"
+  "psychological_impact": "{PSYCHOLOGICAL_IMPACT_SPEC}"
 }}
 
 CRITICAL RULES:
@@ -114,13 +200,6 @@ CRITICAL RULES:
 - IF THE ANSWER IS IN FRENCH → ALL fields MUST BE IN FRENCH
 - NEVER mix languages. Match the answer's language exactly."""
 
-    headers = {
-        "Authorization": f"Bearer {key}",
-        "Content-Type": "application/json",
-        "HTTP-Referer": "https://github.com/marcomeiz/llm-evaluation-pipeline",
-        "X-Title": "LLM Evaluation Pipeline"
-    }
-
     payload = {
         "model": model,
         "messages": [{"role": "user", "content": prompt}],
@@ -128,55 +207,302 @@ CRITICAL RULES:
         "temperature": 0
     }
 
-    try:
-        response = requests.post(OPENROUTER_URL, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        result = response.json()
-        content = result['choices'][0]['message']['content'].strip()
+    # Identical payloads get identical answers at temperature 0
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(payload)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return {**cached, 'cached': True}
+
+    # Rate limiting, retries and backoff are handled by the shared client;
+    # failures raise OpenRouterError instead of producing a placeholder result
+    content = get_client().chat(payload, api_key=key, extra_headers=OPENROUTER_HEADERS)
+
+    result, parsed = _parse_classification(content)
+    # A degraded fallback result is not cached, so the next run asks the model again
+    if cache is not None and parsed:
+        cache.put(cache_key, result)
+    return result
+
 
-        # Try to parse JSON response (may be wrapped in markdown code blocks)
+# Batched mode: several short answers for the same brand share one copy of the rules
+DEFAULT_BATCH_TOKENS = 6000       # Prompt token budget per batched request
+BATCH_ITEM_MAX_TOKENS = 1200      # Longer answers are always sent on their own
+BATCH_OUTPUT_TOKENS_PER_ITEM = 450
+
+
+def _batch_item_block(number: int, brand: str, record: dict) -> str:
+    """Prompt section for one answer inside a batched request."""
+    return f"""### ITEM {number}
+QUESTION:
+{record.get('question_text', '')}
+
+ANSWER:
+{record.get('answer', '')}
+{_mention_context(brand, record.get('mention', False))}"""
+
+
+def _batch_prompt(brand: str, count: int, items: str) -> str:
+    """Batched prompt: shared instructions followed by the item blocks."""
+    return f"""Analyze the following {count} Q&A items about the brand "{brand}" and classify EACH ONE independently.
+
+LANGUAGE (CRITICAL): For each item, identify the language of its ANSWER and write ALL text fields of that item in THAT SAME LANGUAGE. Never mix languages within an item.
+
+{_classification_rules(brand)}
+
+Respond with ONLY a JSON array containing exactly {count} objects, one per item, in item order:
+[
+  {{
+    "item": <item number>,
+    "detected_language": "English/Spanish/French/etc",
+    "classification": "CRITICAL/WARNING/OPPORTUNITY",
+    "reason": "brief reason (max 15 words) - SAME LANGUAGE AS THAT ANSWER",
+    "triggers_detected": [
+      {{
+        "trigger": "problematic phrase or topic",
+        "type": "WARNING or CRITICAL",
+        "context": "exact quote from that answer (max 100 chars)",
+        "reason": "why it's problematic - SAME LANGUAGE AS THAT ANSWER"
+      }}
+    ],
+    "psychological_impact": "{PSYCHOLOGICAL_IMPACT_SPEC}"
+  }}
+]
+
+CRITICAL RULES:
+- triggers_detected: Only for WARNING/CRITICAL. For OPPORTUNITY, use empty array []
+- One object per item, every item number exactly once
+
+ITEMS:
+
+{items}"""
+
+
+def estimate_record_tokens(record: dict) -> int:
+    """Rough prompt token cost of one record (~4 chars per token)."""
+    return (len(record.get('answer', '')) + len(record.get('question_text', ''))) // 4
+
+
+def pack_batches(
+    records: List[dict],
+    batch_size: int,
+    token_budget: int = DEFAULT_BATCH_TOKENS
+) -> List[List[int]]:
+    """
+    Greedily pack records (in order) into batches by count and prompt token budget.
+
+    Records longer than BATCH_ITEM_MAX_TOKENS always get a batch of their own,
+    which is sent with the regular single-answer prompt.
+
+    Args:
+        records: Records to pack
+        batch_size: Maximum records per batch
+        token_budget: Maximum estimated prompt tokens per batch
+
+    Returns:
+        List of batches, each a list of indices into `records`
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+
+    for i, record in enumerate(records):
+        tokens = estimate_record_tokens(record)
+        if tokens > BATCH_ITEM_MAX_TOKENS:
+            batches.append([i])
+            continue
+        if current and (len(current) >= batch_size or current_tokens + tokens > token_budget):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def classify_sentiment_batch(
+    records: List[dict],
+    brand: str,
+    model: str = DEFAULT_MODEL,
+    api_key: Optional[str] = None,
+    cache: Optional[ResponseCache] = None
+) -> List[Dict]:
+    """
+    Classify several answers for the same brand with a single LLM request.
+
+    Items whose result is missing or malformed in the batch response (or the
+    whole batch, if the response is not a parseable JSON array) are retried
+    with single-answer calls to classify_sentiment. A retry that fails only
+    loses its own item: the other results are still returned.
+
+    Args:
+        records: Records with 'answer', 'question_text' and 'mention'
+        brand: The brand name to evaluate sentiment for
+        model: OpenRouter model to use
+        api_key: OpenRouter API key (uses env var if not provided)
+        cache: Optional response cache (each item is cached on its own)
+
+    Returns:
+        List of classify_sentiment-style results, in the same order as `records`
+        (None for items whose single-answer retry failed)
+
+    Raises:
+        OpenRouterError: If an API call fails after all retries and no item got a result
+    """
+    def single(record: dict) -> Dict:
+        return classify_sentiment(
+            record.get('answer', ''), brand, record.get('question_text', ''),
+            record.get('mention', False), model, api_key, cache
+        )
+
+    if len(records) == 1:
+        return [single(records[0])]
+
+    key = api_key or OPENROUTER_API_KEY
+    if not key:
+        raise ValueError("OpenRouter API key not provided. Set OPENROUTER_API_KEY env var.")
+
+    results: List[Optional[Dict]] = [None] * len(records)
+
+    # Items are cached individually, so a re-packed battery still hits the cache
+    item_keys: List[Optional[str]] = [None] * len(records)
+    if cache is not None:
+        instructions = _batch_prompt(brand, 0, "")
+        for i, record in enumerate(records):
+            item_keys[i] = cache.make_key({
+                "model": model,
+                "instructions": instructions,
+                "item": _batch_item_block(0, brand, record)
+            })
+            cached = cache.get(item_keys[i])
+            if cached is not None:
+                results[i] = {**cached, 'cached': True}
+
+    def retry(i: int) -> None:
+        # A failed item stays None; the items already classified are kept
+        nonlocal error
         try:
-            # Strip markdown code blocks if present
-            json_content = content
-            if '```json' in content:
-                json_content = content.split('```json')[1].split('```')[0].strip()
-            elif '```' in content:
-                json_content = content.split('```')[1].split('```')[0].strip()
-
-            parsed = json.loads(json_content)
-            classification = parsed.get('classification', 'WARNING').upper()
-            reason = parsed.get('reason', '')
-            triggers = parsed.get('triggers_detected', [])
-            psychological_impact = parsed.get('psychological_impact', '')
+            results[i] = single(records[i])
+        except OpenRouterError as e:
+            error = e
+            print(f"  API error (record {records[i].get('id', i)}): {e}")
+
+    error: Optional[OpenRouterError] = None
+    todo = [i for i in range(len(records)) if results[i] is None]
+    if len(todo) == 1:
+        retry(todo[0])
+    elif todo:
+        items = "\n".join(_batch_item_block(n, brand, records[i]) for n, i in enumerate(todo, start=1))
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": _batch_prompt(brand, len(todo), items)}],
+            "max_tokens": BATCH_OUTPUT_TOKENS_PER_ITEM * len(todo),
+            "temperature": 0
+        }
+        content = get_client().chat(payload, api_key=key, extra_headers=OPENROUTER_HEADERS)
+
+        try:
+            parsed = json.loads(_strip_code_fences(content))
         except (json.JSONDecodeError, IndexError):
-            # Fallback: extract classification from text
-            classification = 'WARNING'
-            reason = ''
-            triggers = []
-            psychological_impact = ''
-            for valid in ['CRITICAL', 'WARNING', 'OPPORTUNITY']:
-                if valid in content.upper():
-                    classification = valid
-                    break
-
-        # Validate classification
-        if classification not in ['CRITICAL', 'WARNING', 'OPPORTUNITY']:
-            for valid in ['CRITICAL', 'WARNING', 'OPPORTUNITY']:
-                if valid in classification:
-                    classification = valid
-                    break
-            else:
-                classification = 'WARNING'
-
-        # Clear triggers for OPPORTUNITY
-        if classification == 'OPPORTUNITY':
-            triggers = []
-
-        return {'classification': classification, 'reason': reason, 'triggers_detected': triggers, 'psychological_impact': psychological_impact}
-
-    except requests.exceptions.RequestException as e:
-        print(f"  API error: {e}")
-        return {'classification': 'WARNING', 'reason': 'Error en API', 'triggers_detected': [], 'psychological_impact': ''}
+            parsed = None
+        if isinstance(parsed, dict):
+            # Some models wrap the array in an object
+            parsed = next((v for v in parsed.values() if isinstance(v, list)), None)
+
+        if isinstance(parsed, list):
+            for position, obj in enumerate(parsed, start=1):
+                if not isinstance(obj, dict) or 'classification' not in obj:
+                    continue
+                number = obj.get('item', position)
+                if not isinstance(number, int) or not 1 <= number <= len(todo):
+                    continue
+                i = todo[number - 1]
+                if results[i] is None:
+                    results[i] = _normalize_result(obj)
+                    if cache is not None:
+                        cache.put(item_keys[i], results[i])
+
+        # Fallback to single-answer calls for anything the batch did not cover
+        for i in todo:
+            if results[i] is None:
+                retry(i)
+
+    if error is not None and all(result is None for result in results):
+        raise error
+    return results
+
+
+async def classify_records_async(
+    records: List[dict],
+    brand: str,
+    model: str = DEFAULT_MODEL,
+    api_key: Optional[str] = None,
+    concurrency: int = 8,
+    delay: float = 0.0,
+    cache: Optional[ResponseCache] = None,
+    on_result: Optional[Callable[[int, dict, Dict], None]] = None,
+    batch_size: int = 1,
+    batch_tokens: int = DEFAULT_BATCH_TOKENS
+) -> List[Optional[Dict]]:
+    """
+    Classify many records concurrently with a bounded number of in-flight requests.
+
+    Each request (a single answer, or a batch of answers when batch_size > 1)
+    runs in a worker thread; at most `concurrency` requests are in flight at any time.
+
+    Args:
+        records: Classified records (with 'answer', 'question_text', 'mention')
+        brand: Brand name to evaluate sentiment for
+        model: OpenRouter model to use
+        api_key: OpenRouter API key
+        concurrency: Maximum number of simultaneous API calls
+        delay: Delay after each call, per worker slot (rate limiting)
+        cache: Optional response cache shared by all workers
+        on_result: Optional callback(index, record, result) called as each result arrives
+        batch_size: Maximum answers per request (1 = one request per answer)
+        batch_tokens: Prompt token budget per batched request
+
+    Returns:
+        List of classify_sentiment results, in the same order as `records`
+        (None for records whose API call failed)
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    results: List[Optional[Dict]] = [None] * len(records)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        async def run(batch: List[int]) -> None:
+            async with semaphore:
+                try:
+                    batch_results = await loop.run_in_executor(
+                        executor,
+                        classify_sentiment_batch,
+                        [records[i] for i in batch],
+                        brand,
+                        model,
+                        api_key,
+                        cache
+                    )
+                except OpenRouterError as e:
+                    ids = ', '.join(str(records[i].get('id', i)) for i in batch)
+                    print(f"  API error (records {ids}): {e}")
+                    return
+                if delay and not all(r is None or r.get('cached') for r in batch_results):
+                    await asyncio.sleep(delay)  # Rate limiting
+            for i, result in zip(batch, batch_results):
+                if result is None:
+                    continue  # Failed item (already reported): not journaled, retried on resume
+                results[i] = result
+                if on_result:
+                    on_result(i, records[i], result)
+
+        await asyncio.gather(*(run(batch) for batch in pack_batches(records, batch_size, batch_tokens)))
+
+    return results
 
 
 def evaluate(
@@ -185,72 +511,142 @@ def evaluate(
     brand: str,
     model: str = DEFAULT_MODEL,
     api_key: Optional[str] = None,
-    delay: float = 0.1
+    delay: float = 0.0,
+    concurrency: int = 1,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+    cache_ttl: Optional[float] = DEFAULT_TTL_SECONDS,
+    resume: bool = False,
+    journal_path: Optional[str] = None,
+    batch_size: int = 1,
+    batch_tokens: int = DEFAULT_BATCH_TOKENS
 ) -> List[dict]:
     """
     Evaluate all answers in a classified JSON file.
 
     Args:
-        input_path: Path to input JSON (output from classifier)
+        input_path: Path to input JSON or JSONL (output from classifier)
         output_path: Path for output JSON with classifications
         brand: Brand name to evaluate sentiment for
         model: OpenRouter model to use
         api_key: OpenRouter API key
-        delay: Delay between API calls (rate limiting)
+        delay: Extra delay between API calls (the shared client already rate-limits)
+        concurrency: Number of simultaneous API calls (1 = sequential)
+        cache_dir: Directory for the persistent response cache (None disables caching)
+        cache_ttl: Cache entry lifetime in seconds (None = never expire)
+        resume: Reuse records already in the journal of a previous, interrupted run
+        journal_path: JSONL journal written after each record (default: <output>.journal.jsonl)
+        batch_size: Pack up to this many short answers into one request (1 = no batching)
+        batch_tokens: Prompt token budget per batched request
 
     Returns:
-        List of evaluated records
+        List of evaluated records (same order as the input). Records whose API
+        call failed are left out and stay pending in the journal for --resume.
     """
-    with open(input_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_records(input_path)
 
-    evaluated_data = []
+    evaluated_data: List[Optional[dict]] = [None] * len(data)
     stats = {'CRITICAL': 0, 'WARNING': 0, 'OPPORTUNITY': 0}
     no_mention_count = 0
     no_mention_critical = 0
+    processed = 0
+    cache = ResponseCache(cache_dir, ttl_seconds=cache_ttl) if cache_dir else None
+    journal = RunJournal(journal_path or default_journal_path(output_path), resume=resume)
 
     print(f"Evaluating {len(data)} answers...")
     print(f"Brand: {brand}")
     print(f"Model: {model}")
+    if concurrency > 1:
+        print(f"Concurrency: {concurrency}")
+    if batch_size > 1:
+        print(f"Batching: up to {batch_size} answers / {batch_tokens} prompt tokens per request")
+    if resume:
+        print(f"Resuming: {len(journal)} records already in journal {journal.path}")
     print()
 
-    for i, record in enumerate(data):
-        answer = record.get('answer', '')
-        question = record.get('question_text', '')
-        mention = record.get('mention', False)
-
-        # Always use LLM to classify - it considers question context
-        # to determine if "no mention" is good or bad
-        result = classify_sentiment(answer, brand, question, mention, model, api_key)
-        classification = result['classification']
-        reason = result['reason']
-        triggers = result['triggers_detected']
-        psychological_impact = result['psychological_impact']
-
-        if not mention:
+    def tally(index: int, evaluated_record: dict) -> None:
+        """Update counters, print progress and store the evaluated record."""
+        nonlocal no_mention_count, no_mention_critical, processed
+        classification = evaluated_record['classification']
+
+        if not evaluated_record.get('mention', False):
             no_mention_count += 1
             if classification == 'CRITICAL':
                 no_mention_critical += 1
 
-        time.sleep(delay)  # Rate limiting
-
         stats[classification] += 1
+        processed += 1
 
         # Progress indicator
-        if (i + 1) % 10 == 0 or i == len(data) - 1:
-            print(f"  Processed: {i + 1}/{len(data)} | "
+        if processed % 10 == 0 or processed == len(data):
+            print(f"  Processed: {processed}/{len(data)} | "
                   f"CRITICAL: {stats['CRITICAL']} | "
                   f"WARNING: {stats['WARNING']} | "
                   f"OPPORTUNITY: {stats['OPPORTUNITY']}")
 
+        evaluated_data[index] = evaluated_record
+
+    def record_result(index: int, record: dict, result: Dict) -> None:
+        """Build the evaluated record, journal it, then count it."""
         evaluated_record = {
             **record,
-            'classification': classification,
-            'classification_reason': reason,
-            'triggers_detected': triggers,
-            'psychological_impact': psychological_impact
+            'classification': result['classification'],
+            'classification_reason': result['reason'],
+            'triggers_detected': result['triggers_detected'],
+            'psychological_impact': result['psychological_impact']
         }
-        evaluated_data.append(evaluated_record)
+        journal.append(record_key(record, index), evaluated_record)
+        tally(index, evaluated_record)
+
+    # Records completed by a previous run are merged back without new API calls
+    pending = []
+    for i, record in enumerate(data):
+        journaled = journal.get(record_key(record, i))
+        if journaled is not None:
+            tally(i, journaled)
+        else:
+            pending.append((i, record))
+
+    try:
+        if concurrency > 1:
+            results = asyncio.run(classify_records_async(
+                [record for _, record in pending], brand, model, api_key, concurrency, delay, cache,
+                on_result=lambda j, record, result: record_result(pending[j][0], record, result),
+                batch_size=batch_size, batch_tokens=batch_tokens
+            ))
+            failed = sum(1 for result in results if result is None)
+        else:
+            failed = 0
+            pending_records = [record for _, record in pending]
+            for batch in pack_batches(pending_records, batch_size, batch_tokens):
+                # Always use LLM to classify - it considers question context
+                # to determine if "no mention" is good or bad
+                try:
+                    batch_results = classify_sentiment_batch(
+                        [pending_records[j] for j in batch], brand, model, api_key, cache
+                    )
+                except OpenRouterError as e:
+                    ids = ', '.join(str(pending_records[j].get('id', pending[j][0])) for j in batch)
+                    print(f"  API error (records {ids}): {e}")
+                    failed += len(batch)
+                    continue
+                if delay and not all(r is None or r.get('cached') for r in batch_results):
+                    time.sleep(delay)  # Rate limiting
+                for j, result in zip(batch, batch_results):
+                    if result is None:
+                        failed += 1  # Already reported; not journaled, retried on resume
+                        continue
+                    record_result(pending[j][0], pending_records[j], result)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted: {len(journal)}/{len(data)} records saved in {journal.path}")
+        print("Re-run with --resume to continue where it stopped.")
+        raise
+    finally:
+        journal.close()
+        if cache is not None:
+            cache.close()
+
+    # Failed records are never given a placeholder classification
+    evaluated_data = [record for record in evaluated_data if record is not None]
 
     # Final stats
     total = len(evaluated_data)
@@ -258,16 +654,25 @@ def evaluate(
     print(f"EVALUATION COMPLETE")
     print(f"{'='*50}")
     print(f"Total: {total}")
-    print(f"  CRITICAL:    {stats['CRITICAL']:3d} ({stats['CRITICAL']/total*100:5.1f}%) {'🔴' * (stats['CRITICAL'] // 10)}")
-    print(f"  WARNING:     {stats['WARNING']:3d} ({stats['WARNING']/total*100:5.1f}%) {'🟡' * (stats['WARNING'] // 10)}")
-    print(f"  OPPORTUNITY: {stats['OPPORTUNITY']:3d} ({stats['OPPORTUNITY']/total*100:5.1f}%) {'🟢' * (stats['OPPORTUNITY'] // 10)}")
+    print(f"  CRITICAL:    {stats['CRITICAL']:3d} ({stats['CRITICAL']/max(total, 1)*100:5.1f}%) {'🔴' * (stats['CRITICAL'] // 10)}")
+    print(f"  WARNING:     {stats['WARNING']:3d} ({stats['WARNING']/max(total, 1)*100:5.1f}%) {'🟡' * (stats['WARNING'] // 10)}")
+    print(f"  OPPORTUNITY: {stats['OPPORTUNITY']:3d} ({stats['OPPORTUNITY']/max(total, 1)*100:5.1f}%) {'🟢' * (stats['OPPORTUNITY'] // 10)}")
     print(f"\n  No mention total: {no_mention_count}")
     print(f"    → CRITICAL: {no_mention_critical}")
     print(f"    → Other (context-aware): {no_mention_count - no_mention_critical}")
+    if cache is not None:
+        print(f"\n  Cache: {cache.summary()}")
+    print(f"  API: {get_client().summary()}")
+    print(f"  {get_client().timing_summary()}")
 
-    # Save output
+    # Save output (the journal is no longer needed once the full output exists)
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(evaluated_data, f, ensure_ascii=False, indent=2)
+    if failed:
+        print(f"\n⚠️  {failed} records failed after retries and were NOT classified.")
+        print(f"   Re-run with --resume to retry only those (journal: {journal.path})")
+    else:
+        journal.discard()
     print(f"\nEvaluated JSON saved to: {output_path}")
 
     return evaluated_data
@@ -277,20 +682,64 @@ if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description='Evaluate LLM answers for brand sentiment')
-    parser.add_argument('--input', '-i', required=True, help='Input JSON file (from classifier)')
+    parser.add_argument('--input', '-i', required=True, help='Input JSON or JSONL file (from classifier)')
     parser.add_argument('--output', '-o', required=True, help='Output JSON file')
     parser.add_argument('--brand', '-b', required=True, help='Brand name to evaluate')
     parser.add_argument('--model', '-m', default=DEFAULT_MODEL, help='OpenRouter model')
     parser.add_argument('--api-key', '-k', help='OpenRouter API key (or set OPENROUTER_API_KEY)')
-    parser.add_argument('--delay', '-d', type=float, default=0.1, help='Delay between API calls')
+    parser.add_argument('--delay', '-d', type=float, default=0.0,
+                        help='Extra delay between API calls (default: 0, the client rate-limits)')
+    parser.add_argument('--rpm', type=float, default=DEFAULT_REQUESTS_PER_MINUTE,
+                        help=f'Max requests per minute (default: {DEFAULT_REQUESTS_PER_MINUTE})')
+    parser.add_argument('--tpm', type=float, default=DEFAULT_TOKENS_PER_MINUTE,
+                        help=f'Max estimated tokens per minute (default: {DEFAULT_TOKENS_PER_MINUTE})')
+    parser.add_argument('--max-retries', type=int, default=5,
+                        help='Retries per call on 429/5xx/network errors (default: 5)')
+    parser.add_argument('--timeout-budget', type=float, default=DEFAULT_TIMEOUT_BUDGET,
+                        help=f'Max seconds per call, retries included (default: {DEFAULT_TIMEOUT_BUDGET:.0f})')
+    parser.add_argument('--pool-size', type=int,
+                        help='Keep-alive connections in the HTTP pool (default: max(concurrency, 16))')
+    parser.add_argument('--http2', action='store_true',
+                        help='Use HTTP/2 (requires: pip install httpx[http2])')
+    parser.add_argument('--concurrency', '-c', type=int, default=1,
+                        help='Number of simultaneous API calls (default: 1, sequential)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'Response cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the response cache')
+    parser.add_argument('--cache-ttl-days', type=float, default=DEFAULT_TTL_SECONDS / 86400,
+                        help='Days before a cached response expires (default: 30)')
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help='Pack up to N short answers per request (default: 1, no batching)')
+    parser.add_argument('--batch-tokens', type=int, default=DEFAULT_BATCH_TOKENS,
+                        help=f'Prompt token budget per batched request (default: {DEFAULT_BATCH_TOKENS})')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip records already evaluated in the journal of an interrupted run')
+    parser.add_argument('--journal', help='Journal file (default: <output>.journal.jsonl)')
 
     args = parser.parse_args()
 
+    configure_client(
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        max_retries=args.max_retries,
+        max_concurrency=max(args.concurrency, 1),
+        timeout_budget=args.timeout_budget,
+        pool_size=args.pool_size or max(args.concurrency, 16),
+        http2=args.http2
+    )
+
     evaluate(
         input_path=args.input,
         output_path=args.output,
         brand=args.brand,
         model=args.model,
         api_key=args.api_key,
-        delay=args.delay
+        delay=args.delay,
+        concurrency=args.concurrency,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        cache_ttl=args.cache_ttl_days * 86400,
+        resume=args.resume,
+        journal_path=args.journal,
+        batch_size=args.batch_size,
+        batch_tokens=args.batch_tokens
     )
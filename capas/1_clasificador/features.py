@@ -0,0 +1,206 @@
+"""
+Columnar Answer Features
+
+Batch version of the per-record enrichment: takes a whole column of answers
+(pandas Series, NumPy array, Arrow array or list) and returns the feature
+columns `mention`, `ranking_list`, `position` and `citations`, and enriches a
+whole battery held in a DataFrame, ready to be written as Parquet.
+
+- mention is the only vectorized column: pandas' string kernels (lowercase +
+  substring test) over the whole Series
+- ranking_list, position and citations are still computed answer by answer,
+  with the compiled BrandMatcher / CitationExtractor (built once per battery)
+- category matching is done once per distinct question, not once per answer
+  (every question is usually asked to several models); this is where most of
+  the gain over enrich_record() comes from
+
+Results are identical to enrich_record() row by row: the input records keep
+their own values (build the frame with records_frame(), so None and ints are
+not turned into NaN and floats), and frame_records() merges the computed
+columns back into the original record dictionaries.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from brand_aliases import AliasTable
+from brand_matcher import get_brand_matcher
+from citations import get_citation_extractor
+from question_index import QuestionIndex
+
+# pandas is imported on first use, so importing the classifier does not pay for it
+if TYPE_CHECKING:
+    import pandas as pd
+
+FEATURE_COLUMNS = ('mention', 'ranking_list', 'position', 'citations')
+# Columns enrich_frame adds to the input records, in enrich_record() order
+ENRICHED_COLUMNS = ('category', 'category_name') + FEATURE_COLUMNS
+
+
+def _as_series(values: Any) -> 'pd.Series':
+    """pandas Series of stripped strings from a Series, NumPy/Arrow array or iterable (None -> '')."""
+    import pandas as pd
+
+    if hasattr(values, 'to_pandas'):  # pyarrow Array / ChunkedArray
+        values = values.to_pandas()
+    if not isinstance(values, pd.Series):
+        values = pd.Series(list(values), dtype=object)
+    return values.astype(object).where(values.notna(), '').astype(str).str.strip()
+
+
+def answer_features(
+    answers: Any,
+    brand: str,
+    competitors: Iterable[str],
+    aliases: Optional[AliasTable] = None
+) -> 'pd.DataFrame':
+    """
+    Compute mention, ranking_list, position and citations for a column of answers.
+
+    Only `mention` is vectorized; the other columns loop over the answers with
+    the shared BrandMatcher and CitationExtractor.
+
+    Args:
+        answers: Answer texts (pandas Series, NumPy/Arrow string array or list)
+        brand: Main brand
+        competitors: Known competitor names
+        aliases: Brand alias table (competitors reported by canonical name)
+
+    Returns:
+        DataFrame with the FEATURE_COLUMNS, aligned with the input (same index for a Series)
+    """
+    import pandas as pd
+    from classifier import build_ranking_list
+
+    texts = _as_series(answers)
+    if brand:
+        mention = texts.str.lower().str.contains(brand.lower(), regex=False)
+    else:
+        mention = pd.Series(False, index=texts.index)
+
+    matcher = get_brand_matcher(brand, competitors, aliases)
+    extractor = get_citation_extractor()
+    rankings: List[List[str]] = []
+    positions: List[Optional[int]] = []
+    citations: List[List[str]] = []
+    for text in texts:
+        matches = matcher.scan(text)
+        ranking_list, position = build_ranking_list(text, brand, matches.detected, matches.offsets)
+        rankings.append(ranking_list)
+        positions.append(position)
+        citations.append(extractor.extract(text))
+
+    return pd.DataFrame({
+        'mention': mention.astype(bool),
+        'ranking_list': pd.Series(rankings, index=texts.index, dtype=object),
+        'position': pd.Series(positions, index=texts.index, dtype=object),
+        'citations': pd.Series(citations, index=texts.index, dtype=object),
+    })
+
+
+def question_categories(
+    questions: Any,
+    question_to_category: Dict[str, Tuple[int, str]],
+    question_index: Optional[QuestionIndex] = None
+) -> Tuple[List[Tuple[int, str]], List[Optional[str]]]:
+    """
+    Category of every question, matching each distinct question once.
+
+    Returns:
+        Tuple of ((category_id, category_name) per question, fuzzy match note per question)
+    """
+    from classifier import fuzzy_match, normalize_question
+
+    if question_index is None:
+        question_index = QuestionIndex(question_to_category)
+
+    matched: Dict[str, Tuple[Tuple[int, str], Optional[str]]] = {}
+    categories, notes = [], []
+    for question_text in _as_series(questions):
+        result = matched.get(question_text)
+        if result is None:
+            normalized = normalize_question(question_text)
+            cat_info = question_to_category.get(normalized)
+            note = None
+            if cat_info is None:
+                cat_info, ratio = fuzzy_match(normalized, question_to_category, index=question_index)
+                if cat_info[0] != 0:
+                    note = f"  Fuzzy match ({ratio:.0%}): '{question_text[:50]}...'"
+            result = matched[question_text] = (cat_info, note)
+        categories.append(result[0])
+        notes.append(result[1])
+    return categories, notes
+
+
+def records_frame(records: List[dict]) -> 'pd.DataFrame':
+    """DataFrame of export records with object columns (None stays None, ints stay ints)."""
+    import pandas as pd
+
+    return pd.DataFrame(records, dtype=object)
+
+
+def enrich_frame(
+    records: 'pd.DataFrame',
+    question_to_category: Dict[str, Tuple[int, str]],
+    brand: str,
+    competitors: Iterable[str],
+    question_index: Optional[QuestionIndex] = None,
+    aliases: Optional[AliasTable] = None
+) -> Tuple['pd.DataFrame', List[Optional[str]]]:
+    """
+    Enrich a whole battery held in a DataFrame (one row per answer record).
+
+    Args:
+        records: Export records (question_text and answer columns)
+        question_to_category: Mapping from normalized question to (category_id, category_name)
+        brand: Main brand
+        competitors: Known competitor names
+        question_index: Fuzzy index over question_to_category (built if None)
+        aliases: Brand alias table
+
+    Returns:
+        Tuple of (records with category, category_name and feature columns added,
+        fuzzy match note per row)
+    """
+    import pandas as pd
+
+    def column(name: str) -> 'pd.Series':
+        return records[name] if name in records else pd.Series('', index=records.index, dtype=object)
+
+    categories, notes = question_categories(column('question_text'), question_to_category, question_index)
+    features = answer_features(column('answer'), brand, competitors, aliases)
+
+    enriched = records.copy()
+    enriched['category'] = [cat_id for cat_id, _ in categories]
+    enriched['category_name'] = [cat_name for _, cat_name in categories]
+    for name in FEATURE_COLUMNS:
+        enriched[name] = features[name]
+    return enriched, notes
+
+
+def frame_records(frame: 'pd.DataFrame', records: List[dict]) -> List[dict]:
+    """
+    Enriched records: each input record with the columns enrich_frame added.
+
+    Args:
+        frame: Enriched frame (row i built from records[i])
+        records: The input records the frame was built from
+
+    Returns:
+        Record dictionaries equal to enrich_record()'s (input keys and values untouched)
+    """
+    columns = [frame[name].tolist() for name in ENRICHED_COLUMNS]
+    return [
+        {**record, **dict(zip(ENRICHED_COLUMNS, values))}
+        for record, values in zip(records, zip(*columns))
+    ]
+
+
+def write_parquet(frame: 'pd.DataFrame', path: str) -> None:
+    """
+    Write an enriched frame to Parquet (needs pyarrow or fastparquet).
+
+    Raises:
+        ImportError: If no Parquet engine is installed
+    """
+    # Nullable integer, so positions are not widened to floats by the missing ones
+    frame.astype({'position': 'Int64'}).to_parquet(path, index=False)
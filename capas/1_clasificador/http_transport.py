@@ -0,0 +1,253 @@
+"""
+Pooled HTTP Transport for OpenRouter Calls
+
+One keep-alive connection pool per process, so consecutive calls reuse the
+same TCP+TLS connection instead of paying a new handshake for every answer.
+
+Backends:
+- requests.Session (default): HTTP/1.1 keep-alive with a configurable pool
+- httpx.Client (optional, http2=True): HTTP/2 multiplexing, needs `pip install httpx[http2]`
+
+Every call records connect / TLS / time-to-first-byte timings, aggregated in
+TransportStats so the cost of handshakes is visible in run summaries.
+"""
+
+import threading
+import time
+from typing import Dict, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 30.0
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class TransportError(Exception):
+    """Network-level failure (connection error, timeout) raised by every backend."""
+
+
+# Handshake timings of connections opened by the current thread (filled by the
+# instrumented connection classes below, read back by RequestsTransport.post)
+_handshakes = threading.local()
+
+
+def _record_handshake(connect: float, tls: float) -> None:
+    _handshakes.connect = getattr(_handshakes, 'connect', 0.0) + connect
+    _handshakes.tls = getattr(_handshakes, 'tls', 0.0) + tls
+    _handshakes.count = getattr(_handshakes, 'count', 0) + 1
+
+
+def _pop_handshake() -> Tuple[int, float, float]:
+    """Return (new_connections, connect_seconds, tls_seconds) since the last call."""
+    result = (getattr(_handshakes, 'count', 0),
+              getattr(_handshakes, 'connect', 0.0),
+              getattr(_handshakes, 'tls', 0.0))
+    _handshakes.count, _handshakes.connect, _handshakes.tls = 0, 0.0, 0.0
+    return result
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    """HTTP connection that records its TCP connect time."""
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _record_handshake(time.perf_counter() - start, 0.0)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    """HTTPS connection that records TCP connect and TLS handshake times separately."""
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        conn = super()._new_conn()
+        self._tcp_seconds = time.perf_counter() - start
+        return conn
+
+    def connect(self):
+        self._tcp_seconds = 0.0
+        start = time.perf_counter()
+        super().connect()
+        total = time.perf_counter() - start
+        _record_handshake(self._tcp_seconds, max(0.0, total - self._tcp_seconds))
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools use the instrumented connection classes."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+class TransportResponse:
+    """Minimal response wrapper shared by both backends."""
+
+    def __init__(self, status_code: int, headers, text: str, body, timings: Dict[str, float]):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+        self._body = body
+        self.timings = timings
+
+    def json(self):
+        return self._body()
+
+
+class TransportStats:
+    """Thread-safe aggregate of per-call timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.new_connections = 0
+        self.connect_seconds = 0.0
+        self.tls_seconds = 0.0
+        self.ttfb_seconds = 0.0
+        self.total_seconds = 0.0
+
+    def add(self, timings: Dict[str, float]) -> None:
+        with self._lock:
+            self.calls += 1
+            self.new_connections += int(timings.get('new_connections', 0))
+            self.connect_seconds += timings.get('connect', 0.0)
+            self.tls_seconds += timings.get('tls', 0.0)
+            self.ttfb_seconds += timings.get('ttfb', 0.0)
+            self.total_seconds += timings.get('total', 0.0)
+
+    def summary(self) -> str:
+        """One-line timing summary for reports."""
+        if not self.calls:
+            return "no calls"
+        handshake = self.connect_seconds + self.tls_seconds
+        return (f"{self.calls} calls over {self.new_connections} connections | "
+                f"handshakes {handshake:.2f}s total (connect {self.connect_seconds * 1000:.0f} ms, "
+                f"TLS {self.tls_seconds * 1000:.0f} ms) | "
+                f"avg TTFB {self.ttfb_seconds / self.calls * 1000:.0f} ms, "
+                f"avg total {self.total_seconds / self.calls * 1000:.0f} ms")
+
+
+class RequestsTransport:
+    """Keep-alive HTTP/1.1 transport backed by a pooled requests.Session."""
+
+    http2 = False
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        self.session = requests.Session()
+        adapter = _TimedHTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=False)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.stats = TransportStats()
+
+    def post(self, url: str, headers: Dict, json: Dict, timeout: Timeout) -> TransportResponse:
+        _pop_handshake()  # Discard anything left over on this thread
+        start = time.perf_counter()
+        try:
+            response = self.session.post(url, headers=headers, json=json, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            raise TransportError(str(e)) from e
+        total = time.perf_counter() - start
+        new_connections, connect, tls = _pop_handshake()
+        timings = {
+            'new_connections': new_connections,
+            'connect': connect,
+            'tls': tls,
+            # requests measures from sending the request until the headers are parsed
+            'ttfb': response.elapsed.total_seconds(),
+            'total': total,
+        }
+        self.stats.add(timings)
+        return TransportResponse(response.status_code, response.headers, response.text,
+                                 response.json, timings)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class HttpxTransport:
+    """HTTP/2 transport backed by httpx (optional dependency)."""
+
+    http2 = True
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        import httpx  # Optional: only needed when HTTP/2 is requested
+
+        self._httpx = httpx
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+        self.stats = TransportStats()
+
+    def post(self, url: str, headers: Dict, json: Dict, timeout: Timeout) -> TransportResponse:
+        marks: Dict[str, float] = {}
+
+        def trace(event_name: str, info: Dict) -> None:
+            marks[event_name] = time.perf_counter()
+
+        if isinstance(timeout, tuple):
+            timeout = self._httpx.Timeout(timeout[1], connect=timeout[0])
+
+        start = time.perf_counter()
+        try:
+            response = self.client.post(url, headers=headers, json=json, timeout=timeout,
+                                        extensions={'trace': trace})
+        except self._httpx.HTTPError as e:
+            raise TransportError(str(e)) from e
+        total = time.perf_counter() - start
+
+        def span(prefix: str) -> float:
+            started, complete = marks.get(f'{prefix}.started'), marks.get(f'{prefix}.complete')
+            return complete - started if started and complete else 0.0
+
+        headers_done = (marks.get('http2.receive_response_headers.complete')
+                        or marks.get('http11.receive_response_headers.complete'))
+        timings = {
+            'new_connections': 1 if 'connection.connect_tcp.started' in marks else 0,
+            'connect': span('connection.connect_tcp'),
+            'tls': span('connection.start_tls'),
+            'ttfb': headers_done - start if headers_done else total,
+            'total': total,
+        }
+        self.stats.add(timings)
+        return TransportResponse(response.status_code, response.headers, response.text,
+                                 response.json, timings)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def create_transport(pool_size: int = DEFAULT_POOL_SIZE, http2: bool = False):
+    """
+    Create the HTTP transport for OpenRouter calls.
+
+    Args:
+        pool_size: Maximum number of pooled keep-alive connections
+        http2: Use HTTP/2 via httpx (falls back to HTTP/1.1 keep-alive if httpx/h2 is missing)
+
+    Returns:
+        RequestsTransport or HttpxTransport
+    """
+    if http2:
+        try:
+            return HttpxTransport(pool_size)
+        except ImportError:
+            print("  Warning: HTTP/2 requires 'pip install httpx[http2]' - using HTTP/1.1 keep-alive")
+    return RequestsTransport(pool_size)
@@ -0,0 +1,124 @@
+"""
+Incremental Re-classification
+
+Fingerprints the inputs of every enriched record so a re-run only recomputes
+records that changed. A record's fingerprint covers:
+- the whole input record (question text, answer and every other field)
+- the brand and its competitor set
+- the question -> category map
+- the citation exclusion list and brand aliases
+- ENRICHMENT_VERSION (bump when the enrichment logic changes)
+
+Fingerprints are stored next to the output (`<output>.fingerprints`, one per
+line, aligned with the output records). With --incremental, records whose
+fingerprint is unchanged are copied verbatim from the previous output.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, Optional, Tuple
+
+from json_stream import load_records
+
+# Part of every fingerprint: bump to invalidate all previous outputs
+ENRICHMENT_VERSION = 3
+
+
+def _digest(value) -> str:
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def context_fingerprint(
+    brand: str,
+    competitors: Iterable[str],
+    question_to_category: Dict[str, Tuple[int, str]],
+    non_sources: Iterable[str],
+    aliases: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    Fingerprint of everything besides the record itself that enrichment depends on.
+
+    Args:
+        brand: Main brand
+        competitors: Final competitor set (Excel + YAML + LLM)
+        question_to_category: Category map from the Excel
+        non_sources: Citation exclusion list of the current config
+        aliases: Brand spelling -> canonical name table of the current config
+
+    Returns:
+        Hex digest
+    """
+    return _digest({
+        'version': ENRICHMENT_VERSION,
+        'brand': brand,
+        'competitors': _digest(sorted(competitors)),
+        'categories': _digest(sorted((q, list(c)) for q, c in question_to_category.items())),
+        'non_sources': _digest(sorted(non_sources)),
+        'aliases': _digest(sorted((aliases or {}).items())),
+    })
+
+
+def record_fingerprint(record: dict, context: str) -> str:
+    """Fingerprint of one input record under a given context fingerprint."""
+    return _digest([context, record])
+
+
+def fingerprints_path(output_path: str) -> str:
+    """Fingerprint file stored next to an output file."""
+    return f"{output_path}.fingerprints"
+
+
+def load_previous(output_path: str) -> Dict[str, dict]:
+    """
+    Previous enriched records by fingerprint (empty if there is no usable previous run).
+
+    Args:
+        output_path: Output file of the previous run (JSON array or JSONL)
+
+    Returns:
+        Dictionary mapping fingerprint to enriched record
+    """
+    path = fingerprints_path(output_path)
+    if not (os.path.exists(output_path) and os.path.exists(path)):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            fingerprints = [line.strip() for line in f if line.strip()]
+        try:
+            records = load_records(output_path)
+        except json.JSONDecodeError:
+            # JSONL written to a file without the .jsonl extension
+            with open(output_path, 'r', encoding='utf-8') as f:
+                records = [json.loads(line) for line in f if line.strip()]
+    except (OSError, ValueError) as e:
+        print(f"  Warning: cannot reuse previous output ({e}) - recomputing all records")
+        return {}
+
+    if len(fingerprints) != len(records):
+        print("  Warning: previous output and fingerprints differ - recomputing all records")
+        return {}
+    return dict(zip(fingerprints, records))
+
+
+class FingerprintWriter:
+    """Writes the fingerprint file alongside a RecordWriter (atomic replace on close)."""
+
+    def __init__(self, output_path: str):
+        self.path = fingerprints_path(output_path)
+        self._tmp_path = f"{self.path}.tmp"
+        self._f = open(self._tmp_path, 'w', encoding='utf-8')
+
+    def write(self, fingerprint: str) -> None:
+        self._f.write(fingerprint + '\n')
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+            os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+            os.remove(self._tmp_path)
@@ -0,0 +1,132 @@
+"""
+Config-Driven Industry Detection
+
+Scores every industry of brands_config.yaml (the `keywords` list of each entry
+in `industries:`) against a text such as the Excel file name, its sheet names
+and a sample of its questions. All keywords of all industries are compiled
+into one Aho-Corasick automaton, so a text is scanned once whatever the number
+of industries and keywords.
+
+Keywords are case-insensitive and match at the start of a word ("bet" matches
+"betting" and "betfair_es.xlsx", "ev" does not match "nuevo"). The score of an
+industry is the number of its distinct keywords found; the confidence of a
+result is its share of the total score.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class IndustryScore:
+    """Score of one industry for a text."""
+
+    def __init__(self, industry: str, score: int, confidence: float, keywords: List[str]):
+        self.industry = industry
+        self.score = score            # Distinct keywords of the industry found
+        self.confidence = confidence  # score / sum of the scores of every industry
+        self.keywords = keywords      # Keywords found (sorted)
+
+    def __repr__(self) -> str:
+        return f"IndustryScore({self.industry!r}, score={self.score}, confidence={self.confidence:.2f})"
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a set of lowercase keywords (immutable)."""
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Args:
+            keywords: Keywords to find (any case)
+        """
+        self.keywords: List[str] = list(dict.fromkeys(k.lower() for k in keywords if k))
+        # State -> {char: next state}, failure link and (keyword id, ...) ending at the state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] += (keyword_id,)
+
+        # Breadth-first failure links; outputs of the failure state are inherited
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def find(self, text: str) -> List[int]:
+        """Ids of the keywords found at the start of a word of `text` (each id once, in order found)."""
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        found: Dict[int, None] = {}
+        text = text.lower()
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword_id in out[state]:
+                start = end - len(keywords[keyword_id])
+                if keyword_id not in found and (start == 0 or not text[start - 1].isalnum()):
+                    found[keyword_id] = None
+        return list(found)
+
+
+class IndustryDetector:
+    """Ranks configured industries by the keywords found in a text."""
+
+    def __init__(self, keywords_by_industry: Dict[str, Iterable[str]]):
+        """
+        Args:
+            keywords_by_industry: Industry -> its keywords (a keyword may belong to several industries)
+        """
+        self.industries = list(keywords_by_industry)
+        industries_by_keyword: Dict[str, List[str]] = {}
+        for industry, keywords in keywords_by_industry.items():
+            for keyword in keywords or []:
+                industries = industries_by_keyword.setdefault(keyword.lower(), [])
+                if industry not in industries:
+                    industries.append(industry)
+        self.automaton = KeywordAutomaton(industries_by_keyword)
+        self._industries_by_id = [industries_by_keyword[k] for k in self.automaton.keywords]
+
+    def score(self, text: str) -> List[IndustryScore]:
+        """
+        Score every industry with at least one keyword in `text`.
+
+        Returns:
+            IndustryScores sorted by score (descending), then by configuration order
+        """
+        found: Dict[str, List[str]] = {}
+        for keyword_id in self.automaton.find(text):
+            for industry in self._industries_by_id[keyword_id]:
+                found.setdefault(industry, []).append(self.automaton.keywords[keyword_id])
+
+        total = sum(len(keywords) for keywords in found.values())
+        scores = [
+            IndustryScore(industry, len(found[industry]), len(found[industry]) / total, sorted(found[industry]))
+            for industry in self.industries if industry in found
+        ]
+        scores.sort(key=lambda s: -s.score)
+        return scores
+
+    def detect(self, text: str) -> Optional[str]:
+        """Best scoring industry, or None if no keyword was found or the top score is tied."""
+        scores = self.score(text)
+        if not scores or (len(scores) > 1 and scores[1].score == scores[0].score):
+            return None
+        return scores[0].industry
@@ -0,0 +1,217 @@
+"""
+Streaming JSON Input/Output for Answer Exports
+
+Reads the records of a PHPMyAdmin JSON export one at a time and writes
+enriched records incrementally, so memory stays constant whatever the size
+of the export.
+
+PHPMyAdmin export layout:
+    [
+      {"type": "header", ...},
+      {"type": "database", "name": "..."},
+      {"type": "table", "name": "...", "database": "...", "data": [ {record}, {record}, ... ]}
+    ]
+
+Output formats:
+- json:  JSON array, byte-identical to json.dump(records, f, ensure_ascii=False, indent=2)
+- jsonl: one compact JSON record per line
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+OUTPUT_FORMATS = ('json', 'jsonl')
+
+
+class _JsonReader:
+    """Buffered reader decoding one JSON value at a time from a text stream."""
+
+    def __init__(self, f: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer (dropping consumed text). False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\n\r':
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars: str) -> str:
+        """Consume the next non-whitespace character, which must be one of `chars`."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Invalid JSON export: expected one of {chars!r}, found {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A number or literal ending exactly at the buffer end may be cut short
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def array_items(self) -> Iterator[Any]:
+        """Decode the items of the array starting at the current position, one by one."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+
+def _table_records(reader: _JsonReader) -> Iterator[Dict]:
+    """Records of the export object starting at the current position (if it is a table)."""
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.pos += 1
+        return
+
+    item_type = None
+    buffered: Optional[List] = None
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == 'data' and reader.peek() == '[' and item_type == 'table':
+            # Usual case: "type" comes before "data", so records are streamed
+            yield from reader.array_items()
+        elif key == 'data':
+            # "data" before "type": keep it until we know whether this is a table
+            buffered = reader.value()
+        else:
+            value = reader.value()
+            if key == 'type':
+                item_type = value
+        if reader.expect(',}') == '}':
+            break
+
+    if buffered is not None and item_type == 'table':
+        yield from buffered
+
+
+def iter_export_records(json_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Iterate the records of every table in a PHPMyAdmin JSON export without loading the file.
+
+    Yields the same records, in the same order, as:
+        for item in json.load(f):
+            if item.get('type') == 'table' and 'data' in item:
+                yield from item['data']
+
+    Args:
+        json_path: Path to the JSON export
+        chunk_size: Characters read from the file at a time
+
+    Yields:
+        Record dictionaries
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        reader = _JsonReader(f, chunk_size)
+        reader.expect('[')
+        if reader.peek() == ']':
+            return
+        while True:
+            if reader.peek() == '{':
+                yield from _table_records(reader)
+            else:
+                reader.value()
+            if reader.expect(',]') == ']':
+                return
+
+
+def load_records(path: str) -> List[Dict]:
+    """Load a list of records from a JSON array file or a JSONL file (.jsonl)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+class RecordWriter:
+    """
+    Incremental writer of enriched records as a JSON array or JSONL.
+
+    Records go to a temporary file that replaces `path` on close(), so a failed
+    run never leaves a truncated output behind.
+    """
+
+    def __init__(self, path: str, output_format: str = 'json'):
+        """
+        Args:
+            path: Output file path
+            output_format: 'json' (indented array) or 'jsonl' (one record per line)
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}' (use one of {OUTPUT_FORMATS})")
+        self.path = path
+        self.output_format = output_format
+        self.count = 0
+        self._tmp_path = f"{path}.tmp"
+        self._f = open(self._tmp_path, 'w', encoding='utf-8')
+
+    def write(self, record: Dict) -> None:
+        if self.output_format == 'jsonl':
+            self._f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        else:
+            # Same bytes as json.dump(records, indent=2): items indented one level
+            # (JSON escapes newlines inside strings, so every '\n' here is a line break)
+            item = json.dumps(record, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+            self._f.write(('[\n  ' if self.count == 0 else ',\n  ') + item)
+        self.count += 1
+
+    def close(self) -> None:
+        """Finish the file and move it into place."""
+        if self._f.closed:
+            return
+        if self.output_format == 'json':
+            self._f.write('\n]' if self.count else '[]')
+        self._f.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Discard everything written so far (the previous output, if any, is kept)."""
+        if not self._f.closed:
+            self._f.close()
+            os.remove(self._tmp_path)
+
+    def __enter__(self) -> 'RecordWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
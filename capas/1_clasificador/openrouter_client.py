@@ -0,0 +1,333 @@
+"""
+Shared OpenRouter Client
+
+Single entry point for every OpenRouter call made by the pipeline
+(evaluator sentiment classification, classifier competitor discovery).
+
+Provides:
+- Requests-per-minute and tokens-per-minute token buckets
+- Retries with jittered exponential backoff on 429/5xx and network errors
+- Honors the Retry-After header (seconds or HTTP date)
+- AIMD concurrency control: in-flight limit grows on success, halves on throttling
+- Pooled keep-alive transport (optional HTTP/2) with a per-call timeout budget
+- Raises OpenRouterError instead of returning placeholder results
+"""
+
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from http_transport import (
+    DEFAULT_CONNECT_TIMEOUT, DEFAULT_POOL_SIZE, DEFAULT_READ_TIMEOUT,
+    TransportError, create_transport
+)
+
+OPENROUTER_API_KEY = os.environ.get('OPENROUTER_API_KEY', '')
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+# Default limits (override with configure_client or the evaluator CLI)
+DEFAULT_REQUESTS_PER_MINUTE = 600
+DEFAULT_TOKENS_PER_MINUTE = 1_000_000
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_TIMEOUT_BUDGET = 120.0  # Max seconds per chat() call, retries included
+
+# Status codes worth retrying (throttling and transient server errors)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class OpenRouterError(Exception):
+    """Raised when an OpenRouter call fails after all retries (or is not retryable)."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `per_minute` tokens per minute."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> None:
+        """Block until `amount` tokens are available, then take them."""
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def consume(self, amount: float) -> None:
+        """Take tokens without waiting (balance may go negative, delaying later calls)."""
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease limit on in-flight requests.
+
+    Every successful call raises the limit by about one slot per window;
+    every throttled call (429/5xx) halves it.
+    """
+
+    def __init__(self, initial: float = 4, minimum: float = 1, maximum: float = 64,
+                 decrease_factor: float = 0.5):
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.decrease_factor = decrease_factor
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until an in-flight slot is free."""
+        with self._cond:
+            while self._in_flight >= max(1, int(self.limit)):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, throttled: bool = False) -> None:
+        """Free a slot and adapt the limit to the outcome of the call."""
+        with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit * self.decrease_factor)
+            else:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(payload: Dict) -> int:
+    """Rough token estimate for a chat payload (~4 chars per token + completion budget)."""
+    chars = sum(len(str(m.get('content', ''))) for m in payload.get('messages', []))
+    return chars // 4 + int(payload.get('max_tokens', 0))
+
+
+class OpenRouterClient:
+    """Rate-limited, retrying OpenRouter chat client shared across the pipeline."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        requests_per_minute: Optional[float] = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: Optional[float] = DEFAULT_TOKENS_PER_MINUTE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        max_concurrency: int = 64,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        timeout_budget: Optional[float] = DEFAULT_TIMEOUT_BUDGET,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        http2: bool = False,
+        transport=None
+    ):
+        """
+        Args:
+            api_key: Default OpenRouter API key (uses env var if not provided)
+            requests_per_minute: Request budget (None = unlimited)
+            tokens_per_minute: Estimated token budget (None = unlimited)
+            max_retries: Retries after the first attempt for retryable failures
+            backoff_base: Base delay (seconds) for exponential backoff
+            backoff_max: Maximum backoff delay (seconds)
+            max_concurrency: Upper bound for the adaptive in-flight limit
+            connect_timeout: Per-attempt connect timeout (seconds)
+            read_timeout: Per-attempt read timeout (seconds)
+            timeout_budget: Total seconds a chat() call may take, retries included (None = unbounded)
+            pool_size: Keep-alive connections kept in the pool
+            http2: Use HTTP/2 (requires httpx[http2], falls back to HTTP/1.1)
+            transport: Pre-built transport (see http_transport.create_transport)
+        """
+        self.api_key = api_key or OPENROUTER_API_KEY
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.concurrency = AIMDController(initial=min(4, max_concurrency), maximum=max_concurrency)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.timeout_budget = timeout_budget
+        self.transport = transport or create_transport(pool_size, http2)
+        self._pause_until = 0.0
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'throttled': 0, 'failures': 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _pause(self, seconds: float) -> None:
+        """Hold back every caller for `seconds` (provider asked us to slow down)."""
+        with self._lock:
+            self._pause_until = max(self._pause_until, time.monotonic() + seconds)
+
+    def _wait_for_pause(self) -> None:
+        while True:
+            with self._lock:
+                remaining = self._pause_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def chat(self, payload: Dict, api_key: Optional[str] = None, extra_headers: Optional[Dict] = None) -> str:
+        """
+        Send a chat completion request and return the message content.
+
+        Args:
+            payload: OpenRouter chat completion payload (model, messages, ...)
+            api_key: API key for this call (defaults to the client key)
+            extra_headers: Additional HTTP headers
+
+        Returns:
+            Content string of the first choice
+
+        Raises:
+            ValueError: If no API key is available
+            OpenRouterError: If the call fails after all retries or is not retryable
+        """
+        key = api_key or self.api_key
+        if not key:
+            raise ValueError("OpenRouter API key not provided. Set OPENROUTER_API_KEY env var.")
+
+        headers = {
+            "Authorization": f"Bearer {key}",
+            "Content-Type": "application/json",
+            **(extra_headers or {})
+        }
+        estimated = estimate_tokens(payload)
+        error = OpenRouterError("No attempt made")
+        deadline = time.monotonic() + self.timeout_budget if self.timeout_budget else None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count('retries')
+            self._wait_for_pause()
+            if self.request_bucket:
+                self.request_bucket.acquire(1)
+            if self.token_bucket:
+                self.token_bucket.acquire(estimated)
+
+            timeout = (self.connect_timeout, self.read_timeout)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    error = OpenRouterError(f"Timeout budget of {self.timeout_budget:.0f}s exhausted ({error})")
+                    break
+                timeout = (min(self.connect_timeout, remaining), min(self.read_timeout, remaining))
+
+            self.concurrency.acquire()
+            throttled = False
+            retry_after = None
+            try:
+                self._count('requests')
+                response = self.transport.post(OPENROUTER_URL, headers=headers, json=payload, timeout=timeout)
+                status = response.status_code
+                if status == 200:
+                    result = response.json()
+                    content = result['choices'][0]['message']['content']
+                    if content is None:
+                        raise ValueError("empty completion content")
+                    # Charge the difference when the real usage exceeded the estimate
+                    used = (result.get('usage') or {}).get('total_tokens')
+                    if self.token_bucket and used and used > estimated:
+                        self.token_bucket.consume(used - estimated)
+                    return content.strip()
+
+                error = OpenRouterError(f"HTTP {status}: {response.text[:200]}", status)
+                if status not in RETRYABLE_STATUS:
+                    self._count('failures')
+                    raise error
+                throttled = True
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            except TransportError as e:
+                error = OpenRouterError(f"Request failed: {e}")
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                error = OpenRouterError(f"Malformed response: {e}")
+            finally:
+                self.concurrency.release(throttled)
+
+            if throttled:
+                self._count('throttled')
+            if attempt < self.max_retries:
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                if deadline is not None:
+                    delay = min(delay, max(0.0, deadline - time.monotonic()))
+                if retry_after is not None:
+                    self._pause(delay)
+                time.sleep(delay)
+
+        self._count('failures')
+        raise error
+
+    def summary(self) -> str:
+        """One-line usage summary for reports."""
+        s = self.stats
+        return (f"{s['requests']} requests, {s['retries']} retries, "
+                f"{s['throttled']} throttled, {s['failures']} failed "
+                f"(concurrency limit {self.concurrency.limit:.1f})")
+
+    def timing_summary(self) -> str:
+        """Connection reuse and connect/TLS/TTFB timings of the transport."""
+        protocol = "HTTP/2" if self.transport.http2 else "HTTP/1.1 keep-alive"
+        return f"{protocol}: {self.transport.stats.summary()}"
+
+
+# Process-wide client shared by evaluator and classifier
+_client: Optional[OpenRouterClient] = None
+# Guards creation, so threads calling get_client() at once share one client (and its limits)
+_client_lock = threading.Lock()
+
+
+def get_client() -> OpenRouterClient:
+    """Get the shared OpenRouter client (created with default limits on first use)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenRouterClient()
+    return _client
+
+
+def configure_client(**kwargs) -> OpenRouterClient:
+    """Replace the shared client with one built from `kwargs` (see OpenRouterClient)."""
+    global _client
+    with _client_lock:
+        _client = OpenRouterClient(**kwargs)
+    return _client
@@ -0,0 +1,157 @@
+"""
+Question Index for Fuzzy Category Matching
+
+Prebuilt index over the normalized Excel questions so unmatched JSON questions
+do not have to be compared with difflib.SequenceMatcher against every question.
+
+Lookup strategy (returns exactly what the exhaustive scan returns):
+1. Length window: candidates whose length alone caps the ratio below the threshold are skipped
+2. Character trigram postings shortlist the most similar candidates, which are scored first
+3. Remaining candidates are only scored when a cheap upper bound (character
+   multiset overlap, like SequenceMatcher.quick_ratio) can still beat the best match
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+NGRAM_SIZE = 3
+DEFAULT_SHORTLIST = 8
+
+UNKNOWN_CATEGORY: Tuple[int, str] = (0, 'Unknown')
+
+
+def char_ngrams(text: str, n: int = NGRAM_SIZE) -> List[str]:
+    """Character n-grams of `text` (the whole text if shorter than n)."""
+    if len(text) < n:
+        return [text] if text else []
+    return [text[i:i + n] for i in range(len(text) - n + 1)]
+
+
+def _ratio_bound(matches: int, length_a: int, length_b: int) -> float:
+    """Same formula as SequenceMatcher.ratio() for a given number of matching chars."""
+    total = length_a + length_b
+    return 2.0 * matches / total if total else 1.0
+
+
+class QuestionIndex:
+    """Immutable fuzzy-match index over a question -> (category_id, category_name) mapping."""
+
+    def __init__(self, question_to_category: Dict[str, Tuple[int, str]]):
+        """
+        Args:
+            question_to_category: Mapping from normalized question text to (category_id, category_name)
+        """
+        self.keys: List[str] = list(question_to_category)
+        self.values: List[Tuple[int, str]] = [question_to_category[k] for k in self.keys]
+        self.lowered: List[str] = [k.lower() for k in self.keys]
+        self.lengths: List[int] = [len(k) for k in self.lowered]
+        self.char_counts: List[Counter] = [Counter(k) for k in self.lowered]
+        # One matcher per candidate (built on first use) so its seq2 tables are reused across queries
+        self._matchers: List[Optional[SequenceMatcher]] = [None] * len(self.keys)
+
+        # Inverted postings: trigram -> candidate indices containing it
+        postings = defaultdict(list)
+        for i, text in enumerate(self.lowered):
+            for gram in set(char_ngrams(text)):
+                postings[gram].append(i)
+        self.postings: Dict[str, List[int]] = dict(postings)
+
+        # Candidates sorted by length for the length window
+        self.by_length: List[int] = sorted(range(len(self.keys)), key=lambda i: self.lengths[i])
+        self.sorted_lengths: List[int] = [self.lengths[i] for i in self.by_length]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __getstate__(self) -> dict:
+        # Matchers are a per-process cache and character counts are cheaper to
+        # recount than to unpickle, so neither is serialized
+        state = self.__dict__.copy()
+        del state['_matchers'], state['char_counts']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.char_counts = [Counter(k) for k in self.lowered]
+        self._matchers = [None] * len(self.keys)
+
+    def to_dict(self) -> Dict[str, Tuple[int, str]]:
+        """The question -> (category_id, category_name) mapping the index was built from."""
+        return dict(zip(self.keys, self.values))
+
+    def _length_window(self, length: int, threshold: float) -> List[int]:
+        """Indices of candidates whose length still allows ratio >= threshold."""
+        if threshold <= 0:
+            return list(range(len(self.keys)))
+        # 2*min(a, b) / (a + b) >= t  <=>  a*t/(2-t) <= b <= a*(2-t)/t
+        low = int(length * threshold / (2 - threshold))
+        high = int(length * (2 - threshold) / threshold) + 1
+        start = bisect_left(self.sorted_lengths, low)
+        end = bisect_right(self.sorted_lengths, high)
+        return self.by_length[start:end]
+
+    def best_match(
+        self,
+        query: str,
+        threshold: float,
+        shortlist: int = DEFAULT_SHORTLIST
+    ) -> Tuple[Tuple[int, str], float]:
+        """
+        Find the best fuzzy match for `query` (same result as an exhaustive SequenceMatcher scan).
+
+        Args:
+            query: Normalized question text
+            threshold: Minimum similarity ratio (0-1)
+            shortlist: Number of trigram-ranked candidates scored before bound pruning
+
+        Returns:
+            Tuple of ((category_id, category_name), similarity_ratio) or ((0, 'Unknown'), 0) if no match
+        """
+        query_lower = query.lower()
+        query_length = len(query_lower)
+        window = self._length_window(query_length, threshold)
+        if not window:
+            return UNKNOWN_CATEGORY, 0.0
+
+        # Shared trigram counts for candidates in the window
+        in_window = set(window)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in set(char_ngrams(query_lower)):
+            for i in self.postings.get(gram, ()):
+                if i in in_window:
+                    shared[i] += 1
+        ranked = sorted(shared, key=lambda i: (-shared[i], i))[:shortlist]
+
+        query_counts = Counter(query_lower)
+        best_index = -1
+        best_ratio = 0.0
+
+        def consider(i: int) -> None:
+            nonlocal best_index, best_ratio
+            matcher = self._matchers[i]
+            if matcher is None:
+                matcher = self._matchers[i] = SequenceMatcher(None, '', self.lowered[i])
+            matcher.set_seq1(query_lower)
+            ratio = matcher.ratio()
+            # Ties go to the candidate that comes first (like the exhaustive scan)
+            if ratio > best_ratio or (ratio == best_ratio and best_index != -1 and i < best_index):
+                best_ratio, best_index = ratio, i
+
+        for i in ranked:
+            consider(i)
+
+        shortlisted = set(ranked)
+        for i in sorted(window):
+            if i in shortlisted:
+                continue
+            overlap = sum((query_counts & self.char_counts[i]).values())
+            bound = _ratio_bound(overlap, query_length, self.lengths[i])
+            if bound < threshold or bound < best_ratio:
+                continue
+            consider(i)
+
+        if best_index != -1 and best_ratio >= threshold:
+            return self.values[best_index], best_ratio
+        return UNKNOWN_CATEGORY, 0.0
@@ -0,0 +1,216 @@
+"""
+Record Statistics for Classifier Reporting
+
+Collects the classifier report metrics (mentions, ranking lists, positions,
+detected brands, citations, categories) in a single pass over the enriched
+records. Partial statistics of shards (e.g. one per export file or batch job)
+can be merged, and are saved as JSON next to the enriched output
+(`<output>.stats.json`) so dashboards can read the counts without re-scanning
+the enriched file.
+
+Usage:
+    python record_stats.py show data/betfair/betfair_es_answers_classified.json.stats.json
+    python record_stats.py merge shard1.json.stats.json shard2.json.stats.json -o total.stats.json
+"""
+
+import json
+import os
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+
+STATS_VERSION = 1
+
+
+def stats_path(output_path: str) -> str:
+    """Statistics file stored next to an output file."""
+    return f"{output_path}.stats.json"
+
+
+def _percent(count: int, total: int) -> float:
+    return count / total * 100 if total else 0.0
+
+
+class RecordStats:
+    """Mergeable counters over enriched records."""
+
+    def __init__(self, brand: str = '', question_counts: Optional[Dict[Tuple[int, str], int]] = None):
+        """
+        Args:
+            brand: Main brand (not counted among the detected brands)
+            question_counts: Questions per (category_id, category_name) in the Excel battery
+        """
+        self.brand = brand
+        self.question_counts: Dict[Tuple[int, str], int] = dict(question_counts or {})
+        self.total = 0
+        self.unmatched = 0
+        self.mentions = 0
+        self.with_ranking_list = 0
+        self.with_citations = 0
+        self.categories: Counter = Counter()  # (category_id, category_name) -> records
+        self.brands: Counter = Counter()      # other brand -> answers ranking it
+        self.citations: Counter = Counter()   # source -> answers citing it
+        self.positions: Counter = Counter()   # brand position -> answers
+
+    def add(self, record: dict) -> None:
+        """Count one enriched record."""
+        self.total += 1
+        self.categories[(record['category'], record['category_name'])] += 1
+        if record['category'] == 0:
+            self.unmatched += 1
+        if record['mention']:
+            self.mentions += 1
+
+        ranking_list = record['ranking_list']
+        if ranking_list:
+            self.with_ranking_list += 1
+            brand_lower = self.brand.lower()
+            for b in ranking_list:
+                if b.lower() != brand_lower:  # Don't count main brand
+                    self.brands[b] += 1
+        if record['position'] is not None:
+            self.positions[record['position']] += 1
+
+        citations = record['citations']
+        if citations:
+            self.with_citations += 1
+            self.citations.update(citations)
+
+    def update(self, records: Iterable[dict]) -> 'RecordStats':
+        """Count several enriched records."""
+        for record in records:
+            self.add(record)
+        return self
+
+    def merge(self, other: 'RecordStats') -> 'RecordStats':
+        """
+        Add the counts of another shard to this one (in place).
+
+        Question counts describe the battery, not the records, so shards of the
+        same battery are not added up: the larger count per category is kept.
+        """
+        self.brand = self.brand or other.brand
+        for category, count in other.question_counts.items():
+            self.question_counts[category] = max(count, self.question_counts.get(category, 0))
+        self.total += other.total
+        self.unmatched += other.unmatched
+        self.mentions += other.mentions
+        self.with_ranking_list += other.with_ranking_list
+        self.with_citations += other.with_citations
+        self.categories.update(other.categories)
+        self.brands.update(other.brands)
+        self.citations.update(other.citations)
+        self.positions.update(other.positions)
+        return self
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable summary (brands and citations by count, descending)."""
+        categories = sorted(set(self.categories) | set(self.question_counts))
+        return {
+            'version': STATS_VERSION,
+            'brand': self.brand,
+            'total': self.total,
+            'unmatched': self.unmatched,
+            'mentions': self.mentions,
+            'with_ranking_list': self.with_ranking_list,
+            'with_citations': self.with_citations,
+            'categories': [
+                {'id': cat_id, 'name': cat_name,
+                 'questions': self.question_counts.get((cat_id, cat_name), 0),
+                 'records': self.categories.get((cat_id, cat_name), 0)}
+                for cat_id, cat_name in categories
+            ],
+            'positions': {str(pos): self.positions[pos] for pos in sorted(self.positions)},
+            'brands': dict(self.brands.most_common()),
+            'citations': dict(self.citations.most_common()),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RecordStats':
+        """Rebuild statistics from a to_dict() summary."""
+        if data.get('version') != STATS_VERSION:
+            raise ValueError(f"Unsupported statistics version: {data.get('version')}")
+        stats = cls(data['brand'], {
+            (c['id'], c['name']): c['questions'] for c in data['categories'] if c['questions']
+        })
+        stats.total = data['total']
+        stats.unmatched = data['unmatched']
+        stats.mentions = data['mentions']
+        stats.with_ranking_list = data['with_ranking_list']
+        stats.with_citations = data['with_citations']
+        stats.categories = Counter({(c['id'], c['name']): c['records'] for c in data['categories'] if c['records']})
+        stats.brands = Counter(data['brands'])
+        stats.citations = Counter(data['citations'])
+        stats.positions = Counter({int(pos): count for pos, count in data['positions'].items()})
+        return stats
+
+    def save(self, path: str) -> None:
+        """Write the JSON summary (atomic replace)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'RecordStats':
+        """Read a JSON summary written by save()."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def print_report(self) -> None:
+        """Print the classifier summary (mentions, ranking lists, top brands, positions, citations)."""
+        total = self.total
+        if self.unmatched > 0:
+            print(f"Warning: {self.unmatched} questions could not be matched to a category")
+
+        print(f"  Brand mentions: {self.mentions}/{total} ({_percent(self.mentions, total):.1f}%)")
+        print(f"  Answers with ranking list: {self.with_ranking_list}/{total} "
+              f"({_percent(self.with_ranking_list, total):.1f}%)")
+        print(f"  Answers with citations: {self.with_citations}/{total} "
+              f"({_percent(self.with_citations, total):.1f}%)")
+
+        # Show top detected brands
+        if self.brands:
+            print("\n  Top other brands detected:")
+            for brand_name, count in self.brands.most_common(10):
+                print(f"    - {brand_name}: {count}")
+
+        # Show position stats
+        if self.positions:
+            print("\n  Brand position distribution:")
+            for pos in sorted(self.positions):
+                count = self.positions[pos]
+                print(f"    - Position {pos}: {count} ({_percent(count, total):.1f}%)")
+
+        # Show top citations
+        if self.citations:
+            print("\n  Top citations:")
+            for citation, count in self.citations.most_common(10):
+                print(f"    - {citation}: {count}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Show or merge classifier statistics summaries')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    show = subparsers.add_parser('show', help='Print the report of a statistics file')
+    show.add_argument('path', help='Statistics JSON (<output>.stats.json)')
+
+    merge = subparsers.add_parser('merge', help='Merge the statistics of several shards')
+    merge.add_argument('paths', nargs='+', help='Statistics JSON files to merge')
+    merge.add_argument('--output', '-o', help='Write the merged statistics to this path')
+
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        RecordStats.load(args.path).print_report()
+    else:
+        merged = RecordStats()
+        for stats_file in args.paths:
+            merged.merge(RecordStats.load(stats_file))
+        print(f"Merged {len(args.paths)} files: {merged.total} records")
+        merged.print_report()
+        if args.output:
+            merged.save(args.output)
+            print(f"Merged statistics saved to: {args.output}")
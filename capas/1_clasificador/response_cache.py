@@ -0,0 +1,142 @@
+"""
+Persistent Response Cache for LLM Calls
+
+Content-addressed SQLite cache for OpenRouter responses. Entries are keyed
+by a hash of the exact request payload (model, prompt, parameters), so a
+re-run only pays for prompts that actually changed.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# Default cache location (next to the scripts, ignored by git)
+DEFAULT_CACHE_DIR = str(Path(__file__).parent / ".cache")
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600  # 30 days
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+
+
+class ResponseCache:
+    """
+    On-disk cache of parsed LLM responses with TTL and size-based eviction.
+
+    Safe to share between the worker threads used by the concurrent evaluator.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        name: str = "responses"
+    ):
+        """
+        Args:
+            cache_dir: Directory holding the SQLite database
+            ttl_seconds: Entries older than this are ignored and purged (None = never expire)
+            max_bytes: Maximum total size of stored values (None = unbounded)
+            name: Database file name (without extension)
+        """
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self.path = Path(cache_dir) / f"{name}.sqlite3"
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON entries (accessed_at)")
+        self._conn.commit()
+        self.purge_expired()
+
+    @staticmethod
+    def make_key(payload: Dict) -> str:
+        """Hash a request payload into a stable cache key."""
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached value for `key`, or None on miss/expiry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or self._is_expired(row[1], now):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict) -> None:
+        """Store `value` under `key`, evicting least recently used entries if needed."""
+        encoded = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, len(encoded.encode('utf-8')), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired entries. Returns the number of entries removed."""
+        if self.ttl_seconds is None:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM entries WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def summary(self) -> str:
+        """One-line hit/miss summary for reports."""
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return f"{self.hits} hits / {self.misses} misses ({rate:.1f}% hit rate)"
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the store fits in max_bytes."""
+        if self.max_bytes is None:
+            return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
@@ -0,0 +1,111 @@
+"""
+Run Journal for Long Evaluations
+
+Append-only JSONL journal of evaluated records. Each record is written as
+soon as it is evaluated, so an interrupted run can be resumed without paying
+again for the API calls that already completed.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def record_key(record: dict, index: int) -> str:
+    """Stable identifier for a record (its 'id', or its position if it has none)."""
+    record_id = record.get('id')
+    return str(record_id) if record_id is not None else f"#{index}"
+
+
+def default_journal_path(output_path: str) -> str:
+    """Journal file used for a given output path."""
+    return f"{output_path}.journal.jsonl"
+
+
+class RunJournal:
+    """
+    Append-only JSONL journal of evaluated records, one line per record.
+
+    Lines are flushed after every append; a truncated last line (crash while
+    writing) is ignored when the journal is loaded, and cut off before new
+    entries are appended to it.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Args:
+            path: Journal file path
+            resume: Keep and load existing entries (otherwise the journal starts empty)
+        """
+        self.path = Path(path)
+        self.entries: Dict[str, dict] = self._load() if resume else {}
+        if resume:
+            self._drop_partial_line()
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _load(self) -> Dict[str, dict]:
+        """Read completed entries from an existing journal."""
+        entries: Dict[str, dict] = {}
+        if not self.path.exists():
+            return entries
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partially written line from an interrupted run
+                entries[entry['key']] = entry['record']
+        return entries
+
+    def _drop_partial_line(self) -> None:
+        """Cut off a partially written last line (or end a complete one), so the next entry starts on its own line."""
+        if not self.path.exists():
+            return
+        with open(self.path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - 4096)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b'\n')
+                if newline >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                f.seek(position)
+                try:
+                    json.loads(f.read(end - position))
+                except ValueError:
+                    f.truncate(position)
+                else:
+                    f.write(b'\n')  # Complete entry, only its newline is missing
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the journaled record for `key`, if any."""
+        return self.entries.get(key)
+
+    def append(self, key: str, record: dict) -> None:
+        """Write one evaluated record and flush it to disk."""
+        self.entries[key] = record
+        self._file.write(json.dumps({'key': key, 'record': record}, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Close the journal file."""
+        if not self._file.closed:
+            self._file.close()
+
+    def discard(self) -> None:
+        """Close and delete the journal (after the final output has been written)."""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,109 @@
+"""
+Workbook Snapshot for Excel Question Batteries
+
+Parses every sheet of an evaluation Excel exactly once and shares the result
+between brand, competitor, category and language detection, instead of each
+step opening the file with pd.ExcelFile and re-parsing its sheets.
+
+Snapshots are cached on disk keyed by the SHA-256 of the file contents, so a
+re-run on an unchanged workbook skips openpyxl parsing entirely. Editing the
+Excel changes its hash and transparently produces a new snapshot.
+"""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from response_cache import DEFAULT_CACHE_DIR
+
+# pandas is imported on first parse (unpickling a snapshot imports it too),
+# so importing the classifier does not pay for it up front
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Bump when the pickled layout changes so old snapshots are ignored
+SNAPSHOT_VERSION = 1
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WorkbookSnapshot:
+    """Immutable, already-parsed view of all sheets of an Excel workbook."""
+
+    def __init__(self, path: str, file_hash: str, sheets: Dict[str, 'pd.DataFrame']):
+        """
+        Args:
+            path: Path of the Excel file the snapshot was taken from
+            file_hash: SHA-256 of the file contents
+            sheets: Sheet name -> DataFrame (first row as header), in workbook order
+        """
+        self.path = path
+        self.file_hash = file_hash
+        self.sheets = sheets
+        self.sheet_names: List[str] = list(sheets)
+        self.from_cache = False
+
+    def sheet(self, name: str) -> 'pd.DataFrame':
+        """Parsed sheet by name (same as pd.read_excel(path, name))."""
+        return self.sheets[name]
+
+    @classmethod
+    def parse(cls, path: str, file_hash: Optional[str] = None) -> 'WorkbookSnapshot':
+        """Parse all sheets with a single pass over the workbook."""
+        import pandas as pd
+
+        file_hash = file_hash or file_sha256(path)
+        with pd.ExcelFile(path) as xl:
+            sheets = {name: pd.read_excel(xl, name) for name in xl.sheet_names}
+        return cls(path, file_hash, sheets)
+
+
+def _snapshot_path(cache_dir: str, file_hash: str) -> Path:
+    return Path(cache_dir) / "workbooks" / f"{file_hash}.pkl"
+
+
+def load_workbook(excel_path: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> WorkbookSnapshot:
+    """
+    Get the parsed snapshot of an Excel workbook, from the disk cache when possible.
+
+    Args:
+        excel_path: Path to the Excel file
+        cache_dir: Cache directory (None = always parse, never write a snapshot)
+
+    Returns:
+        WorkbookSnapshot with every sheet parsed
+    """
+    file_hash = file_sha256(excel_path)
+    if cache_dir is None:
+        return WorkbookSnapshot.parse(excel_path, file_hash)
+
+    snapshot_path = _snapshot_path(cache_dir, file_hash)
+    if snapshot_path.exists():
+        try:
+            with open(snapshot_path, 'rb') as f:
+                version, sheets = pickle.load(f)
+            if version == SNAPSHOT_VERSION:
+                snapshot = WorkbookSnapshot(excel_path, file_hash, sheets)
+                snapshot.from_cache = True
+                return snapshot
+        except Exception as e:
+            print(f"  Warning: ignoring unreadable workbook snapshot {snapshot_path.name}: {e}")
+
+    snapshot = WorkbookSnapshot.parse(excel_path, file_hash)
+
+    # Write to a temp file and rename, so a crash never leaves a truncated snapshot
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = snapshot_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        pickle.dump((SNAPSHOT_VERSION, snapshot.sheets), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, snapshot_path)
+    return snapshot
@@ -5,6 +5,16 @@ Fix ranking_list field by extracting brand mentions in order of appearance from
 
 import json
 import re
+import sys
+from pathlib import Path
+
+# Shared brand alias table from the classifier config (new2/dashboards/dashboard_brands.py);
+# the local mappings below are used when it cannot be loaded
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from dashboard_brands import load_alias_normalizer
+
+normalize_configured_brand = load_alias_normalizer()
+HAS_ALIAS_TABLE = normalize_configured_brand is not None
 
 # Known betting brands/sites to look for
 BETTING_BRANDS = [
@@ -35,7 +45,9 @@ BETTING_BRANDS = [
 
 def normalize_brand(brand):
     """Normalize brand name for consistent output."""
-    # Remove common suffixes and normalize
+    if HAS_ALIAS_TABLE:
+        return normalize_configured_brand(brand)
+
     brand = brand.lower().strip()
 
     # Map variations to canonical names
@@ -0,0 +1,37 @@
+"""
+Brand normalization shared by the dashboard scripts.
+
+Loads the classifier's brand alias table (capas/1_clasificador, `aliases`
+section of brands_config.yaml), so the dashboards' ranking lists use the same
+canonical brand ids as the classifier. When the classifier modules or their
+configuration cannot be loaded, the scripts keep using their own mappings.
+"""
+
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+
+CLASSIFIER_DIR = Path(__file__).resolve().parents[2] / 'capas' / '1_clasificador'
+
+
+def load_alias_normalizer() -> Optional[Callable[[str], str]]:
+    """
+    Brand normalizer backed by the configured alias table.
+
+    The configuration is loaded here, so a missing or invalid brands_config.yaml
+    is detected now and not in the first normalization.
+
+    Returns:
+        brand_aliases.normalize_brand, or None if the alias table cannot be loaded
+    """
+    if str(CLASSIFIER_DIR) not in sys.path:
+        sys.path.insert(0, str(CLASSIFIER_DIR))
+    try:
+        from brand_aliases import normalize_brand
+        from brand_config import get_config_view
+        get_config_view()
+    except (ImportError, OSError, ValueError) as e:
+        # ValueError includes unparseable YAML (brand_config wraps yaml errors)
+        print(f"Warning: brand alias table not available ({e}), using local brand mappings")
+        return None
+    return normalize_brand